@@ -7,28 +7,63 @@ You: Speech to Text → Aarav: Thinking → Aarav: Speaks Response
 import sys
 import os
 import random
+import argparse
 sys.path.append('Communication')
 sys.path.append('brain')
 sys.path.append('Automate/Web & Internet')
 
-from Communication.listen import SpeechToText
-from Communication.speak import speak_text
-from brain.gemini_brain import GeminiBrain
-from web_automation_integration import WebAutomationIntegration
-from voice_web_integration import get_integration, is_web_command as is_web_scraping_command
+from startup import StartupReport, LazyComponent
+from Communication.phrase_warmer import PhraseWarmer
+from Communication.speech_clip import split_speech_chunks
+from tracing import get_tracer, span
+from brain.command_vocabulary import WAKE_COMMANDS, INTRO_COMMANDS, WEB_COMMANDS, STOP_COMMANDS, get_router
 import time
 import threading
+import queue
+import itertools
+
+# Seconds past a clip's length before playback is given up on
+PLAYBACK_MARGIN = 5.0
 
 class Aarav:
-    def __init__(self):
-        """Initialize Aarav AI Assistant."""
-        self.listener = SpeechToText()
-        self.brain = GeminiBrain()
-        self.web_automation = WebAutomationIntegration()
-        self.web_integration = get_integration()  # Web scraping and document analysis
+    def __init__(self, startup_report: StartupReport = None, components: dict = None):
+        """
+        Initialize Aarav AI Assistant.
+        
+        Only what sleep mode needs is built up front: the listener (on this
+        thread) and the speaker (warmed up in parallel). The brain and the web
+        subsystems are built in the background once Aarav wakes up, or on
+        first use.
+        
+        Args:
+            startup_report (StartupReport): Collects import/component timings
+            components (dict): Prebuilt components by name ('listener', 'speaker',
+                'brain', 'web_automation', 'web_integration'), e.g. offline stand-ins
+        """
+        self.startup = startup_report or StartupReport()
+        
+        # Canned phrases are synthesised into the TTS cache in the background
+        self.phrase_warmer = PhraseWarmer(lambda: self.speaker)
+        
+        self._listener = LazyComponent('listener', self._create_listener, self.startup)
+        self._speaker = LazyComponent('speaker', self._create_speaker, self.startup)
+        self._brain = LazyComponent('brain', self._create_brain, self.startup)
+        self._web_automation = LazyComponent('web_automation', self._create_web_automation, self.startup)
+        self._web_integration = LazyComponent('web_integration', self._create_web_integration, self.startup)  # Web scraping and document analysis
+        
+        for name, component in (components or {}).items():
+            getattr(self, f"_{name}").set(component)
+        
+        # Speaker warms up while the listener calibrates for ambient noise
+        self._speaker.warm_up()
+        self._listener.get()
+        
         self.is_running = False
         self.is_awake = False
         
+        # Stream Gemini replies and speak each sentence as soon as it arrives
+        self.stream_responses = True
+        
         # Wake-up messages (random selection)
         self.wake_messages = [
             "Booting brilliance... Aarav online! Uff, I was just organizing the universe for you, Dev. What's the mission now?",
@@ -49,62 +84,87 @@ class Aarav:
             "I'm Aarav, your intelligent assistant! Think Iron Man's Jarvis, but with more personality and definitely more fun, Dev!"
         ]
         
-        # Wake-up commands
-        self.wake_commands = [
-            "wake up",
-            "wake up aarav",
-            "hey aarav",
-            "aarav wake up",
-            "wake aarav",
-            "hello aarav",
-            "aarav hello",
-            "aarav"
-        ]
+        # Fixed lines for goodbyes, errors and reports
+        self.goodbye_message = "Goodbye! It was great talking with you!"
+        self.farewell_message = "Goodbye! See you next time!"
+        self.error_message = "I encountered an error. Let me try again."
+        self.stats_message = "Here's my latency report, Dev. It's on your screen."
         
-        # Intro/identity commands
-        self.intro_commands = [
-            "who are you",
-            "what are you",
-            "tell me about yourself",
-            "give me your intro",
-            "introduce yourself",
-            "what's your name",
-            "who is aarav"
-        ]
+        # Command vocabularies (see brain/command_vocabulary.py)
+        self.wake_commands = WAKE_COMMANDS
+        self.intro_commands = INTRO_COMMANDS
+        self.web_commands = WEB_COMMANDS
+        self.stop_commands = STOP_COMMANDS
         
-        # Web automation commands (keywords that trigger web automation)
-        self.web_commands = [
-            "open", "go to", "navigate to", "visit", "launch", "start",
-            "search", "find", "look for", "search for",
-            "play", "music", "video", "song", "watch", "listen",
-            "facebook", "instagram", "twitter", "linkedin", "reddit",
-            "gmail", "email", "outlook", "yahoo",
-            "weather", "maps", "youtube", "spotify", "netflix",
-            "screenshot", "screen shot", "capture", "snap", "photo", "picture", "save screen",
-            "generate image", "create image", "make image", "generate picture", "create picture",
-            "make picture", "draw image", "paint image", "generate art", "create art", "make art",
-            "imagine", "imaginary", "generate img", "create img", "make img",
-            "close", "remove", "delete", "cross", "shut", "exit", "tab", "browser", "window",
-            "pause", "resume", "speed up", "speed down", "faster", "slower", "normal speed",
-            "close all tabs", "close all windows", "close everything", "close all my tabs",
-            "shut all tabs", "exit all tabs", "close all current tabs", "close browser tabs"
-        ]
+        # Single-pass intent router compiled from every vocabulary
+        self.router = get_router()
         
-        # Stop commands
-        self.stop_commands = [
-            "stop it",
-            "see you soon", 
-            "bye bye",
-            "bye-bye",
-            "ok bye",
-            "ok, bye",
-            "goodbye",
-            "stop",
-            "exit",
-            "quit",
-            "go to sleep",
-            "sleep aarav",
-            "good night aarav"
+        # Per-turn latency tracing (logs/aarav_trace.jsonl)
+        self.tracer = get_tracer()
+        
+        # Wake messages first: they are the first thing Aarav says
+        self.phrase_warmer.add(self.canned_phrases())
+    
+    # ------------------------------------------------------------------------
+    # Components (built lazily, see startup.py)
+    # ------------------------------------------------------------------------
+    
+    def _create_listener(self):
+        listen = self.startup.import_module('Communication.listen')
+        return listen.SpeechToText(echo_guard=self.is_speaking, on_early_intent=self.on_early_intent)
+    
+    def _create_speaker(self):
+        speak = self.startup.import_module('Communication.speak')
+        return speak.get_speaker()
+    
+    def _create_brain(self):
+        gemini_brain = self.startup.import_module('brain.gemini_brain')
+        brain = gemini_brain.GeminiBrain()
+        self.phrase_warmer.add(gemini_brain.FALLBACK_REPLIES)
+        return brain
+    
+    def _create_web_automation(self):
+        web_automation_integration = self.startup.import_module('web_automation_integration')
+        return web_automation_integration.WebAutomationIntegration()
+    
+    def _create_web_integration(self):
+        voice_web_integration = self.startup.import_module('voice_web_integration')
+        return voice_web_integration.get_integration()
+    
+    @property
+    def listener(self):
+        return self._listener.get()
+    
+    @property
+    def speaker(self):
+        return self._speaker.get()
+    
+    @property
+    def brain(self):
+        return self._brain.get()
+    
+    @property
+    def web_automation(self):
+        return self._web_automation.get()
+    
+    @property
+    def web_integration(self):
+        return self._web_integration.get()
+    
+    def warm_up_awake_components(self):
+        """Start building the subsystems only needed once Aarav is awake."""
+        self._brain.warm_up()
+        self._web_automation.warm_up()
+        self._web_integration.warm_up()
+    
+    def speak(self, text: str):
+        """Speak text with the active speaker."""
+        self.speaker.speak_text(text)
+    
+    def canned_phrases(self) -> list:
+        """Every line Aarav can say without the brain, for the TTS warm-up."""
+        return self.wake_messages + self.intro_messages + [
+            self.goodbye_message, self.farewell_message, self.error_message, self.stats_message
         ]
     
     def get_random_wake_message(self) -> str:
@@ -117,154 +177,380 @@ class Aarav:
     
     def is_wake_command(self, text: str) -> bool:
         """Check if the text contains a wake-up command."""
-        text_lower = text.lower().strip()
-        return any(wake_cmd in text_lower for wake_cmd in self.wake_commands)
+        return self.router.matches(text, 'wake')
     
     def is_intro_command(self, text: str) -> bool:
         """Check if the text contains an intro/identity command."""
-        text_lower = text.lower().strip()
-        return any(intro_cmd in text_lower for intro_cmd in self.intro_commands)
+        return self.router.matches(text, 'intro')
     
     def is_web_command(self, text: str) -> bool:
         """Check if the text contains a web automation command."""
-        text_lower = text.lower().strip()
-        return any(web_cmd in text_lower for web_cmd in self.web_commands)
+        return self.router.matches(text, 'web')
     
     def is_web_scraping_command(self, text: str) -> bool:
         """Check if the text contains a web scraping/search command."""
-        return is_web_scraping_command(text)
+        return self.router.matches(text, 'web_scraping')
     
     def is_stop_command(self, text: str) -> bool:
         """Check if the text contains a stop command."""
-        text_lower = text.lower().strip()
-        return any(stop_cmd in text_lower for stop_cmd in self.stop_commands)
+        return self.router.matches(text, 'stop')
     
-    def speak_and_write_word_by_word(self, text: str):
-        """Speak and write the text word by word simultaneously."""
-        print("🤖 Aarav: ", end="", flush=True)
+    def is_stats_command(self, text: str) -> bool:
+        """Check if the text asks for the latency report."""
+        return self.router.matches(text, 'stats')
+    
+    def print_stats(self):
+        """
+        Print the latency report, then the report of every component in use.
+        
+        Components that have not been loaded yet, or failed to build (brain,
+        listener, speaker, shared HTTP client, rate limiter), are skipped
+        rather than created.
+        """
+        self.tracer.print_report()
+        
+        brain = self._brain.value_or_none()
+        if brain is not None:
+            for report in ('cache', 'memory', 'tiers'):
+                component = getattr(brain, report, None)
+                if component is not None:
+                    component.print_report()
+        
+        listener = self._listener.value_or_none()
+        if listener is not None:
+            for report in ('audio_capture', 'endpointer', 'wake_spotter', 'transcriber'):
+                component = getattr(listener, report, None)
+                if component is not None:
+                    component.print_report()
+        
+        speaker = self._speaker.value_or_none()
+        if speaker is not None:
+            for report in ('tts_router', 'postprocessor'):
+                component = getattr(speaker, report, None)
+                if component is not None:
+                    component.print_report()
+            tts_cache = getattr(speaker, 'tts_cache', None)
+            if tts_cache is not None:
+                tts_cache.print_report()
+                self.phrase_warmer.print_report()
+        
+        # Shared modules report only once a component has loaded them
+        http_client = sys.modules.get('http_client')
+        if http_client is not None:
+            http_client.print_report()
+        
+        resilience = sys.modules.get('resilience')
+        if resilience is not None:
+            resilience.print_report()
+        
+        rate_limits = sys.modules.get('rate_limits')
+        if rate_limits is not None:
+            rate_limits.print_report()
+    
+    def stop_speaking(self):
+        """Cut off whatever Aarav is saying (no-op for speakers without a player)."""
+        stop = getattr(self._speaker.value_or_none(), 'stop', None)
+        if stop is not None:
+            stop()
+    
+    def is_speaking(self) -> bool:
+        """True while Aarav's voice is playing (called from the capture thread)."""
+        is_speaking = getattr(self._speaker.value_or_none(), 'is_speaking', None)
+        return bool(is_speaking is not None and is_speaking())
+    
+    def on_early_intent(self, intent: str, hypothesis):
+        """
+        Act on a confident partial transcript before the utterance has ended.
+        
+        Called from the streaming recognition thread. The utterance itself is
+        still routed by dispatch once capture ends it; only stopping playback
+        cannot wait for that.
+        
+        Args:
+            intent (str): Early intent the partial matched (e.g. 'stop')
+            hypothesis (Hypothesis): The partial transcript
+        """
+        if intent == 'stop' and self.is_speaking():
+            self.stop_speaking()
+    
+    def start_keyboard_commands(self):
+        """Print the stats reports on 'stats', and stop speaking on 'stop', typed (Enter) in the terminal."""
+        if not sys.stdin or not sys.stdin.isatty():
+            return
+        
+        def read_commands():
+            for line in sys.stdin:
+                command = line.strip().lower()
+                if command in ('stats', 'latency'):
+                    self.print_stats()
+                elif command in ('stop', 'quiet', 'shh'):
+                    self.stop_speaking()
+        
+        threading.Thread(target=read_commands, name="keyboard-commands", daemon=True).start()
+    
+    def _speech_generation(self):
+        """The speaker's stop generation (None for speakers that cannot be stopped)."""
+        return getattr(self.speaker, 'generation', None)
+    
+    def _speech_stopped(self, generation) -> bool:
+        """Check if Aarav was told to stop speaking since the generation was read."""
+        return generation is not None and self.speaker.generation != generation
+    
+    def _write_words_with_audio(self, text: str, pending=None, generation=None):
+        """
+        Speak the text and write its words in step with the audio playback.
+        
+        Display starts when the audio actually starts, and each word appears at
+        its position in the clip: Murf word timings when returned, otherwise an
+        estimate from the decoded clip duration. Waiting is done on playback
+        events, so the display never runs ahead of or lags behind the voice.
         
+        Args:
+            text (str): Text to speak and write
+            pending (Future): Synthesis already started for text, if any
+            generation (int): Speaker generation of the reply; nothing is played once stopped
+        """
         # Split text into words
         words = text.split()
+        if not words:
+            return
         
-        # Calculate approximate time per word (assuming 150 words per minute)
-        words_per_minute = 150
-        seconds_per_word = 60 / words_per_minute
+        speaker = self.speaker
+        try:
+            clip = pending.result() if pending is not None else speaker.synthesize_clip(text)
+        except Exception as e:
+            if self._speech_stopped(generation):
+                return
+            print(f"TTS error: {e}")
+            # Fallback to simple print if speech fails
+            print(text, end="", flush=True)
+            return
         
-        # Start speaking in a separate thread
-        speak_thread = threading.Thread(target=speak_text, args=(text,))
-        speak_thread.start()
+        if self._speech_stopped(generation):
+            return
+        
+        # Start speaking on the player thread (or a thread of our own)
+        play_async = getattr(speaker, 'play_async', None)
+        if play_async is not None:
+            try:
+                play_async(clip)
+            except Exception as e:
+                print(f"Playback error: {e}")
+                print(text, end="", flush=True)
+                return
+        else:
+            threading.Thread(target=speaker.play_clip, args=(clip,), daemon=True).start()
+        
+        # Display starts when audio actually starts (bounded: a dead player must not hang the reply)
+        if not clip.started.wait(timeout=(clip.duration or 0.0) + PLAYBACK_MARGIN):
+            print(text, end="", flush=True)
+            return
+        schedule = clip.word_schedule(words)
         
-        # Display words one by one with timing
-        for i, word in enumerate(words):
+        # Display words one by one, following the playback position
+        for i, (word, spoken_at) in enumerate(zip(words, schedule)):
+            # Returns early if playback ends, so the remaining words flush at once
+            clip.finished.wait(timeout=max(0.0, spoken_at - clip.position()))
             print(word, end="", flush=True)
             
             # Add space between words (except for the last word)
             if i < len(words) - 1:
                 print(" ", end="", flush=True)
-            
-            # Small delay to match speech timing
-            time.sleep(seconds_per_word)
         
         # Wait for speech to complete
+        clip.finished.wait(timeout=max(0.0, (clip.duration or 0.0) - clip.position()) + PLAYBACK_MARGIN)
+    
+    def speak_and_write_word_by_word(self, text: str, label: str = "🤖 Aarav"):
+        """Speak and write the text word by word simultaneously."""
+        print(f"{label}: ", end="", flush=True)
+        self._write_words_with_audio(text)
+        print()  # New line after completion
+    
+    def speak_and_write_streaming(self, sentences, label: str = "🤖 Aarav"):
+        """
+        Speak and write a streamed response sentence by sentence.
+        
+        Each sentence is handed to text-to-speech as soon as it arrives, so
+        speech starts after the first sentence instead of after the whole
+        answer. Long replies are split into sentence chunks, and every chunk is
+        synthesised ahead on the speaker's worker pool while earlier ones play.
+        Words are written in step with the audio. After stop_speaking() the
+        rest of the reply is neither synthesised nor played.
+        
+        Args:
+            sentences (iterable): Sentences of the response, in order
+            label (str): Speaker label printed before the response
+        """
+        print(f"{label}: ", end="", flush=True)
+        
+        speech_queue = queue.Queue()
+        generation = self._speech_generation()
+        
+        def speak_worker():
+            first = True
+            while True:
+                item = speech_queue.get()
+                if item is None:
+                    break
+                chunk, pending = item
+                if self._speech_stopped(generation):
+                    if pending is not None:
+                        pending.cancel()
+                    continue
+                if not first:
+                    print(" ", end="", flush=True)
+                first = False
+                self._write_words_with_audio(chunk, pending, generation)
+        
+        # Speak sentences in order on a separate thread
+        speak_thread = threading.Thread(target=speak_worker, daemon=True)
+        speak_thread.start()
+        
+        synthesize_async = None
+        for sentence in sentences:
+            if self._speech_stopped(generation):
+                break
+            if not sentence:
+                continue
+            if synthesize_async is None:
+                synthesize_async = getattr(self.speaker, 'synthesize_async', False)
+            for chunk in split_speech_chunks(sentence):
+                speech_queue.put((chunk, synthesize_async(chunk) if synthesize_async else None))
+        
+        # Wait for speech to complete
+        speech_queue.put(None)
         speak_thread.join()
         print()  # New line after completion
     
+    def think(self, user_text: str):
+        """
+        Generate Aarav's reply with the brain.
+        
+        Args:
+            user_text (str): Recognized user speech
+            
+        Returns:
+            iterable: Sentences of the reply (streamed when stream_responses is on)
+        """
+        # Step 2: Aarav - Thinking (Generating Response)
+        print("🧠 Aarav: Thinking...", end="", flush=True)
+        if self.stream_responses:
+            ai_sentences = self.brain.think_stream(user_text)
+            first_sentence = next(ai_sentences, "")
+            print(" Done!")
+            return itertools.chain([first_sentence], ai_sentences)
+        
+        ai_response = self.brain.think(user_text)
+        print(" Done!")
+        return [ai_response]
+    
+    def dispatch(self, user_text: str):
+        """
+        Route one utterance and work out what Aarav should say.
+        
+        Updates the awake/running state as a side effect (wake-up, stop).
+        
+        Args:
+            user_text (str): Recognized user speech
+            
+        Returns:
+            tuple: (label, sentences) to display and speak, or (None, None) to stay quiet
+        """
+        # One pass over the transcript; the predicates below reuse its result
+        with span('route'):
+            self.router.route(user_text)
+        
+        # Check if it's a latency report request
+        if self.is_stats_command(user_text):
+            self.print_stats()
+            if self.is_awake:
+                return "🤖 Aarav", [self.stats_message]
+            return None, None
+        
+        # Check if it's a wake-up command (first time or during conversation)
+        if self.is_wake_command(user_text):
+            self.is_awake = True
+            self.warm_up_awake_components()
+            return "🤖 Aarav", [self.get_random_wake_message()]
+        
+        # Check if it's an intro command
+        if self.is_intro_command(user_text):
+            return "🤖 Aarav", [self.get_random_intro_message()]
+        
+        # Check if it's a web automation command
+        if self.is_web_command(user_text):
+            if not self.is_awake:
+                print("💤 Aarav is sleeping... ")
+                return None, None
+            
+            print("🌐 Aarav: Processing web command...", end="", flush=True)
+            success, response = self.web_automation.process_voice_command(user_text)
+            print(" Done!")
+            return ("🤖 Aarav" if success else "❌ Aarav"), [response]
+        
+        # Check if it's a web scraping/search command
+        if self.is_web_scraping_command(user_text):
+            if not self.is_awake:
+                print("💤 Aarav is sleeping... ")
+                return None, None
+            
+            print("🔍 Aarav: Searching and analyzing...", end="", flush=True)
+            result = self.web_integration.process_voice_command(user_text)
+            print(" Done!")
+            return ("🤖 Aarav" if result['success'] else "❌ Aarav"), [result['response']]
+        
+        # Check if it's a stop command
+        if self.is_stop_command(user_text):
+            self.is_running = False
+            if self.is_awake:
+                return "🤖 Aarav", [self.goodbye_message]
+            return None, None
+        
+        # Only respond if awake
+        if self.is_awake:
+            return "🤖 Aarav", self.think(user_text)
+        
+        return None, None
+    
+    def process_utterance(self, user_text: str, turn=None):
+        """
+        Handle one recognized utterance: route it, then speak and write the reply.
+        
+        Args:
+            user_text (str): Recognized user speech
+            turn (TraceTurn): Trace turn to annotate with the matched intents
+        """
+        print(f"\n🎧 You: [{user_text}]")
+        
+        # Steps 2-3: Aarav - Routes, Thinks, Speaks and Writes
+        label, sentences = self.dispatch(user_text)
+        if turn is not None:
+            turn.attributes['intents'] = sorted(self.router.intents(user_text))
+        if sentences is not None:
+            self.speak_and_write_streaming(sentences, label)
+    
     def start_conversation(self):
         """Start real-time AI conversation."""
         self.is_running = True
         
         print("🤖 Aarav AI Assistant")
         print("💤 Currently in sleep mode... (Press Ctrl+C to stop)")
+        self.startup.mark_listening()
+        self.start_keyboard_commands()
         
         while self.is_running:
+            turn = self.tracer.start_turn()
+            user_text = None
             try:
                 # Step 1: You - Speech to Text
                 if self.is_awake:
                     print("🎤 ", end="", flush=True)
                 
-                user_text = self.listener.listen_and_convert()
+                # Asleep: the local wake-word spotter decides what reaches the cloud
+                user_text = self.listener.listen_and_convert(wake_only=not self.is_awake)
                 
                 if user_text:
-                    print(f"\n🎧 You: [{user_text}]")
-                    
-                    # Check if it's a wake-up command (first time or during conversation)
-                    if self.is_wake_command(user_text):
-                        if not self.is_awake:
-                            # First time wake-up
-                            self.is_awake = True
-                            wake_message = self.get_random_wake_message()
-                            print(f"🤖 Aarav: {wake_message}")
-                            speak_text(wake_message)
-                        else:
-                            # Wake-up during conversation
-                            wake_message = self.get_random_wake_message()
-                            print(f"🤖 Aarav: {wake_message}")
-                            speak_text(wake_message)
-                        continue
-                    
-                    # Check if it's an intro command
-                    if self.is_intro_command(user_text):
-                        intro_message = self.get_random_intro_message()
-                        print(f"🤖 Aarav: {intro_message}")
-                        speak_text(intro_message)
-                        continue
-                    
-                    # Check if it's a web automation command
-                    if self.is_web_command(user_text):
-                        if self.is_awake:
-                            print("🌐 Aarav: Processing web command...", end="", flush=True)
-                            success, response = self.web_automation.process_voice_command(user_text)
-                            print(" Done!")
-                            
-                            if success:
-                                print(f"🤖 Aarav: {response}")
-                                speak_text(response)
-                            else:
-                                print(f"❌ Aarav: {response}")
-                                speak_text(response)
-                        else:
-                            print("💤 Aarav is sleeping... ")
-                        continue
-                    
-                    # Check if it's a web scraping/search command
-                    if self.is_web_scraping_command(user_text):
-                        if self.is_awake:
-                            print("🔍 Aarav: Searching and analyzing...", end="", flush=True)
-                            result = self.web_integration.process_voice_command(user_text)
-                            print(" Done!")
-                            
-                            if result['success']:
-                                response = result['response']
-                                print(f"🤖 Aarav: {response}")
-                                speak_text(response)
-                            else:
-                                error_response = result['response']
-                                print(f"❌ Aarav: {error_response}")
-                                speak_text(error_response)
-                        else:
-                            print("💤 Aarav is sleeping... ")
-                        continue
-                    
-                    # Check if it's a stop command
-                    if self.is_stop_command(user_text):
-                        if self.is_awake:
-                            print("🤖 Aarav: Goodbye! It was great talking with you!")
-                            speak_text("Goodbye! It was great talking with you!")
-                        self.is_running = False
-                        break
-                    
-                    # Only respond if awake
-                    if self.is_awake:
-                        # Step 2: Aarav - Thinking (Generating Response)
-                        print("🧠 Aarav: Thinking...", end="", flush=True)
-                        ai_response = self.brain.think(user_text)
-                        print(" Done!")
-                        
-                        # Step 3: Aarav - Speaks and Writes Word by Word
-                        self.speak_and_write_word_by_word(ai_response)
-                        
-                        # Small delay to ensure speech completes
-                        time.sleep(0.5)
+                    self.process_utterance(user_text, turn)
                 
                 else:
                     # Don't print anything when no speech detected
@@ -273,13 +559,20 @@ class Aarav:
             except KeyboardInterrupt:
                 print("\n🛑 Stopped by user")
                 if self.is_awake:
-                    speak_text("Goodbye! See you next time!")
+                    self.speak(self.farewell_message)
                 break
             except Exception as e:
                 print(f"❌ Error: {e}")
                 if self.is_awake:
-                    speak_text("I encountered an error. Let me try again.")
+                    self.speak(self.error_message)
+                # The microphone thread is gone: nothing more will be heard
+                audio_capture = sys.modules.get('Communication.audio_capture')
+                if audio_capture is not None and isinstance(e, audio_capture.CaptureError):
+                    break
                 time.sleep(1)
+            finally:
+                # Turns without speech are not worth logging
+                self.tracer.end_turn(turn, discard=not user_text)
 
 def main():
     """Main function to run Aarav AI."""
@@ -295,9 +588,20 @@ def main():
     print("🌦️ Weather: Real-time Weather Information")
     print("=" * 40)
     
+    parser = argparse.ArgumentParser(description="Aarav AI Assistant")
+    parser.add_argument('--pipeline', action='store_true',
+                        help="run the pipelined asyncio engine (listens while Aarav speaks)")
+    parser.add_argument('--startup-report', action='store_true',
+                        help="print wall time per import and component once Aarav is listening")
+    args = parser.parse_args()
+    
     # Start Aarav AI
-    aarav = Aarav()
-    aarav.start_conversation()
+    aarav = Aarav(StartupReport(enabled=args.startup_report))
+    if args.pipeline:
+        from conversation_engine import ConversationEngine
+        ConversationEngine(aarav).run()
+    else:
+        aarav.start_conversation()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
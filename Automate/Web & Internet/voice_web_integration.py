@@ -20,6 +20,8 @@ try:
 except ImportError:
     from web_scraper import get_analyzer, analyze_request
 
+from brain.command_vocabulary import get_router
+
 class VoiceWebIntegration:
     def __init__(self):
         """Initialize voice-web integration."""
@@ -342,16 +344,7 @@ def is_web_command(command: str) -> bool:
     Returns:
         bool: True if web-related
     """
-    web_keywords = [
-        'search', 'google', 'find', 'look up', 'tell me about',
-        'weather', 'temperature', 'forecast',
-        'website', 'open', 'analyze', 'scrape', 'visit',
-        'document', 'pdf', 'read', 'summarize',
-        'internet', 'web', 'online', 'from the internet'
-    ]
-    
-    command_lower = command.lower()
-    return any(keyword in command_lower for keyword in web_keywords)
+    return get_router().matches(command, 'web_scraping')
 
 if __name__ == "__main__":
     # Test the integration
@@ -17,6 +17,7 @@ from datetime import datetime
 sys.path.append('..')
 sys.path.append('../..')
 from Automate.image_generation import ImageGenerator
+from brain.command_vocabulary import get_router
 
 class WebAutomationIntegration:
     def __init__(self):
@@ -26,8 +27,11 @@ class WebAutomationIntegration:
         if not os.path.exists(self.screenshots_dir):
             os.makedirs(self.screenshots_dir)
 
-        # Initialize image generator
-        self.image_generator = ImageGenerator()
+        # Image generator (and its Gemini client) is built on first image request
+        self._image_generator = None
+
+        # Shared intent router (keyword lists live in brain/command_vocabulary.py)
+        self.router = get_router()
 
         # Common website URLs for quick access
         self.websites = {
@@ -80,6 +84,13 @@ class WebAutomationIntegration:
             'dailymotion': 'https://www.dailymotion.com'
         }
 
+    @property
+    def image_generator(self):
+        """Get or create the image generator."""
+        if self._image_generator is None:
+            self._image_generator = ImageGenerator()
+        return self._image_generator
+
     def _close_all_tabs(self):
         """Close all browser tabs using system shortcuts."""
         try:
@@ -202,90 +213,51 @@ class WebAutomationIntegration:
     
     def _is_tab_management_command(self, command):
         """Check if command is for tab management."""
-        tab_keywords = [
-            'close tab', 'close the tab', 'close current tab', 'close this tab',
-            'remove tab', 'remove the tab', 'remove current tab', 'remove this tab',
-            'delete tab', 'delete the tab', 'delete current tab', 'delete this tab',
-            'cross tab', 'cross the tab', 'cross current tab', 'cross this tab',
-            'shut tab', 'shut the tab', 'shut current tab', 'shut this tab',
-            'exit tab', 'exit the tab', 'exit current tab', 'exit this tab',
-            'close browser', 'close the browser', 'close current browser',
-            'close window', 'close the window', 'close current window'
-        ]
-        return any(keyword in command for keyword in tab_keywords)
+        return self.router.matches(command, 'automation.tab_management')
 
     def _is_close_all_tabs_command(self, command):
         """Check if command is to close all tabs."""
-        close_all_keywords = [
-            'close all tabs', 'close all the tabs', 'close all browser tabs',
-            'close all windows', 'close all browsers', 'close everything',
-            'shut all tabs', 'shut all windows', 'exit all tabs', 'exit all',
-            'close all my tabs', 'close browser tabs', 'close all tabs now',
-            'shut down all tabs', 'exit all windows', 'close all current tabs'
-        ]
-        return any(keyword in command for keyword in close_all_keywords)
+        return self.router.matches(command, 'automation.close_all_tabs')
 
     def _is_playback_control_command(self, command):
         """Check if command is for playback control."""
-        playback_keywords = [
-            'play', 'pause', 'stop', 'resume', 'speed up', 'speed down',
-            'faster', 'slower', 'normal speed', 'increase speed', 'decrease speed'
-        ]
-        return any(keyword in command for keyword in playback_keywords)
+        return self.router.matches(command, 'automation.playback_control')
     
     def _is_image_generation_command(self, command):
         """Check if command is for generating images."""
-        image_gen_keywords = [
-            'generate image', 'create image', 'make image', 'generate picture',
-            'create picture', 'make picture', 'draw image', 'paint image',
-            'generate art', 'create art', 'make art', 'imagine', 'imaginary',
-            'generate img', 'create img', 'make img'
-        ]
-        return any(keyword in command for keyword in image_gen_keywords)
+        return self.router.matches(command, 'automation.image_generation')
 
     def _is_screenshot_command(self, command):
         """Check if command is for taking screenshots."""
-        screenshot_keywords = [
-            'screenshot', 'screen shot', 'capture screen', 'take screenshot',
-            'take a screenshot', 'capture', 'snap', 'photo', 'picture',
-            'save screen', 'screen capture', 'take picture', 'take photo'
-        ]
-        return any(keyword in command for keyword in screenshot_keywords)
+        return self.router.matches(command, 'automation.screenshot')
     
     def _is_open_website_command(self, command):
         """Check if command is to open a website."""
-        open_keywords = ['open', 'go to', 'navigate to', 'visit', 'launch', 'start']
-        return any(keyword in command for keyword in open_keywords)
+        return self.router.matches(command, 'automation.open_website')
     
     def _is_search_command(self, command):
         """Check if command is a search request."""
-        search_keywords = ['search', 'find', 'look for', 'search for']
-        return any(keyword in command for keyword in search_keywords)
+        return self.router.matches(command, 'automation.search')
     
     def _is_media_command(self, command):
         """Check if command is for music/video."""
-        media_keywords = ['play', 'music', 'video', 'song', 'watch', 'listen']
-        return any(keyword in command for keyword in media_keywords)
+        return self.router.matches(command, 'automation.media')
     
     def _is_social_media_command(self, command):
         """Check if command is for social media."""
-        social_keywords = ['facebook', 'instagram', 'twitter', 'linkedin', 'reddit', 'tiktok']
-        return any(keyword in command for keyword in social_keywords)
+        return self.router.matches(command, 'automation.social_media')
     
     def _is_email_command(self, command):
         """Check if command is for email."""
-        email_keywords = ['email', 'gmail', 'outlook', 'mail', 'yahoo']
-        return any(keyword in command for keyword in email_keywords)
+        return self.router.matches(command, 'automation.email')
     
     def _is_weather_command(self, command):
         """Check if command is for weather."""
-        weather_keywords = ['weather', 'temperature', 'forecast']
-        return any(keyword in command for keyword in weather_keywords)
+        return self.router.matches(command, 'automation.weather')
     
     def _is_maps_command(self, command):
         """Check if command is for maps/navigation."""
-        maps_keywords = ['map', 'maps', 'location', 'directions', 'navigate']
-        return any(keyword in command for keyword in maps_keywords)
+        return self.router.matches(command, 'automation.maps')
     
     def _handle_tab_management_command(self, command):
         """Handle tab management commands."""
@@ -18,11 +18,9 @@ Features:
 
 import os
 import sys
-import requests
 from bs4 import BeautifulSoup
 import json
 import io
-import httpx
 from pathlib import Path
 from urllib.parse import urlparse, urljoin
 from dotenv import load_dotenv
@@ -31,6 +29,9 @@ import re
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+from http_client import get_http_client
+from resilience import get_resilience
+from rate_limits import get_rate_limiter
 
 try:
     from google import genai
@@ -61,6 +62,16 @@ class WebScraperAnalyzer:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
         
+        # Shared keep-alive connection pool
+        self.http = get_http_client()
+        
+        # Deadlines, retries and circuit breaking for Gemini calls
+        self.summarize_policy = get_resilience('summarize')
+        self.pdf_policy = get_resilience('pdf')
+        
+        # Shared Gemini rate limits and usage counters
+        self.limiter = get_rate_limiter()
+        
         # Common weather sites for weather information
         self.weather_sites = [
             'https://api.openweathermap.org/data/2.5/weather',
@@ -82,7 +93,7 @@ class WebScraperAnalyzer:
         try:
             # Simple Google search simulation using DuckDuckGo (to avoid API restrictions)
             search_url = f"https://duckduckgo.com/html/?q={query}"
-            response = requests.get(search_url, headers=self.headers, timeout=10)
+            response = self.http.get(search_url, purpose='search', headers=self.headers)
             
             if response.status_code == 200:
                 soup = BeautifulSoup(response.content, 'html.parser')
@@ -125,7 +136,7 @@ class WebScraperAnalyzer:
             if not url.startswith(('http://', 'https://')):
                 url = 'https://' + url
             
-            response = requests.get(url, headers=self.headers, timeout=15)
+            response = self.http.get(url, purpose='scrape', headers=self.headers)
             response.raise_for_status()
             
             soup = BeautifulSoup(response.content, 'html.parser')
@@ -208,10 +219,11 @@ class WebScraperAnalyzer:
         
         try:
             # Download PDF content
-            doc_data = httpx.get(pdf_url, timeout=30).content
+            doc_data = self.http.get(pdf_url, purpose='pdf').content
             
             # Analyze with Gemini
-            response = self.client.models.generate_content(
+            response = self.limiter.call(
+                'pdf', self.client.models.generate_content, policy=self.pdf_policy,
                 model="gemini-2.0-flash-exp",
                 contents=[
                     types.Part.from_bytes(
@@ -262,7 +274,8 @@ class WebScraperAnalyzer:
                 }
             
             # Analyze with Gemini
-            response = self.client.models.generate_content(
+            response = self.limiter.call(
+                'pdf', self.client.models.generate_content, policy=self.pdf_policy,
                 model="gemini-2.0-flash-exp",
                 contents=[
                     types.Part.from_bytes(
@@ -315,7 +328,8 @@ class WebScraperAnalyzer:
                 
                 # Summarize weather info with Gemini
                 if self.client:
-                    summary_response = self.client.models.generate_content(
+                    summary_response = self.limiter.call(
+                        'weather', self.client.models.generate_content, policy=self.summarize_policy,
                         model="gemini-2.0-flash-exp",
                         contents=[
                             f"Extract and summarize the current weather information for {location} in exactly 2-3 sentences. "
@@ -380,7 +394,8 @@ class WebScraperAnalyzer:
                     f"Content:\n{content}"
                 )
             
-            response = self.client.models.generate_content(
+            response = self.limiter.call(
+                'web_summary', self.client.models.generate_content, policy=self.summarize_policy,
                 model="gemini-2.0-flash-exp",
                 contents=[enhanced_prompt]
             )
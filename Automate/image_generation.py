@@ -18,6 +18,8 @@ from dotenv import load_dotenv
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.append('brain')
+from resilience import get_resilience
+from rate_limits import get_rate_limiter
 
 # Load environment variables from .env file
 load_dotenv()
@@ -87,7 +89,9 @@ class ImageGenerator:
             print(f"Generating image for prompt: '{prompt}'")
 
             # Create the generation request using the correct Gemini client
-            response = self.client.models.generate_content(
+            # Image generation is slow: long deadline, fewer retries
+            response = get_rate_limiter().call(
+                'image', self.client.models.generate_content, policy=get_resilience('image'),
                 model="gemini-2.5-flash-image-preview",
                 contents=[prompt],
             )
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Continuous Audio Capture for Aarav AI Assistant
+
+One background thread owns the microphone for the whole session:
+
+- The device is opened (and the noise floor calibrated) once, not per turn
+- Every chunk is written into a preallocated NumPy ring buffer and fed to
+  the VAD endpointer, also while Aarav is thinking or speaking, so words
+  spoken in those gaps are not lost
+- Finished utterances are cut out of the ring and handed to recognition
+  through a bounded queue
+- With a StreamingTranscriber, each utterance is also streamed to partial
+  recognition as it is heard
+- Counters record device overflows, frames lost to a full ring or a full
+  queue, and segments heard while Aarav itself was speaking
+"""
+
+import queue
+import threading
+import time
+
+import numpy as np
+import speech_recognition as sr
+
+# PyAudio's "input overflowed" error code
+INPUT_OVERFLOWED = -9981
+# How often next_segment() checks that the capture thread is still alive
+CHECK_SECONDS = 0.25
+
+
+class CaptureError(RuntimeError):
+    """The capture thread stopped (e.g. the microphone went away); no more audio will come."""
+
+
+class AudioCapture:
+    def __init__(self, microphone, endpointer, buffer_seconds: float = 30.0, queue_size: int = 8,
+                 calibrate_seconds: float = 1.0):
+        """
+        Initialize the capture (the device is opened by start()).
+
+        Args:
+            microphone (sr.Microphone): Microphone to read from
+            endpointer (VADEndpointer): Cuts the stream into utterances
+            buffer_seconds (float): Audio kept in the ring buffer
+            queue_size (int): Utterances waiting for recognition before the oldest is dropped
+            calibrate_seconds (float): Room sound read to set the noise floor
+        """
+        self.microphone = microphone
+        self.endpointer = endpointer
+        self.sample_rate = microphone.SAMPLE_RATE
+        self.calibrate_seconds = calibrate_seconds
+
+        self.ring = np.zeros(int(buffer_seconds * self.sample_rate), dtype=np.int16)
+        self.written = 0
+        self.segments = queue.Queue(maxsize=queue_size)
+
+        # Called from the capture thread when an utterance starts: True while Aarav speaks
+        self.echo_guard = None
+        # Optional StreamingTranscriber fed while the utterance is heard
+        self.transcriber = None
+
+        self.counters = {'chunks': 0, 'segments': 0, 'device_overflows': 0, 'ring_overruns': 0,
+                         'queue_overflows': 0, 'dropped_frames': 0, 'during_playback': 0}
+        self.source = None
+        self.opened_at = None
+        self.error = None
+        self._speaking_at_start = None
+        self._streaming = False
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    # ------------------------------------------------------------------------
+    # API
+    # ------------------------------------------------------------------------
+
+    def start(self):
+        """Open the microphone, calibrate the endpointer and start the capture thread."""
+        if self._thread is not None:
+            return
+        self.source = self.microphone.__enter__()
+        self.opened_at = time.perf_counter()
+        calibration = b''.join(self._read() for _ in range(
+            int(self.calibrate_seconds * self.sample_rate / self.source.CHUNK) + 1))
+        self.endpointer.calibrate(calibration)
+        self.endpointer.begin()
+
+        self._thread = threading.Thread(target=self._run, name="audio-capture", daemon=True)
+        self._thread.start()
+
+    def next_segment(self, timeout: float = None):
+        """
+        Wait for the next utterance.
+
+        Args:
+            timeout (float): Seconds to wait, None to wait forever
+
+        Returns:
+            sr.AudioData: The utterance (with a during_playback flag), None on timeout
+
+        Raises:
+            CaptureError: The capture thread died (checked while waiting, too)
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            # Wait in short slices so a dead capture thread is noticed even with no timeout
+            wait = CHECK_SECONDS if deadline is None else min(CHECK_SECONDS, deadline - time.monotonic())
+            try:
+                return self.segments.get(timeout=max(0.0, wait))
+            except queue.Empty:
+                pass
+            if self.error is not None:
+                raise CaptureError(f"audio capture stopped: {self.error}")
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+
+    def clear(self):
+        """Drop utterances that are waiting (e.g. after a mode change)."""
+        while True:
+            try:
+                self.segments.get_nowait()
+            except queue.Empty:
+                return
+
+    def close(self):
+        """Stop the thread and close the microphone."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+        if self.source is not None:
+            self.microphone.__exit__(None, None, None)
+            self.source = None
+
+    # ------------------------------------------------------------------------
+    # Capture thread
+    # ------------------------------------------------------------------------
+
+    def _count(self, name: str, amount: int = 1):
+        with self._lock:
+            self.counters[name] += amount
+
+    def _read(self) -> bytes:
+        """Read one chunk, counting device overflows (audio the OS already dropped)."""
+        stream = getattr(self.source.stream, 'pyaudio_stream', None)
+        if stream is None:
+            return self.source.stream.read(self.source.CHUNK)
+        try:
+            return stream.read(self.source.CHUNK, exception_on_overflow=True)
+        except OSError as e:
+            if e.errno != INPUT_OVERFLOWED:
+                raise
+            self._count('device_overflows')
+            return stream.read(self.source.CHUNK, exception_on_overflow=False)
+
+    def _write(self, samples: np.ndarray):
+        """Append samples to the ring buffer, wrapping around at the end."""
+        size = len(self.ring)
+        count = len(samples)
+        samples = samples[-size:]
+        position = (self.written + count - len(samples)) % size
+        first = min(len(samples), size - position)
+        self.ring[position:position + first] = samples[:first]
+        self.ring[:len(samples) - first] = samples[first:]
+        self.written += count
+
+    def _cut(self, first: int, end: int) -> bytes:
+        """Copy samples [first, end) out of the ring; older samples may already be overwritten."""
+        size = len(self.ring)
+        oldest = max(0, self.written - size)
+        if first < oldest:
+            lost = oldest - first
+            self._count('ring_overruns')
+            self._count('dropped_frames', lost // self.endpointer.frame_samples)
+            first = oldest
+        position = first % size
+        if position + end - first <= size:
+            return self.ring[position:position + end - first].tobytes()
+        return np.concatenate((self.ring[position:], self.ring[:position + end - first - size])).tobytes()
+
+    def _is_speaking(self) -> bool:
+        guard = self.echo_guard
+        return bool(guard is not None and guard())
+
+    def _stream_begin(self):
+        """Stream the utterance that just started, pre-roll included."""
+        first = self.endpointer.start_frame * self.endpointer.frame_samples
+        self.transcriber.begin(self._cut(first, self.written), self._speaking_at_start)
+        self._streaming = True
+
+    def _stream(self, pending: bytes):
+        """Stream the rest of the chunk to an utterance in progress."""
+        if self._streaming and pending:
+            self.transcriber.feed(pending)
+
+    def _emit(self, pending: bytes = b''):
+        """Queue the utterance the endpointer just finished."""
+        first, end = self.endpointer.utterance_samples()
+        audio = sr.AudioData(self._cut(first, end), self.sample_rate, self.source.SAMPLE_WIDTH)
+        if self._speaking_at_start is None:
+            # Started and ended within one chunk
+            self._speaking_at_start = self._is_speaking()
+        audio.during_playback = self._speaking_at_start
+        self._speaking_at_start = None
+        audio.captured_at = time.perf_counter()
+
+        # Future of the local final transcript, see SpeechToText.recognize
+        audio.stream_transcript = None
+        if self.transcriber is not None:
+            if not self._streaming:
+                self.transcriber.begin(audio.frame_data, audio.during_playback)
+            elif pending:
+                self.transcriber.feed(pending)
+            audio.stream_transcript = self.transcriber.end()
+            self._streaming = False
+
+        try:
+            self.segments.put_nowait(audio)
+        except queue.Full:
+            # Recognition is behind: the oldest utterance goes
+            try:
+                dropped = self.segments.get_nowait()
+                self._count('dropped_frames', len(dropped.frame_data) // 2 // self.endpointer.frame_samples)
+            except queue.Empty:
+                pass
+            self._count('queue_overflows')
+            self.segments.put_nowait(audio)
+        self._count('segments')
+        if audio.during_playback:
+            self._count('during_playback')
+
+    def _run(self):
+        try:
+            while not self._stopped.is_set():
+                data = self._read()
+                self._count('chunks')
+                self._write(np.frombuffer(data, dtype=np.int16))
+
+                event = self.endpointer.feed(data)
+                # Audio of this chunk not yet streamed to partial recognition
+                pending = data
+                while event is not None:
+                    if event == 'start':
+                        self._speaking_at_start = self._is_speaking()
+                        if self.transcriber is not None:
+                            self._stream_begin()
+                        pending = b''
+                        break
+                    self._emit(pending)
+                    pending = b''
+                    self.endpointer.begin()
+                    # Audio after the end is still buffered in the endpointer
+                    event = self.endpointer.feed(b'')
+                self._stream(pending)
+        except Exception as e:
+            self.error = e
+            print(f"❌ Audio capture stopped: {e}")
+
+    # ------------------------------------------------------------------------
+    # Reports
+    # ------------------------------------------------------------------------
+
+    def stats(self) -> dict:
+        """
+        Capture counters.
+
+        Returns:
+            dict: Chunks read, segments, overflows, dropped frames, queue depth, seconds open
+        """
+        with self._lock:
+            stats = dict(self.counters)
+        stats['queued'] = self.segments.qsize()
+        stats['seconds_open'] = time.perf_counter() - self.opened_at if self.opened_at else 0.0
+        return stats
+
+    def print_report(self):
+        """Print capture health for the session."""
+        stats = self.stats()
+        print("\n🎧 Audio capture")
+        print("=" * 60)
+        print(f"device open {stats['seconds_open']:.0f}s | {stats['chunks']} chunks | "
+              f"segments {stats['segments']} ({stats['during_playback']} while speaking) | queued {stats['queued']}")
+        print(f"overflows: device {stats['device_overflows']}, ring {stats['ring_overruns']}, "
+              f"queue {stats['queue_overflows']} | dropped frames {stats['dropped_frames']} "
+              f"(ring {len(self.ring) / self.sample_rate:.0f}s)")
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Audio Player for Aarav AI Assistant
+
+A dedicated playback thread in front of the pygame mixer:
+
+- enqueue() decodes a clip on the caller's thread (or takes its PCM as is,
+  when it was already decoded) and returns a Future that resolves when the
+  clip has finished playing (or was cancelled), so callers wait on an event
+  instead of polling the mixer
+- Queued clips are handed to one mixer channel ahead of time, so consecutive
+  clips play without gaps
+- The thread sleeps until the current clip is due to end or a command
+  arrives; cancel() stops playback at once and flush() drops queued clips
+- position() reports the clip being played and how far into it playback is
+- A clip pygame cannot play fails its own Future (and releases its events);
+  the thread keeps serving the clips after it
+"""
+
+import threading
+import time
+import warnings
+from collections import deque
+from concurrent.futures import Future
+
+# Suppress all pygame deprecation warnings
+warnings.filterwarnings("ignore", category=UserWarning)
+
+import pygame
+import io
+
+# Extra wait when the mixer is still busy at the computed end of a clip
+END_SLACK = 0.005
+
+
+class _Entry:
+    """A decoded clip waiting for, or in, playback."""
+
+    def __init__(self, clip, sound, on_done=None):
+        self.clip = clip
+        self.sound = sound
+        self.future = Future()
+        self.future.set_running_or_notify_cancel()
+        if on_done is not None:
+            self.future.add_done_callback(on_done)
+        self.ends_at = None
+
+
+class AudioPlayer:
+    def __init__(self):
+        """Start the playback thread (the pygame mixer must already be initialised)."""
+        self._pending = deque()
+        self._playing = deque()
+        self._channel = None
+        self._closed = False
+        self._condition = threading.Condition()
+
+        self.counters = {'played': 0, 'cancelled': 0, 'flushed': 0, 'failed': 0}
+
+        self._thread = threading.Thread(target=self._run, name="audio-player", daemon=True)
+        self._thread.start()
+
+    # ------------------------------------------------------------------------
+    # API
+    # ------------------------------------------------------------------------
+
+    def enqueue(self, clip, on_done=None) -> Future:
+        """
+        Decode a clip and queue it for playback after everything already queued.
+
+        Args:
+            clip (SpeechClip): Clip to play; its duration, started/finished events
+                and started_at are maintained by the player
+            on_done (callable): Called with the Future once the clip is done
+
+        Returns:
+            Future: Resolves to True once the clip has played, False if it was
+                cancelled or flushed first; raises the error if it could not be played
+        """
+        try:
+            if getattr(clip, 'pcm', None) is not None:
+                # Already decoded (post-processed clip): hand the samples to the mixer
+                sound = pygame.mixer.Sound(buffer=clip.pcm)
+            else:
+                sound = pygame.mixer.Sound(io.BytesIO(clip.audio_data))
+            clip.duration = sound.get_length()
+        except Exception:
+            # Release anyone waiting on this clip
+            clip.started.set()
+            clip.finished.set()
+            raise
+
+        entry = _Entry(clip, sound, on_done)
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("audio player is closed")
+            self._pending.append(entry)
+            self._condition.notify()
+        return entry.future
+
+    def play(self, clip) -> bool:
+        """Queue a clip and wait until it is done; True if it played to the end."""
+        return self.enqueue(clip).result()
+
+    def cancel(self):
+        """Stop the current clip at once and drop everything queued."""
+        with self._condition:
+            if self._channel is not None:
+                self._channel.stop()
+            while self._playing:
+                self._finish(self._playing.popleft(), False, 'cancelled')
+            while self._pending:
+                self._finish(self._pending.popleft(), False, 'cancelled')
+            self._condition.notify()
+
+    def flush(self):
+        """Drop queued clips that have not reached the mixer; the current clip plays on."""
+        with self._condition:
+            while self._pending:
+                self._finish(self._pending.popleft(), False, 'flushed')
+
+    def wait(self, timeout: float = None) -> bool:
+        """
+        Wait until everything queued has played.
+
+        Returns:
+            bool: True if the player went idle before the timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while self._playing or self._pending:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def is_busy(self) -> bool:
+        """True while a clip is playing or queued."""
+        with self._condition:
+            return bool(self._playing or self._pending)
+
+    def position(self) -> tuple:
+        """
+        What is playing right now.
+
+        Returns:
+            tuple: (clip, seconds played) or (None, 0.0) when idle
+        """
+        with self._condition:
+            if not self._playing:
+                return None, 0.0
+            clip = self._playing[0].clip
+        return clip, clip.position()
+
+    def close(self):
+        """Stop playback and end the thread."""
+        self.cancel()
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join(timeout=1.0)
+
+    # ------------------------------------------------------------------------
+    # Playback thread
+    # ------------------------------------------------------------------------
+
+    def _finish(self, entry: _Entry, played: bool, counter: str, error: Exception = None):
+        """Resolve an entry (with its playback error, if any) and release its clip (lock held)."""
+        self.counters[counter] += 1
+        entry.clip.started.set()
+        entry.clip.finished.set()
+        if not entry.future.done():
+            if error is not None:
+                entry.future.set_exception(error)
+            else:
+                entry.future.set_result(played)
+        self._condition.notify_all()
+
+    def _start(self, entry: _Entry, at: float):
+        """Mark an entry as started at a perf_counter time (lock held)."""
+        entry.clip.started_at = at
+        entry.ends_at = at + entry.clip.duration
+        entry.clip.started.set()
+
+    def _mixer_behind(self) -> bool:
+        """Check if the mixer has not yet reached the computed end of the current clip."""
+        if self._channel is None:
+            return False
+        if len(self._playing) > 1:
+            return self._channel.get_queue() is not None
+        return self._channel.get_busy()
+
+    def _run(self):
+        with self._condition:
+            while not self._closed:
+                try:
+                    timeout = self._step()
+                except Exception as e:
+                    # The mixer failed under the current clips: fail them, keep serving the queue
+                    print(f"⚠️ Playback failed: {e}")
+                    while self._playing:
+                        self._finish(self._playing.popleft(), False, 'failed', e)
+                    self._channel = None
+                    timeout = None
+                self._condition.wait(timeout)
+
+    def _step(self) -> float:
+        """Retire finished clips and start queued ones (lock held); returns seconds to sleep."""
+        now = time.perf_counter()
+
+        # Retire the current clip once it is due to end and the mixer agrees
+        timeout = None
+        while self._playing and self._playing[0].ends_at <= now:
+            if self._mixer_behind() and now - self._playing[0].ends_at < 0.25:
+                timeout = END_SLACK
+                break
+            self._finish(self._playing.popleft(), True, 'played')
+            if self._playing:
+                self._start(self._playing[0], now)
+
+        # Start the next clip, or queue it on the channel behind the current one
+        while not self._playing and self._pending:
+            entry = self._pending.popleft()
+            try:
+                self._channel = entry.sound.play()
+            except Exception as e:
+                print(f"⚠️ Could not play clip: {e}")
+                self._finish(entry, False, 'failed', e)
+                continue
+            self._start(entry, time.perf_counter())
+            self._playing.append(entry)
+        if len(self._playing) == 1 and self._pending and self._channel is not None:
+            entry = self._pending.popleft()
+            try:
+                self._channel.queue(entry.sound)
+                self._playing.append(entry)
+            except Exception as e:
+                print(f"⚠️ Could not queue clip: {e}")
+                self._finish(entry, False, 'failed', e)
+
+        if timeout is None and self._playing:
+            timeout = max(0.0, self._playing[0].ends_at - time.perf_counter())
+        return timeout
+
+    # ------------------------------------------------------------------------
+    # Reports
+    # ------------------------------------------------------------------------
+
+    def stats(self) -> dict:
+        """Clips played, cancelled and flushed, and what is queued now."""
+        with self._condition:
+            stats = dict(self.counters)
+            stats['queued'] = len(self._pending) + max(0, len(self._playing) - 1)
+        return stats
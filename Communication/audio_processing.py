@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+TTS Clip Post-processing for Aarav AI Assistant
+
+Every synthesised clip is decoded to PCM once, on the synthesis thread, and
+cleaned up with vectorised NumPy operations before it is cached or played:
+
+- Leading and trailing silence below a threshold is trimmed (it otherwise
+  adds straight to the time before Aarav is heard and to how long the loop
+  stays blocked), keeping a short pad so words are not clipped
+- Loudness is normalised to a target RMS level, limited by the peak, so
+  Murf, ElevenLabs and the local engine play at the same volume
+- The result is PCM WAV in the mixer's own format, handed straight to the
+  mixer. The TTS cache stores the backend's compressed clip (PCM is about ten
+  times larger); the speaker keeps recently replayed clips processed in
+  memory so they are not decoded again
+
+Needs NumPy (and pygame.sndarray); without it clips pass through unchanged.
+Set AARAV_TTS_POSTPROCESS=0 to turn it off.
+"""
+
+import io
+import os
+import threading
+import time
+import wave
+from collections import deque
+from typing import NamedTuple, Optional
+
+import warnings
+
+# Suppress all pygame deprecation warnings
+warnings.filterwarnings("ignore", category=UserWarning)
+
+import pygame
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Level below which a 10 ms frame counts as silence
+SILENCE_DBFS = -45.0
+# RMS level speech is normalised to, and the peak it may not exceed
+TARGET_DBFS = -20.0
+PEAK_DBFS = -1.0
+MAX_GAIN_DB = 12.0
+
+FRAME_SECONDS = 0.010
+# Silence kept around the speech so onsets and decays are not clipped
+LEAD_PAD_SECONDS = 0.030
+TAIL_PAD_SECONDS = 0.080
+
+FULL_SCALE = 32768.0
+
+
+class ProcessedAudio(NamedTuple):
+    """A post-processed clip: PCM WAV, its raw samples and what was changed."""
+    audio_data: bytes
+    pcm: bytes
+    word_timings: list
+    trimmed_lead: float
+    trimmed_tail: float
+    gain_db: float
+
+
+def _dbfs(values):
+    """Level of RMS (or peak) sample values in dB relative to full scale."""
+    return 20.0 * np.log10(np.maximum(values, 1e-9) / FULL_SCALE)
+
+
+class AudioPostProcessor:
+    def __init__(self, silence_dbfs: float = SILENCE_DBFS, target_dbfs: float = TARGET_DBFS,
+                 peak_dbfs: float = PEAK_DBFS, max_gain_db: float = MAX_GAIN_DB, recent: int = 32):
+        """
+        Initialize the post-processor.
+
+        Args:
+            silence_dbfs (float): Frames quieter than this are silence
+            target_dbfs (float): RMS level of speech after normalisation
+            peak_dbfs (float): Highest peak normalisation may produce
+            max_gain_db (float): Largest boost applied to a quiet clip
+            recent (int): Clips kept for the per-clip report
+        """
+        self.silence_dbfs = silence_dbfs
+        self.target_dbfs = target_dbfs
+        self.peak_dbfs = peak_dbfs
+        self.max_gain_db = max_gain_db
+        self.enabled = np is not None and os.getenv('AARAV_TTS_POSTPROCESS', '1') != '0'
+
+        self.counters = {'clips': 0, 'lead_seconds': 0.0, 'tail_seconds': 0.0, 'gain_db': 0.0,
+                         'decode_seconds': 0.0, 'audio_seconds': 0.0, 'process_seconds': 0.0,
+                         'replays': 0, 'load_seconds': 0.0, 'replay_audio_seconds': 0.0, 'failed': 0}
+        self.recent = deque(maxlen=recent)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def mixer_format() -> Optional[tuple]:
+        """(frequency, channels) of the mixer when it plays 16-bit samples, else None."""
+        init = pygame.mixer.get_init()
+        if init is None or abs(init[1]) != 16:
+            return None
+        return init[0], init[2]
+
+    def process(self, audio_data: bytes, word_timings=None, text: str = "") -> Optional[ProcessedAudio]:
+        """
+        Decode a clip once, trim its silence and normalise its loudness.
+
+        Args:
+            audio_data (bytes): Encoded clip from a TTS backend
+            word_timings (list): (word, start_seconds, end_seconds), shifted by the trim
+            text (str): Text spoken, for the report
+
+        Returns:
+            ProcessedAudio: Processed clip, or None when processing is off or failed
+        """
+        mixer = self.mixer_format() if self.enabled else None
+        if mixer is None or not audio_data:
+            return None
+        frequency, channels = mixer
+
+        try:
+            start = time.perf_counter()
+            sound = pygame.mixer.Sound(io.BytesIO(audio_data))
+            samples = pygame.sndarray.array(sound)
+            decoded = time.perf_counter()
+            result = self._process_samples(samples, frequency, channels, word_timings)
+        except Exception as e:
+            with self._lock:
+                self.counters['failed'] += 1
+            print(f"⚠️ Could not post-process TTS clip: {e}")
+            return None
+        done = time.perf_counter()
+
+        duration = len(samples) / frequency
+        with self._lock:
+            counters = self.counters
+            counters['clips'] += 1
+            counters['lead_seconds'] += result.trimmed_lead
+            counters['tail_seconds'] += result.trimmed_tail
+            counters['gain_db'] += result.gain_db
+            counters['decode_seconds'] += decoded - start
+            counters['audio_seconds'] += duration
+            counters['process_seconds'] += done - decoded
+            self.recent.append((text, result.trimmed_lead, result.trimmed_tail, result.gain_db, decoded - start))
+        return result
+
+    def _process_samples(self, samples, frequency: int, channels: int, word_timings) -> ProcessedAudio:
+        """Trim and normalise decoded 16-bit samples (frames x channels)."""
+        samples = samples.reshape(len(samples), -1)
+        # Frame levels from the loudest channel
+        envelope = np.abs(samples.astype(np.float32)).max(axis=1)
+        frame = max(1, int(frequency * FRAME_SECONDS))
+        count = len(envelope) // frame
+        if count == 0:
+            return self._result(samples, frequency, channels, 0, len(samples), 0.0, word_timings)
+        frames = np.square(envelope[:count * frame]).reshape(count, frame)
+        levels = _dbfs(np.sqrt(frames.mean(axis=1)))
+        active = levels > self.silence_dbfs
+        if not active.any():
+            return self._result(samples, frequency, channels, 0, len(samples), 0.0, word_timings)
+
+        first = int(np.argmax(active))
+        last = count - 1 - int(np.argmax(active[::-1]))
+        begin = max(0, first * frame - int(LEAD_PAD_SECONDS * frequency))
+        end = min(len(samples), (last + 1) * frame + int(TAIL_PAD_SECONDS * frequency))
+
+        # Gain to bring speech frames to the target RMS, without clipping
+        speech_rms = np.sqrt(frames[active].mean())
+        gain_db = min(self.target_dbfs - float(_dbfs(speech_rms)), self.max_gain_db)
+        peak = float(envelope[begin:end].max())
+        gain_db = min(gain_db, self.peak_dbfs - float(_dbfs(peak)))
+        return self._result(samples, frequency, channels, begin, end, gain_db, word_timings)
+
+    def _result(self, samples, frequency: int, channels: int, begin: int, end: int,
+                gain_db: float, word_timings) -> ProcessedAudio:
+        """Apply the trim and gain and encode the samples as PCM WAV."""
+        trimmed = samples[begin:end]
+        if abs(gain_db) >= 0.1:
+            scaled = trimmed.astype(np.float32) * np.float32(10.0 ** (gain_db / 20.0))
+            trimmed = np.clip(scaled, -FULL_SCALE, FULL_SCALE - 1)
+        else:
+            gain_db = 0.0
+        pcm = np.ascontiguousarray(trimmed, dtype=np.int16).tobytes()
+
+        output = io.BytesIO()
+        with wave.open(output, 'wb') as wav:
+            wav.setnchannels(channels)
+            wav.setsampwidth(2)
+            wav.setframerate(frequency)
+            wav.writeframes(pcm)
+
+        shift = begin / frequency
+        timings = [(word, max(0.0, start - shift), max(0.0, stop - shift))
+                   for word, start, stop in (word_timings or [])]
+        return ProcessedAudio(output.getvalue(), pcm, timings, shift,
+                              (len(samples) - end) / frequency, gain_db)
+
+    def load(self, audio_data: bytes, replay: bool = False) -> Optional[bytes]:
+        """
+        Raw samples of a processed clip, without decoding it.
+
+        Args:
+            audio_data (bytes): Clip from process() (or the TTS cache)
+            replay (bool): Count this as a cached replay in the report
+
+        Returns:
+            bytes: PCM in the mixer's format, or None if the clip must be decoded
+        """
+        mixer = self.mixer_format()
+        if mixer is None or not audio_data.startswith(b'RIFF'):
+            return None
+
+        start = time.perf_counter()
+        try:
+            with wave.open(io.BytesIO(audio_data), 'rb') as wav:
+                if (wav.getframerate(), wav.getnchannels(), wav.getsampwidth()) != (mixer[0], mixer[1], 2):
+                    return None
+                pcm = wav.readframes(wav.getnframes())
+        except (wave.Error, EOFError):
+            return None
+
+        if replay:
+            with self._lock:
+                self.counters['replays'] += 1
+                self.counters['load_seconds'] += time.perf_counter() - start
+                self.counters['replay_audio_seconds'] += len(pcm) / (2 * mixer[1] * mixer[0])
+        return pcm
+
+    # ------------------------------------------------------------------------
+    # Reports
+    # ------------------------------------------------------------------------
+
+    def stats(self) -> dict:
+        """
+        Per-clip savings.
+
+        Returns:
+            dict: Clips processed and replayed, mean trimmed/decode/load milliseconds
+                per clip and estimated decode milliseconds saved per replay
+        """
+        with self._lock:
+            counters = dict(self.counters)
+        clips, replays = counters['clips'], counters['replays']
+        per_clip = lambda key: 1000 * counters[key] / clips if clips else 0.0
+
+        # Decode cost scales with clip length: estimate what replays would have cost
+        decode_rate = counters['decode_seconds'] / counters['audio_seconds'] if counters['audio_seconds'] else 0.0
+        replay_decode = decode_rate * counters['replay_audio_seconds']
+        saved_per_replay = 1000 * max(0.0, replay_decode - counters['load_seconds']) / replays if replays else 0.0
+        return {
+            'clips': clips,
+            'failed': counters['failed'],
+            'lead_ms': per_clip('lead_seconds'),
+            'tail_ms': per_clip('tail_seconds'),
+            'trimmed_ms': per_clip('lead_seconds') + per_clip('tail_seconds'),
+            'gain_db': counters['gain_db'] / clips if clips else 0.0,
+            'decode_ms': per_clip('decode_seconds'),
+            'process_ms': per_clip('process_seconds'),
+            'replays': replays,
+            'load_ms': 1000 * counters['load_seconds'] / replays if replays else 0.0,
+            'replay_saved_ms': saved_per_replay
+        }
+
+    def print_report(self):
+        """Print milliseconds saved per clip, and the most recent clips."""
+        stats = self.stats()
+        print("\n🎚️ TTS post-processing")
+        print("=" * 60)
+        if not self.enabled:
+            print("off (needs numpy; AARAV_TTS_POSTPROCESS=0 disables it)")
+            return
+        print(f"clips {stats['clips']} | trimmed {stats['trimmed_ms']:.0f} ms per clip "
+              f"(lead {stats['lead_ms']:.0f} + tail {stats['tail_ms']:.0f}) | gain {stats['gain_db']:+.1f} dB avg")
+        print(f"decode {stats['decode_ms']:.1f} ms + processing {stats['process_ms']:.1f} ms per new clip | "
+              f"failed {stats['failed']}")
+        print(f"cached replays {stats['replays']}: load {stats['load_ms']:.2f} ms, "
+              f"~{stats['replay_saved_ms']:.1f} ms decode saved per clip")
+        with self._lock:
+            recent = list(self.recent)[-5:]
+        for text, lead, tail, gain_db, decode in recent:
+            label = text if len(text) <= 32 else text[:29] + "..."
+            print(f"  {label:<32} -{1000 * (lead + tail):>5.0f} ms  {gain_db:+5.1f} dB  decode {1000 * decode:.1f} ms")
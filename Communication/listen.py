@@ -1,39 +1,189 @@
+import os
+import sys
+import time
 import speech_recognition as sr
 
+# Add project root to path for shared modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tracing import span
+
+try:
+    from Communication.vad import VADEndpointer
+    from Communication.audio_capture import AudioCapture
+except ImportError:
+    # NumPy missing: fall back to speech_recognition's own endpointing
+    VADEndpointer = None
+
+try:
+    from Communication.wake_word import WakeWordSpotter
+except ImportError:
+    WakeWordSpotter = None
+
+from Communication.streaming_stt import StreamingTranscriber, create_recognizer
+
 class SpeechToText:
-    def __init__(self):
-        """Initialize speech recognition."""
+    def __init__(self, use_vad: bool = None, wake_spotter=None, echo_guard=None, transcriber=None,
+                 on_early_intent=None):
+        """
+        Initialize speech recognition.
+        
+        With the VAD endpointer, a background thread keeps the microphone open
+        for the whole session and queues utterances (see audio_capture.py).
+        
+        Args:
+            use_vad (bool): End utterances with the local VAD endpointer
+                (default: when NumPy is installed and AARAV_VAD is not 0)
+            wake_spotter (WakeWordSpotter): Local wake-phrase check for sleep mode
+                (default: from Communication/wake_templates unless AARAV_WAKE_WORD=0)
+            echo_guard (callable): Returns True while Aarav is speaking; utterances
+                that start then are skipped while ignore_own_speech is set
+            transcriber (StreamingTranscriber): Partial recognition while the user speaks
+                (default: the engine named by AARAV_STREAMING_STT; needs the VAD endpointer)
+            on_early_intent (callable): on_early_intent(intent, hypothesis), called from the
+                transcriber thread when a confident partial is an early command such as "stop"
+        """
         self.recognizer = sr.Recognizer()
         self.microphone = sr.Microphone()
         
+        if use_vad is None:
+            use_vad = VADEndpointer is not None and os.getenv('AARAV_VAD', '1') != '0'
+        self.endpointer = VADEndpointer(self.microphone.SAMPLE_RATE) if use_vad else None
+        
+        # While asleep, only utterances that sound like the wake phrase go to the cloud
+        if wake_spotter is None and WakeWordSpotter is not None and os.getenv('AARAV_WAKE_WORD', '1') != '0':
+            wake_spotter = WakeWordSpotter.from_directory()
+        self.wake_spotter = wake_spotter
+        
+        # Aarav's own voice picked up by the mic is not a new utterance
+        self.ignore_own_speech = True
+        
+        # Partial transcripts are streamed from the capture thread
+        if transcriber is None and self.endpointer is not None:
+            recognizer = create_recognizer(sample_rate=self.microphone.SAMPLE_RATE)
+            transcriber = StreamingTranscriber(recognizer) if recognizer is not None else None
+        self.transcriber = transcriber if self.endpointer is not None else None
+        self.on_early_intent = on_early_intent
+        if self.transcriber is not None:
+            self.transcriber.on_early_intent = self._early_intent
+        
         # Adjust for ambient noise
-        with self.microphone as source:
-            self.recognizer.adjust_for_ambient_noise(source, duration=1)
+        if self.endpointer is not None:
+            self.audio_capture = AudioCapture(self.microphone, self.endpointer)
+            self.audio_capture.echo_guard = echo_guard
+            self.audio_capture.transcriber = self.transcriber
+            self.audio_capture.start()
+        else:
+            self.audio_capture = None
+            with self.microphone as source:
+                self.recognizer.adjust_for_ambient_noise(source, duration=1)
     
-    def listen_and_convert(self):
+    def capture(self, timeout=None):
         """
-        Listen to voice input and convert to English text.
-        Listens until user stops talking.
+        Capture one utterance from the microphone without recognizing it.
         
+        Args:
+            timeout (float): Seconds to wait for speech to start, None to wait forever
+            
         Returns:
-            str: English text, None if no speech detected
+            sr.AudioData: Captured audio, None if no speech started before the timeout
         """
+        if self.audio_capture is not None:
+            with span('stt.capture'):
+                return self._next_utterance(timeout)
+        
         try:
-            with self.microphone as source:
-                # Listen without timeout - waits until user stops talking
-                audio = self.recognizer.listen(source)
-                
-                # Convert speech to text (English only)
-                text = self.recognizer.recognize_google(audio, language='en-US')
-                
+            with span('stt.capture'), self.microphone as source:
+                return self.recognizer.listen(source, timeout=timeout)
+        except sr.WaitTimeoutError:
+            return None
+    
+    def _next_utterance(self, timeout=None):
+        """Take the next queued utterance, skipping Aarav's own voice."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            audio = self.audio_capture.next_segment(remaining)
+            if audio is None:
+                return None
+            if not (audio.during_playback and self.ignore_own_speech):
+                return audio
+    
+    def _early_intent(self, intent: str, hypothesis, during_playback: bool):
+        """Pass a confident partial command on to on_early_intent."""
+        # A "stop" over Aarav's voice is exactly the barge-in case. Only
+        # dispatching the utterance itself is subject to ignore_own_speech.
+        if during_playback and self.ignore_own_speech and intent != 'stop':
+            return
+        if self.on_early_intent is not None:
+            self.on_early_intent(intent, hypothesis)
+    
+    def recognize(self, audio, wake_only: bool = False):
+        """
+        Convert captured audio to English text.
+        
+        Args:
+            audio (sr.AudioData): Audio returned by capture()
+            wake_only (bool): Sleep mode: skip the cloud unless the wake phrase is spotted
+            
+        Returns:
+            str: English text, None if no speech detected
+        """
+        if wake_only and self.wake_spotter is not None:
+            with span('stt.wake_word'):
+                if not self.wake_spotter.detect(audio.frame_data, audio.sample_rate):
+                    return None
+        
+        # A confident local transcript makes the cloud request unnecessary
+        stream_transcript = getattr(audio, 'stream_transcript', None)
+        if stream_transcript is not None and self.transcriber is not None:
+            with span('stt.stream_final'):
+                text = self.transcriber.final_text(stream_transcript)
+            if text:
                 return text
-                
+        
+        try:
+            # Convert speech to text (English only)
+            with span('stt.recognize'):
+                return self.recognizer.recognize_google(audio, language='en-US')
         except sr.UnknownValueError:
             return None
         except sr.RequestError as e:
             return None
         except Exception as e:
             return None
+    
+    def listen_and_convert(self, wake_only: bool = False):
+        """
+        Listen to voice input and convert to English text.
+        Listens until user stops talking.
+        
+        Args:
+            wake_only (bool): Sleep mode: only recognize utterances with the wake phrase
+        
+        Returns:
+            str: English text, None if no speech detected
+            
+        Raises:
+            CaptureError: The background capture thread died
+        """
+        try:
+            # Listen without timeout - waits until user stops talking
+            audio = self.capture()
+            
+            return self.recognize(audio, wake_only) if audio else None
+                
+        except Exception as e:
+            # A dead capture thread would fail every turn: let the caller see it
+            if self.audio_capture is not None and self.audio_capture.error is not None:
+                raise
+            return None
+    
+    def close(self):
+        """Stop background capture and release the microphone."""
+        if self.audio_capture is not None:
+            self.audio_capture.close()
+        if self.transcriber is not None:
+            self.transcriber.close()
 
 # Simple function interface
 def listen_to_speech():
@@ -45,4 +195,7 @@ def listen_to_speech():
         str: English text, None if no speech detected
     """
     stt = SpeechToText()
-    return stt.listen_and_convert()
\ No newline at end of file
+    try:
+        return stt.listen_and_convert()
+    finally:
+        stt.close()
\ No newline at end of file
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Phrase Warm-up for Aarav AI Assistant
+
+Everything Aarav can say without the brain (wake and intro messages,
+goodbyes, error lines) is known up front. This job synthesises those phrases
+into the TTS cache in the background after start, so even the first wake-up
+plays without a round trip to the TTS service.
+
+- A small worker pool caps how many synthesis requests run at once
+- Phrases already cached for the current voice and style are skipped
+- When the speaker's voice or style changes, the whole vocabulary is warmed again
+
+Set AARAV_TTS_WARMUP=0 to turn it off.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class PhraseWarmer:
+    def __init__(self, get_speaker, max_workers: int = 2):
+        """
+        Initialize the warm-up job.
+
+        Args:
+            get_speaker (callable): Returns the speaker (may block until it is built);
+                only called on worker threads
+            max_workers (int): Synthesis requests in flight at once
+        """
+        self.get_speaker = get_speaker
+        self.max_workers = max_workers
+        self.enabled = os.getenv('AARAV_TTS_WARMUP', '1') != '0'
+
+        self.phrases = []
+        self.counters = {'synthesised': 0, 'already_cached': 0, 'failed': 0, 'seconds': 0.0}
+
+        self._bound = False
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tts-warm")
+        self._lock = threading.Lock()
+
+    def add(self, phrases):
+        """
+        Add phrases to the canned vocabulary and warm them (returns immediately).
+
+        Args:
+            phrases (iterable): Fixed texts Aarav may speak; earlier ones are warmed first
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            new = [phrase for phrase in dict.fromkeys(phrases) if phrase and phrase not in self.phrases]
+            self.phrases.extend(new)
+        for phrase in new:
+            self._executor.submit(self._warm, phrase)
+
+    def recheck(self, *_):
+        """Warm the whole vocabulary again if the speaker's voice or style changed."""
+        if not self.enabled:
+            return
+        with self._lock:
+            phrases = list(self.phrases)
+        for phrase in phrases:
+            self._executor.submit(self._warm, phrase)
+
+    def _warm(self, phrase: str):
+        """Synthesise one phrase into the TTS cache unless it is already there (worker thread)."""
+        try:
+            speaker = self.get_speaker()
+        except Exception:
+            # The speaker failed to build; that is reported where it is built
+            self._count('failed')
+            return
+
+        try:
+            cache = getattr(speaker, 'tts_cache', None)
+            if cache is None:
+                return
+            self._bind(speaker)
+
+            if speaker.is_cached(phrase):
+                self._count('already_cached')
+                return
+
+            # Wait for the preferred backend: a local fallback clip is not worth warming
+            start = time.perf_counter()
+            speaker.synthesize_clip(phrase, allow_fallback=False)
+            self._count('synthesised')
+            self._count('seconds', time.perf_counter() - start)
+        except Exception as e:
+            self._count('failed')
+            print(f"⚠️ Could not pre-synthesise \"{phrase[:40]}\": {e}")
+
+    def _bind(self, speaker):
+        """Follow the speaker's voice changes (once)."""
+        with self._lock:
+            if self._bound:
+                return
+            self._bound = True
+        add_listener = getattr(speaker, 'add_voice_listener', None)
+        if add_listener is not None:
+            add_listener(self.recheck)
+
+    def _count(self, counter: str, amount=1):
+        with self._lock:
+            self.counters[counter] += amount
+
+    def stats(self) -> dict:
+        """
+        Warm-up counters.
+
+        Returns:
+            dict: Phrases known, synthesised, already cached, failed and synthesis seconds
+        """
+        with self._lock:
+            stats = dict(self.counters)
+            stats['phrases'] = len(self.phrases)
+        return stats
+
+    def print_report(self):
+        """Print warm-up counters."""
+        stats = self.stats()
+        print("\n🔥 Phrase warm-up")
+        print("=" * 60)
+        print(f"phrases {stats['phrases']} | synthesised {stats['synthesised']} in {stats['seconds']:.1f}s | "
+              f"already cached {stats['already_cached']} | failed {stats['failed']}")
+
+    def shutdown(self):
+        """Stop the workers; queued phrases are dropped."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -2,27 +2,27 @@
 """
 Text-to-Speech Module for Aarav AI Assistant
 
-This module supports both Murf and ElevenLabs text-to-speech services.
+Speech is synthesised by pluggable backends (see tts_backends.py): Murf,
+ElevenLabs and an offline local engine (piper / espeak-ng). Each call has a
+latency budget; when the remote backend is too slow or keeps failing, the
+local engine speaks instead. Clips are trimmed of silence and normalised in
+loudness (audio_processing.py) before they are played; the audio cache keeps
+the backend's compressed clip, and recently replayed clips stay processed in
+memory.
 
-CURRENTLY ACTIVE: Murf Text-to-Speech
-- Voice: en-US-natalie (Inspirational style)
-- API Key: MURF_API_KEY (from .env file)
+CURRENT VOICE: Murf en-US-natalie (Inspirational style)
 - Previous: en-US-ken (Conversational) - commented out
 
-TO SWITCH TO ELEVENLABS:
-1. Uncomment the ElevenLabsSpeaker class (lines ~79-159)
-2. Comment out the MurfSpeaker class (lines ~19-77)
-3. In get_speaker() function, comment Murf line and uncomment ElevenLabs line
-4. Update your .env file with ELEVENLABS_API_KEY
-
-Both implementations are preserved for easy switching.
+Choose and order backends with AARAV_TTS_BACKENDS (default "murf,local"),
+e.g. "elevenlabs,local" to use ElevenLabs (ELEVENLABS_API_KEY in .env).
 """
 
 import os
-import tempfile
+import sys
+import threading
 import time
-import requests
-from murf import Murf
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
 from dotenv import load_dotenv
 import warnings
 
@@ -30,27 +30,62 @@ import warnings
 warnings.filterwarnings("ignore", category=UserWarning)
 
 import pygame
-import io
+
+# Add project root to path for shared modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tracing import span
+from Communication.speech_clip import SpeechClip, split_speech_chunks
+from Communication.audio_player import AudioPlayer
+from Communication.tts_cache import get_tts_cache
+from Communication.tts_backends import TTSRouter, create_backends
+from Communication.audio_processing import AudioPostProcessor
 
 # Load environment variables from .env file
 load_dotenv()
 
-# ============================================================================
-# ACTIVE IMPLEMENTATION: MURF TEXT-TO-SPEECH
-# ============================================================================
-
-class MurfSpeaker:
-    def __init__(self):
-        """Initialize Murf text-to-speech."""
-        self.api_key = os.getenv('MURF_API_KEY')
-        if not self.api_key:
-            raise ValueError("MURF_API_KEY not found in environment variables. Please check your .env file.")
+class Speaker:
+    def __init__(self, backends: list = None, latency_budget: float = None, max_parallel_synthesis: int = 3):
+        """
+        Initialize text-to-speech.
         
-        # Initialize Murf client with explicit API key
-        self.client = Murf(api_key=self.api_key)
+        Args:
+            backends (list): TTS backends in preference order (default: AARAV_TTS_BACKENDS)
+            latency_budget (float): Seconds a clip may wait for a remote backend
+                before the local engine is used (default: AARAV_TTS_BUDGET)
+            max_parallel_synthesis (int): Chunks synthesised at once for long texts
+        """
+        if backends is None:
+            backends = create_backends()
+        if not backends:
+            raise ValueError("No TTS backend available. Set MURF_API_KEY in your .env file or install espeak-ng.")
+        self.tts_router = TTSRouter(backends, budget=latency_budget)
+        
+        # Repeated phrases are replayed from the audio cache; concurrent
+        # requests for the same phrase share one synthesis
+        self.tts_cache = get_tts_cache()
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+        self._voice_listeners = []
         
-        # Initialize pygame mixer for audio playback
+        # Long texts are split into sentence chunks synthesised concurrently
+        self.synthesis_pool = ThreadPoolExecutor(max_workers=max_parallel_synthesis,
+                                                 thread_name_prefix="tts-synth")
+        
+        # stop() bumps the generation: speech started before it must not be queued any more
+        self.generation = 0
+        self._pending_synthesis = set()
+        self._pending_lock = threading.Lock()
+        
+        # Initialize pygame mixer for audio playback, driven by the player thread
         pygame.mixer.init()
+        self.player = AudioPlayer()
+        
+        # Clips are decoded once, trimmed and normalised before playback; the
+        # most recently replayed cached clips are kept processed
+        self.postprocessor = AudioPostProcessor()
+        self._processed = OrderedDict()
+        self._processed_lock = threading.Lock()
+        self.processed_clips = 32
         
         # Voice configuration as specified
         # Previous voice (commented out for easy switching):
@@ -60,10 +95,270 @@ class MurfSpeaker:
         # Current active voice:
         self.voice_id = "en-US-natalie"
         self.style = "Inspirational"
+    
+    def set_voice(self, voice_id: str, style: str):
+        """
+        Switch voice and style, and tell listeners (e.g. the phrase warm-up).
+        
+        Args:
+            voice_id (str): Murf voice, e.g. 'en-US-ken'
+            style (str): Voice style, e.g. 'Conversational'
+        """
+        changed = (voice_id, style) != (self.voice_id, self.style)
+        self.voice_id = voice_id
+        self.style = style
+        if changed:
+            for listener in list(self._voice_listeners):
+                listener(voice_id, style)
+    
+    def add_voice_listener(self, callback):
+        """Call callback(voice_id, style) whenever set_voice() changes the voice."""
+        self._voice_listeners.append(callback)
+    
+    def _cache_voice(self, backend=None) -> tuple:
+        """(voice, style) a backend's clips are cached under (default: the preferred backend)."""
+        return (backend or self.tts_router.primary).cache_voice(self.voice_id, self.style)
+    
+    def is_cached(self, text: str) -> bool:
+        """Check if text is cached in the preferred backend's voice."""
+        return self.tts_cache is not None and self.tts_cache.contains(text, *self._cache_voice())
+
+    def synthesize_clip(self, text: str, budget: float = None, allow_fallback: bool = True) -> SpeechClip:
+        """
+        Generate speech for text, keeping any word timings the backend returns.
+        
+        Args:
+            text (str): Text to synthesize
+            budget (float): Seconds to wait for a remote backend before the
+                local engine is used (default: the speaker's latency budget)
+            allow_fallback (bool): False always waits for the preferred voice
+                (used by the warm-up)
+            
+        Returns:
+            SpeechClip: Encoded audio clip with word timings
+        """
+        voice = self._cache_voice()
+        if self.tts_cache is not None:
+            with span('tts.cache'):
+                cached = self.tts_cache.get(text, *voice)
+            if cached is not None:
+                return self._cached_clip(text, voice, cached)
+        
+        # Someone is already synthesising this phrase (e.g. the warm-up): wait for it
+        key = (text,) + voice
+        with self._inflight_lock:
+            pending = self._inflight.get(key)
+            if pending is None:
+                self._inflight[key] = Future()
+        if pending is not None:
+            wait = self.tts_router.budget if budget is None else budget
+            if not allow_fallback or self.tts_router.local is None:
+                wait = None
+            try:
+                audio_data, word_timings = pending.result(timeout=wait)
+                return self._clip(text, audio_data, word_timings)
+            except FutureTimeout:
+                # Too slow for this turn: let the router pick (it falls back to the local engine)
+                backend, audio_data, word_timings = self.tts_router.synthesize(
+                    text, self.voice_id, self.style, budget=0.0, allow_fallback=True)
+                return self._clip(text, *self._postprocess(text, audio_data, word_timings))
+        
+        try:
+            audio_data, word_timings = self._synthesize_audio(text, budget, allow_fallback)
+        except Exception as e:
+            with self._inflight_lock:
+                future = self._inflight.pop(key)
+            future.set_exception(e)
+            raise
+        with self._inflight_lock:
+            future = self._inflight.pop(key)
+        future.set_result((audio_data, word_timings))
+        return self._clip(text, audio_data, word_timings)
+    
+    def _clip(self, text: str, audio_data: bytes, word_timings, replay: bool = False) -> SpeechClip:
+        """Wrap audio in a SpeechClip, attaching its PCM when it needs no decoding."""
+        clip = SpeechClip(text, audio_data, word_timings)
+        clip.pcm = self.postprocessor.load(audio_data, replay=replay)
+        return clip
+    
+    def _cached_clip(self, text: str, voice: tuple, cached) -> SpeechClip:
+        """Clip for a cache hit: the backend's clip is post-processed once, then replayed from memory."""
+        key = (text,) + voice
+        with self._processed_lock:
+            processed = self._processed.get(key)
+            if processed is not None:
+                self._processed.move_to_end(key)
+        if processed is not None:
+            return self._clip(text, *processed, replay=True)
+        
+        clip = self._clip(text, cached.audio_data, cached.word_timings, replay=True)
+        if clip.pcm is None and self.postprocessor.enabled:
+            processed = self.postprocessor.process(cached.audio_data, cached.word_timings, text)
+            if processed is not None:
+                with self._processed_lock:
+                    self._processed[key] = (processed.audio_data, processed.word_timings)
+                    while len(self._processed) > self.processed_clips:
+                        self._processed.popitem(last=False)
+                clip = SpeechClip(text, processed.audio_data, processed.word_timings)
+                clip.pcm = processed.pcm
+        return clip
+    
+    def _postprocess(self, text: str, audio_data: bytes, word_timings) -> tuple:
+        """Trim and normalise a fresh clip; returns (audio_data, word_timings)."""
+        with span('tts.postprocess'):
+            processed = self.postprocessor.process(audio_data, word_timings, text)
+        if processed is None:
+            return audio_data, word_timings
+        return processed.audio_data, processed.word_timings
+    
+    def _synthesize_audio(self, text: str, budget: float, allow_fallback: bool) -> tuple:
+        """Synthesise with the router, cache the backend's clip and post-process it; returns (audio_data, word_timings)."""
+        voice_id, style = self.voice_id, self.style
+        start = time.perf_counter()
+        
+        # The cache keeps the backend's compressed clip, not the (much larger) processed WAV
+        def cache_late(backend, audio_data, word_timings):
+            # A remote clip that missed the budget still serves the next request
+            if self.tts_cache is not None:
+                self.tts_cache.put(text, *backend.cache_voice(voice_id, style), audio_data, word_timings,
+                                   time.perf_counter() - start)
+        
+        with span('tts.synthesize', chars=len(text)):
+            backend, audio_data, word_timings = self.tts_router.synthesize(
+                text, voice_id, style, budget=budget, allow_fallback=allow_fallback, on_late=cache_late)
+        
+        if self.tts_cache is not None:
+            self.tts_cache.put(text, *backend.cache_voice(voice_id, style), audio_data, word_timings,
+                               time.perf_counter() - start)
+        return self._postprocess(text, audio_data, word_timings)
+    
+    def synthesize_async(self, text: str) -> Future:
+        """
+        Start synthesising text on the speaker's worker pool.
+        
+        Args:
+            text (str): Text to synthesize
+            
+        Returns:
+            Future: Resolves to the SpeechClip (cancelled by stop() if not started yet)
+        """
+        future = self.synthesis_pool.submit(self.synthesize_clip, text)
+        with self._pending_lock:
+            self._pending_synthesis.add(future)
+        future.add_done_callback(self._synthesis_done)
+        return future
+    
+    def _synthesis_done(self, future: Future):
+        with self._pending_lock:
+            self._pending_synthesis.discard(future)
+    
+    def synthesize(self, text: str) -> bytes:
+        """
+        Generate speech audio for text, without playing it.
+        
+        Args:
+            text (str): Text to synthesize
+            
+        Returns:
+            bytes: Encoded audio clip
+        """
+        return self.synthesize_clip(text).audio_data
+    
+    def play_async(self, clip: SpeechClip, on_done=None) -> Future:
+        """
+        Queue a clip on the player thread and return without waiting.
+        
+        Args:
+            clip (SpeechClip): Clip returned by synthesize_clip()
+            on_done (callable): Called with the Future once the clip is done
+            
+        Returns:
+            Future: Resolves to True once the clip has played, False if it was stopped
+        """
+        with span('tts.decode'):
+            return self.player.enqueue(clip, on_done)
+    
+    def play_clip(self, clip: SpeechClip):
+        """
+        Play a clip and wait until it finishes, signalling its start and end events.
+        
+        Args:
+            clip (SpeechClip): Clip returned by synthesize_clip()
+        """
+        done = self.play_async(clip)
+        with span('tts.playback', seconds=round(clip.duration, 2)):
+            done.result()
+    
+    def play_sequence(self, clip_futures):
+        """
+        Play clips back to back, in order and without gaps.
+        
+        Each clip is queued on the player as soon as its synthesis finishes,
+        so it is decoded while the previous one plays and starts the moment
+        the previous one ends. A clip whose synthesis failed is skipped.
+        
+        Args:
+            clip_futures (list): Futures resolving to SpeechClips, in speaking order
+        """
+        generation = self.generation
+        last = None
+        for future in clip_futures:
+            if self.is_stopped(generation):
+                future.cancel()
+                continue
+            try:
+                clip = future.result()
+                if not self.is_stopped(generation):
+                    last = self.play_async(clip)
+                    if self.is_stopped(generation):
+                        # stop() ran while the clip was being queued
+                        self.player.cancel()
+            except Exception as e:
+                if not self.is_stopped(generation):
+                    print(f"TTS error: {e}")
+        
+        if last is not None:
+            with span('tts.playback'):
+                last.result()
+    
+    def stop(self):
+        """Stop speaking at once: drop queued clips and synthesis that has not started."""
+        with self._pending_lock:
+            self.generation += 1
+            pending = list(self._pending_synthesis)
+        for future in pending:
+            future.cancel()
+        self.player.cancel()
+    
+    def is_stopped(self, generation: int) -> bool:
+        """
+        Check if stop() was called since the generation was read.
+        
+        Args:
+            generation (int): Value of speaker.generation when the speech started
+        """
+        return self.generation != generation
+    
+    def is_speaking(self) -> bool:
+        """True while a clip is playing or queued."""
+        return self.player.is_busy()
+    
+    def position(self) -> tuple:
+        """(clip, seconds played) for the clip being spoken, or (None, 0.0) when silent."""
+        return self.player.position()
+    
+    def play(self, audio_data: bytes):
+        """
+        Play an encoded audio clip and wait until it finishes.
+        
+        Args:
+            audio_data (bytes): Audio returned by synthesize()
+        """
+        self.play_clip(SpeechClip("", audio_data))
 
     def speak_text(self, text: str):
         """
-        Generate and speak text using Murf.
+        Generate and speak text.
         
         Args:
             text (str): Text to speak
@@ -72,40 +367,12 @@ class MurfSpeaker:
             return
             
         try:
-            # Generate speech using Murf API
-            audio_res = self.client.text_to_speech.generate(
-                text=text,
-                voice_id=self.voice_id,
-                style=self.style
-            )
-            
-            # Get the audio file from response
-            audio_file_path = audio_res.audio_file
-            
-            # Check if it's a URL or file path
-            if audio_file_path.startswith('http'):
-                # Download the audio file
-                import requests
-                audio_response = requests.get(audio_file_path)
-                audio_data = audio_response.content
-            else:
-                # Read from local file path
-                with open(audio_file_path, 'rb') as audio_file:
-                    audio_data = audio_file.read()
-            
-            # Create a sound object from the audio data
-            audio_buffer = io.BytesIO(audio_data)
-            sound = pygame.mixer.Sound(audio_buffer)
-            
-            # Play the sound
-            sound.play()
-            
-            # Wait for the sound to finish playing
-            while pygame.mixer.get_busy():
-                time.sleep(0.1)
+            # Synthesise sentence chunks concurrently, start playing the first one when ready
+            clip_futures = [self.synthesize_async(chunk) for chunk in split_speech_chunks(text)]
+            self.play_sequence(clip_futures)
             
         except Exception as e:
-            print(f"Murf API error: {e}")
+            print(f"TTS error: {e}")
             # Fallback to simple print if speech fails
             print(f"🤖 Aarav: {text}")
     
@@ -118,103 +385,11 @@ class MurfSpeaker:
         """
         self.speak_text(text)
 
-# ============================================================================
-# COMMENTED IMPLEMENTATION: ELEVENLABS TEXT-TO-SPEECH
-# To switch back to ElevenLabs, uncomment this section and comment out Murf section above
-# ============================================================================
-
-# class ElevenLabsSpeaker:
-#     def __init__(self):
-#         """Initialize ElevenLabs text-to-speech."""
-#         self.api_key = os.getenv('ELEVENLABS_API_KEY')
-#         if not self.api_key:
-#             raise ValueError("ELEVENLABS_API_KEY not found in environment variables. Please check your .env file.")
-#         
-#         self.base_url = "https://api.elevenlabs.io/v1/text-to-speech"
-#         self.headers = {
-#             'Content-Type': 'application/json',
-#             'xi-api-key': self.api_key
-#         }
-#         
-#         # Initialize pygame mixer for audio playback
-#         pygame.mixer.init()
-#         
-#         # Default voice ID (Rachel - a clear, friendly voice)
-#         # You can change this to any voice ID from ElevenLabs
-#         self.voice_id = "jqcCZkN6Knx8BJ5TBdYR"
-#         # Available voices:
-#         # jhon-2ro171emrYO7IuOOs8rf, G6TsGA4LBTYQWAMgsYzl|
-#         # sam-scOwDtmlUjD3prqpp97I
-#         # james-EkK5I93UQWFDigLMpZcX
-#         # david-v9LgF91V36LGgbLX3iHW
-#         # mask-UgBBYS2sOqTuMpoF3BR0
-#         # girl- jqcCZkN6Knx8BJ5TBdYR (aman api) , cgSgspJ2msm6clMCkdW9 , z9fAnlkpzviPz146aGWa (aman api), tnSpp4vdxKPjI9w0GnoV (aman api),  ZF6FPAbjXT4488VcRRnw , 56AoDkrOh6qfVPDXZ7Pt , g6xIsTj2HwM6VR4iXFCw , 0CyqXXfWDNMyXb9GqyLH (aman api)
-
-#     def speak_text(self, text: str):
-#         """
-#         Generate and speak text using ElevenLabs.
-#         
-#         Args:
-#             text (str): Text to speak
-#         """
-#         if not text or text.strip() == "":
-#             return
-#             
-#         try:
-#             # Prepare the request payload
-#             payload = {
-#                 "text": text,
-#                 "model_id": "eleven_monolingual_v1",
-#                 "voice_settings": {
-#                     "stability": 0.5,
-#                     "similarity_boost": 0.75,
-#                     "style": 0.0,
-#                     "use_speaker_boost": True
-#                 }
-#             }
-#             
-#             # Make the API request
-#             url = f"{self.base_url}/{self.voice_id}"
-#             response = requests.post(
-#                 url,
-#                 headers=self.headers,
-#                 json=payload,
-#                 timeout=30
-#             )
-#             
-#             # Check if request was successful
-#             response.raise_for_status()
-#             
-#             # Get the audio data from response
-#             audio_data = response.content
-#             
-#             # Create a sound object from the audio data
-#             audio_file = io.BytesIO(audio_data)
-#             sound = pygame.mixer.Sound(audio_file)
-#             
-#             # Play the sound
-#             sound.play()
-#             
-#             # Wait for the sound to finish playing
-#             while pygame.mixer.get_busy():
-#                 time.sleep(0.1)
-#             
-#         except Exception as e:
-#             print(f"ElevenLabs API error: {e}")
-#             # Fallback to simple print if speech fails
-#             print(f"🤖 Aarav: {text}")
-#     
-#     def speak(self, text: str):
-#         """
-#         Speak the given text (alias for speak_text).
-#         
-#         Args:
-#             text (str): Text to speak
-#         """
-#         self.speak_text(text)
+# Older name, kept for existing imports
+MurfSpeaker = Speaker
 
 # ============================================================================
-# GLOBAL FUNCTIONS - CURRENTLY USING MURF
+# GLOBAL FUNCTIONS
 # ============================================================================
 
 # Global speaker instance
@@ -224,13 +399,12 @@ def get_speaker():
     """Get or create the global speaker instance."""
     global _speaker
     if _speaker is None:
-        _speaker = MurfSpeaker()  # ACTIVE: Using Murf
-        # _speaker = ElevenLabsSpeaker()  # COMMENTED: To use ElevenLabs, uncomment this line and comment above
+        _speaker = Speaker()
     return _speaker
 
 def speak_text(text: str):
     """
-    Simple function to speak text using Murf.
+    Simple function to speak text.
     
     Args:
         text (str): Text to speak
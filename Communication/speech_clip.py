@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Speech clip: synthesised audio plus its playback clock, and the sentence
+chunking used to synthesise long texts in parallel.
+
+Shared by the real speakers and the offline stand-ins, so it only depends on
+the standard library.
+"""
+
+import re
+import threading
+import time
+
+
+class SpeechClip:
+    def __init__(self, text: str, audio_data: bytes, word_timings=None):
+        """
+        Hold a synthesised clip and follow its playback.
+        
+        Args:
+            text (str): Text the clip speaks
+            audio_data (bytes): Encoded audio clip
+            word_timings (list): (word, start_seconds, end_seconds) from the TTS service, if any
+        """
+        self.text = text
+        self.audio_data = audio_data
+        self.word_timings = word_timings or []
+        
+        # Raw samples in the mixer's format when the clip is already decoded
+        self.pcm = None
+        
+        # Set from the decoded clip when playback starts
+        self.duration = None
+        self.started_at = None
+        
+        # Playback events so callers can wait instead of polling
+        self.started = threading.Event()
+        self.finished = threading.Event()
+    
+    def position(self) -> float:
+        """Seconds of audio played so far (0 before playback starts)."""
+        if self.started_at is None:
+            return 0.0
+        elapsed = time.perf_counter() - self.started_at
+        return min(elapsed, self.duration) if self.duration else elapsed
+    
+    def word_schedule(self, words):
+        """
+        Work out when each word is spoken, relative to the start of playback.
+        
+        Uses the service's word timings when available, otherwise spreads the
+        decoded clip duration over the words in proportion to their length.
+        
+        Args:
+            words (list): Words of the text as displayed
+            
+        Returns:
+            list: Start time in seconds for each word
+        """
+        if not words:
+            return []
+        
+        if self.word_timings:
+            # Map displayed words onto service words by relative position
+            scale = len(self.word_timings) / len(words)
+            return [self.word_timings[min(int(i * scale), len(self.word_timings) - 1)][1]
+                    for i in range(len(words))]
+        
+        duration = self.duration or 0.0
+        total_chars = sum(len(word) + 1 for word in words)
+        schedule = []
+        spoken_chars = 0
+        for word in words:
+            schedule.append(duration * spoken_chars / total_chars)
+            spoken_chars += len(word) + 1
+        return schedule
+
+
+# Sentence boundary: whitespace after terminal punctuation, or after up to two
+# closing quotes/brackets following it (which stay with their sentence)
+SENTENCE_BOUNDARY = re.compile(r'(?:(?<=[.!?])|(?<=[.!?]["\')\]])|(?<=[.!?]["\')\]]{2}))\s+')
+
+
+def split_speech_chunks(text: str, first_max_chars: int = 80, max_chars: int = 240) -> list:
+    """
+    Split text at sentence boundaries into chunks to synthesise separately.
+    
+    Sentences are merged up to max_chars so long answers need few requests,
+    while the first chunk is kept short so playback can start early. A single
+    sentence is never split.
+    
+    Args:
+        text (str): Text to speak
+        first_max_chars (int): Size limit of the first chunk
+        max_chars (int): Size limit of the other chunks
+        
+    Returns:
+        list: Chunks in speaking order
+    """
+    chunks = []
+    current = ""
+    for sentence in SENTENCE_BOUNDARY.split(text.strip()):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        limit = first_max_chars if not chunks else max_chars
+        if current and len(current) + 1 + len(sentence) > limit:
+            chunks.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        chunks.append(current)
+    return chunks
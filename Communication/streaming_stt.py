@@ -0,0 +1,477 @@
+#!/usr/bin/env python3
+"""
+Streaming Speech Recognition for Aarav AI Assistant
+
+recognize_google only answers once the whole utterance has been captured.
+A streaming engine decodes the audio while the user is still talking and
+emits partial hypotheses, so an obvious command can be acted on before the
+utterance ends:
+
+- StreamingRecognizer is the engine interface: start(), accept(pcm) for
+  each chunk (returns the partial hypothesis so far) and finish()
+- VoskRecognizer decodes locally with Vosk; ScriptedRecognizer is a stand-in
+  that reveals a known transcript at a speaking rate (replay and tests)
+- Engines rarely score partials, so a partial's confidence grows with how
+  long its text has stayed unchanged while more audio arrived
+- StreamingTranscriber runs the engine on its own thread, fed by the
+  capture thread, and routes every partial: once a confident partial
+  matches only an early intent (by default "stop"), on_early_intent fires,
+  so Aarav stops talking while the user is still speaking
+- The utterance itself is still endpointed and dispatched as a whole ("stop
+  ... the video" is not a stop command); a confident local final transcript
+  replaces the cloud request
+
+Choose the engine with AARAV_STREAMING_STT (default "vosk" when installed,
+"0" to disable), the Vosk model directory with AARAV_VOSK_MODEL and the
+intents acted on early with AARAV_EARLY_INTENTS (default "stop").
+"""
+
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import NamedTuple, Optional
+
+# Add project root to path for shared modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tracing import percentile
+
+try:
+    import vosk
+except ImportError:
+    vosk = None
+
+VOSK_MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'vosk_model')
+DEFAULT_EARLY_INTENTS = "stop"
+
+
+class EngineUnavailable(Exception):
+    """A streaming engine cannot be used here (missing package or model)."""
+
+
+class Hypothesis(NamedTuple):
+    """What the engine has recognized of the current utterance."""
+    text: str
+    confidence: float
+    is_final: bool
+    audio_seconds: float
+
+
+# ============================================================================
+# ENGINES
+# ============================================================================
+
+class StreamingRecognizer:
+    """Base for engines that decode audio as it arrives (16-bit mono PCM)."""
+
+    name = 'streaming'
+
+    def __init__(self, sample_rate: int = 16000, stable_seconds: float = 0.2):
+        """
+        Args:
+            sample_rate (int): Sample rate of the audio fed
+            stable_seconds (float): Audio a partial must survive unchanged to reach full confidence
+        """
+        self.sample_rate = sample_rate
+        self.stable_seconds = stable_seconds
+        self.samples = 0
+        self._text = ''
+        self._changed_at = 0
+
+    def start(self):
+        """Get ready for a new utterance."""
+        self.samples = 0
+        self._text = ''
+        self._changed_at = 0
+        self._reset()
+
+    def accept(self, pcm: bytes) -> Optional[Hypothesis]:
+        """
+        Decode the next chunk.
+
+        Args:
+            pcm (bytes): Audio following what was accepted so far
+
+        Returns:
+            Hypothesis: Partial hypothesis for the utterance so far, None while nothing is recognized
+        """
+        self.samples += len(pcm) // 2
+        text, confidence = self._decode(pcm)
+        text = ' '.join(text.split())
+        if text != self._text:
+            self._text = text
+            self._changed_at = self.samples
+        if not text:
+            return None
+
+        stable = (self.samples - self._changed_at) / self.sample_rate
+        stability = min(1.0, stable / self.stable_seconds) if self.stable_seconds > 0 else 1.0
+        return Hypothesis(text, stability * (1.0 if confidence is None else confidence), False,
+                          self.samples / self.sample_rate)
+
+    def finish(self) -> Hypothesis:
+        """Decode what is left and return the final hypothesis."""
+        text, confidence = self._finish()
+        return Hypothesis(' '.join(text.split()), confidence, True, self.samples / self.sample_rate)
+
+    def _reset(self):
+        raise NotImplementedError
+
+    def _decode(self, pcm: bytes) -> tuple:
+        """(text so far, confidence or None) after one chunk."""
+        raise NotImplementedError
+
+    def _finish(self) -> tuple:
+        """(final text, confidence) for the utterance."""
+        raise NotImplementedError
+
+
+class VoskRecognizer(StreamingRecognizer):
+    name = 'vosk'
+
+    def __init__(self, sample_rate: int = 16000, model_path: str = None, **kwargs):
+        """
+        Local Kaldi decoding with a Vosk model.
+
+        Args:
+            sample_rate (int): Sample rate of the audio fed
+            model_path (str): Model directory (default: AARAV_VOSK_MODEL or Communication/vosk_model)
+        """
+        if vosk is None:
+            raise EngineUnavailable("vosk is not installed (pip install vosk)")
+        model_path = model_path or os.getenv('AARAV_VOSK_MODEL', VOSK_MODEL_DIR)
+        if not os.path.isdir(model_path):
+            raise EngineUnavailable(f"no model in {model_path} (see https://alphacephei.com/vosk/models)")
+        vosk.SetLogLevel(-1)
+        self.model = vosk.Model(model_path)
+        super().__init__(sample_rate, **kwargs)
+
+    def _reset(self):
+        self._recognizer = vosk.KaldiRecognizer(self.model, self.sample_rate)
+        self._recognizer.SetWords(True)
+        self._committed = []
+        self._word_confidences = []
+
+    def _commit(self, result: str):
+        """Keep a segment Vosk has finalized (it finalizes at its own pauses)."""
+        result = json.loads(result)
+        if result.get('text'):
+            self._committed.append(result['text'])
+            self._word_confidences.extend(word.get('conf', 1.0) for word in result.get('result', []))
+
+    def _decode(self, pcm: bytes) -> tuple:
+        if not pcm:
+            return ' '.join(self._committed), None
+        if self._recognizer.AcceptWaveform(pcm):
+            self._commit(self._recognizer.Result())
+            partial = ''
+        else:
+            partial = json.loads(self._recognizer.PartialResult()).get('partial', '')
+        return ' '.join(self._committed + [partial]), None
+
+    def _finish(self) -> tuple:
+        self._commit(self._recognizer.FinalResult())
+        confidences = self._word_confidences
+        return ' '.join(self._committed), sum(confidences) / len(confidences) if confidences else 0.0
+
+
+class ScriptedRecognizer(StreamingRecognizer):
+    name = 'scripted'
+
+    def __init__(self, sample_rate: int = 16000, transcripts=(), words_per_second: float = 2.5,
+                 confidence: float = 0.95, **kwargs):
+        """
+        Stand-in engine that 'recognizes' known transcripts, one per utterance.
+
+        A word appears in the partial once its share of the audio has been fed.
+
+        Args:
+            sample_rate (int): Sample rate of the audio fed
+            transcripts (list): Transcripts of the coming utterances, in order
+            words_per_second (float): Speaking rate used to reveal words
+            confidence (float): Confidence of the final hypothesis
+        """
+        super().__init__(sample_rate, **kwargs)
+        self.transcripts = deque(transcripts)
+        self.words_per_second = words_per_second
+        self.confidence = confidence
+        self._words = []
+
+    def expect(self, transcript: str):
+        """Queue the transcript of a coming utterance."""
+        self.transcripts.append(transcript)
+
+    def _reset(self):
+        self._words = self.transcripts.popleft().split() if self.transcripts else []
+
+    def _decode(self, pcm: bytes) -> tuple:
+        spoken = int(self.samples / self.sample_rate * self.words_per_second)
+        return ' '.join(self._words[:spoken]), None
+
+    def _finish(self) -> tuple:
+        return ' '.join(self._words), self.confidence if self._words else 0.0
+
+
+STREAMING_ENGINES = {
+    'vosk': VoskRecognizer,
+    'scripted': ScriptedRecognizer
+}
+
+
+def register_engine(name: str, factory):
+    """Make an engine available to AARAV_STREAMING_STT under a name."""
+    STREAMING_ENGINES[name] = factory
+
+
+def create_recognizer(name: str = None, sample_rate: int = 16000) -> Optional[StreamingRecognizer]:
+    """
+    Build the configured streaming engine.
+
+    Args:
+        name (str): Engine name; defaults to AARAV_STREAMING_STT, else Vosk when installed
+        sample_rate (int): Sample rate of the audio fed
+
+    Returns:
+        StreamingRecognizer: The engine, None when disabled or unavailable
+    """
+    if name is None:
+        name = os.getenv('AARAV_STREAMING_STT', 'vosk' if vosk is not None else '0')
+    if not name or name == '0':
+        return None
+    factory = STREAMING_ENGINES.get(name)
+    if factory is None:
+        print(f"⚠️ Unknown streaming STT engine '{name}'. Choose from: {', '.join(STREAMING_ENGINES)}")
+        return None
+    try:
+        return factory(sample_rate)
+    except EngineUnavailable as e:
+        print(f"⚠️ Streaming STT engine '{name}' unavailable: {e}")
+        return None
+
+
+# ============================================================================
+# TRANSCRIBER
+# ============================================================================
+
+class StreamingTranscriber:
+    def __init__(self, recognizer: StreamingRecognizer, router=None, early_intents=None,
+                 min_confidence: float = 0.9, min_final_confidence: float = 0.8,
+                 final_timeout: float = 2.0, history: int = 64):
+        """
+        Run a streaming engine on its own thread and act on its partials.
+
+        Args:
+            recognizer (StreamingRecognizer): Engine to feed
+            router (IntentRouter): Router for partials (default: the shared Aarav router)
+            early_intents (list): Intents acted on from a partial (default: AARAV_EARLY_INTENTS)
+            min_confidence (float): Partial confidence needed to act early
+            min_final_confidence (float): Final confidence needed to skip the cloud
+            final_timeout (float): Seconds recognition waits for the local final
+            history (int): Utterances kept for the report
+        """
+        if router is None:
+            from brain.command_vocabulary import get_router
+            router = get_router()
+        if early_intents is None:
+            early_intents = os.getenv('AARAV_EARLY_INTENTS', DEFAULT_EARLY_INTENTS).split(',')
+
+        self.recognizer = recognizer
+        self.router = router
+        self.early_intents = frozenset(intent.strip() for intent in early_intents if intent.strip())
+        self.min_confidence = min_confidence
+        self.min_final_confidence = min_final_confidence
+        self.final_timeout = final_timeout
+
+        # Called from the transcriber thread: on_partial(hypothesis) for every
+        # partial, on_early_intent(intent, hypothesis, during_playback) once per utterance
+        self.on_partial = None
+        self.on_early_intent = None
+
+        self.counters = {'utterances': 0, 'partials': 0, 'local_finals': 0, 'cloud_fallbacks': 0,
+                         'final_timeouts': 0, 'errors': 0}
+        self.early = {}
+        self.first_partial = deque(maxlen=history)
+        self.final_waits = deque(maxlen=history)
+
+        self._state = None
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="stt-stream", daemon=True)
+        self._thread.start()
+
+    # ------------------------------------------------------------------------
+    # API (called from the capture thread)
+    # ------------------------------------------------------------------------
+
+    def begin(self, pcm: bytes = b'', during_playback: bool = False):
+        """
+        Start streaming a new utterance.
+
+        Args:
+            pcm (bytes): Audio of the utterance so far (pre-roll included)
+            during_playback (bool): The utterance started while Aarav was speaking
+        """
+        self._queue.put(('begin', (pcm, during_playback)))
+
+    def feed(self, pcm: bytes):
+        """Stream more audio of the current utterance."""
+        self._queue.put(('audio', pcm))
+
+    def end(self) -> Future:
+        """
+        Finish the current utterance.
+
+        Returns:
+            Future: Resolves to the final Hypothesis (None if the engine failed)
+        """
+        future = Future()
+        self._queue.put(('end', future))
+        return future
+
+    def drain(self):
+        """Wait until everything fed so far has been decoded (offline replay)."""
+        self._queue.join()
+
+    def final_text(self, future: Future) -> Optional[str]:
+        """
+        Wait for an utterance's local final transcript.
+
+        Args:
+            future (Future): Returned by end()
+
+        Returns:
+            str: The transcript if confident enough, None to ask the cloud instead
+        """
+        start = time.perf_counter()
+        try:
+            hypothesis = future.result(timeout=self.final_timeout)
+        except FutureTimeout:
+            hypothesis = None
+            self._count('final_timeouts')
+        with self._lock:
+            self.final_waits.append(time.perf_counter() - start)
+
+        if hypothesis is not None and hypothesis.text and hypothesis.confidence >= self.min_final_confidence:
+            self._count('local_finals')
+            return hypothesis.text
+        self._count('cloud_fallbacks')
+        return None
+
+    def close(self):
+        """Stop the transcriber thread."""
+        self._queue.put(('close', None))
+        self._thread.join(timeout=1.0)
+
+    # ------------------------------------------------------------------------
+    # Transcriber thread
+    # ------------------------------------------------------------------------
+
+    def _count(self, name: str):
+        with self._lock:
+            self.counters[name] += 1
+
+    def early_intent(self, hypothesis: Hypothesis) -> Optional[str]:
+        """
+        The intent to act on for a partial, if it is confident and unambiguous.
+
+        "stop" is a stop command but "stop the video" is a web command, so a
+        partial only counts when every intent it matches may be acted on early.
+        """
+        if hypothesis.confidence < self.min_confidence:
+            return None
+        # Automation intents only refine a web command
+        intents = {intent for intent in self.router.intents(hypothesis.text)
+                   if not intent.startswith('automation.')}
+        if not intents or not intents <= self.early_intents:
+            return None
+        return min(intents)
+
+    def _accept(self, pcm: bytes):
+        hypothesis = self.recognizer.accept(pcm)
+        if hypothesis is None:
+            return
+        state = self._state
+        self._count('partials')
+        if state['first_partial'] is None:
+            state['first_partial'] = time.perf_counter() - state['began_at']
+            with self._lock:
+                self.first_partial.append(state['first_partial'])
+        if self.on_partial is not None:
+            self.on_partial(hypothesis)
+
+        # Acted on once per utterance
+        if state['early'] is not None:
+            return
+        intent = self.early_intent(hypothesis)
+        if intent is None:
+            return
+        state['early'] = intent
+        with self._lock:
+            self.early[intent] = self.early.get(intent, 0) + 1
+        if self.on_early_intent is not None:
+            self.on_early_intent(intent, hypothesis, state['during_playback'])
+
+    def _run(self):
+        while True:
+            kind, payload = self._queue.get()
+            try:
+                if kind == 'close':
+                    return
+                if kind == 'begin':
+                    pcm, during_playback = payload
+                    self._state = {'began_at': time.perf_counter(), 'first_partial': None,
+                                   'during_playback': during_playback, 'early': None}
+                    self._count('utterances')
+                    self.recognizer.start()
+                    if pcm:
+                        self._accept(pcm)
+                elif kind == 'audio':
+                    self._accept(payload)
+                elif kind == 'end':
+                    try:
+                        payload.set_result(self.recognizer.finish())
+                    except Exception:
+                        payload.set_result(None)
+                        raise
+            except Exception as e:
+                self._count('errors')
+                print(f"⚠️ Streaming STT error: {e}")
+            finally:
+                self._queue.task_done()
+
+    # ------------------------------------------------------------------------
+    # Reports
+    # ------------------------------------------------------------------------
+
+    def stats(self) -> dict:
+        """
+        Partial and final outcomes.
+
+        Returns:
+            dict: Counters, early decisions per intent, p50 first-partial and final wait in ms
+        """
+        with self._lock:
+            stats = dict(self.counters)
+            stats['early'] = dict(self.early)
+            first, waits = sorted(self.first_partial), sorted(self.final_waits)
+        ms = lambda values, percent: 1000 * percentile(values, percent) if values else 0.0
+        stats['first_partial_p50_ms'] = ms(first, 50)
+        stats['final_wait_p50_ms'] = ms(waits, 50)
+        stats['final_wait_p95_ms'] = ms(waits, 95)
+        return stats
+
+    def print_report(self):
+        """Print how often partials were acted on and the cloud was skipped."""
+        stats = self.stats()
+        early = ", ".join(f"{intent} {count}" for intent, count in sorted(stats['early'].items())) or "none"
+        print(f"\n📝 Streaming recognition ({self.recognizer.name})")
+        print("=" * 60)
+        print(f"utterances {stats['utterances']} | partials {stats['partials']} | "
+              f"first partial p50 {stats['first_partial_p50_ms']:.0f} ms | early: {early}")
+        print(f"finals: local {stats['local_finals']}, cloud {stats['cloud_fallbacks']} "
+              f"(timeouts {stats['final_timeouts']}, errors {stats['errors']}) | "
+              f"final wait p50 {stats['final_wait_p50_ms']:.0f} ms, p95 {stats['final_wait_p95_ms']:.0f} ms")
@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+"""
+TTS Backends for Aarav AI Assistant
+
+A registry of text-to-speech engines and a router that picks one per call:
+
+- murf:       Murf API (default voice, returns word timings)
+- elevenlabs: ElevenLabs API
+- local:      Offline engine on the CPU (piper when PIPER_MODEL is set,
+              otherwise espeak-ng / espeak)
+
+Each call has a latency budget. Remote backends are tried in preference
+order; one is skipped while its circuit breaker is open (it keeps failing)
+or while its recent p95 latency is above the budget. If no remote backend
+answers within the budget, the local engine speaks instead. A remote answer
+that arrives late is still handed to the caller (e.g. for the TTS cache).
+
+Choose backends with AARAV_TTS_BACKENDS (default "murf,local") and the
+budget with AARAV_TTS_BUDGET (seconds, default 3).
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tracing import percentile, span
+from http_client import get_http_client
+from resilience import CircuitBreaker
+
+DEFAULT_BACKENDS = "murf,local"
+DEFAULT_BUDGET = 3.0
+
+
+class BackendUnavailable(Exception):
+    """A backend cannot be used here (missing API key, package or binary)."""
+
+
+# ============================================================================
+# BACKENDS
+# ============================================================================
+
+def _murf_word_timings(audio_res):
+    """Extract (word, start_seconds, end_seconds) tuples from a Murf response, if returned."""
+    timings = []
+    for item in getattr(audio_res, 'word_durations', None) or []:
+        word = getattr(item, 'word', None)
+        start_ms = getattr(item, 'start_ms', None)
+        end_ms = getattr(item, 'end_ms', None)
+        if word is None or start_ms is None:
+            continue
+        timings.append((word, start_ms / 1000, (end_ms if end_ms is not None else start_ms) / 1000))
+    return timings
+
+
+class MurfBackend:
+    name = 'murf'
+    remote = True
+
+    def __init__(self):
+        """Murf text-to-speech; speaks with the speaker's voice_id and style."""
+        self.api_key = os.getenv('MURF_API_KEY')
+        if not self.api_key:
+            raise BackendUnavailable("MURF_API_KEY not found in environment variables. Please check your .env file.")
+        try:
+            from murf import Murf
+        except ImportError:
+            raise BackendUnavailable("the murf package is not installed")
+
+        # Initialize Murf client with explicit API key
+        self.client = Murf(api_key=self.api_key)
+        self.http = get_http_client()
+
+    def cache_voice(self, voice_id: str, style: str) -> tuple:
+        """(voice, style) under which this backend's clips are cached."""
+        return voice_id, style
+
+    def synthesize(self, text: str, voice_id: str, style: str) -> tuple:
+        """
+        Generate speech with Murf.
+
+        Returns:
+            tuple: (audio_data, word_timings)
+        """
+        # Generate speech using Murf API
+        with span('tts.generate'):
+            audio_res = self.client.text_to_speech.generate(
+                text=text,
+                voice_id=voice_id,
+                style=style
+            )
+
+        # Get the audio file from response
+        audio_file_path = audio_res.audio_file
+
+        # Check if it's a URL or file path
+        with span('tts.download'):
+            if audio_file_path.startswith('http'):
+                # Download the audio file over the shared keep-alive pool
+                audio_response = self.http.get(audio_file_path, purpose='tts_download')
+                audio_response.raise_for_status()
+                audio_data = audio_response.content
+            else:
+                # Read from local file path
+                with open(audio_file_path, 'rb') as audio_file:
+                    audio_data = audio_file.read()
+
+        return audio_data, _murf_word_timings(audio_res)
+
+
+class ElevenLabsBackend:
+    name = 'elevenlabs'
+    remote = True
+
+    def __init__(self):
+        """ElevenLabs text-to-speech; uses its own voice (ELEVENLABS_VOICE_ID)."""
+        self.api_key = os.getenv('ELEVENLABS_API_KEY')
+        if not self.api_key:
+            raise BackendUnavailable("ELEVENLABS_API_KEY not found in environment variables. Please check your .env file.")
+
+        self.base_url = "https://api.elevenlabs.io/v1/text-to-speech"
+        self.headers = {
+            'Content-Type': 'application/json',
+            'xi-api-key': self.api_key
+        }
+        self.http = get_http_client()
+
+        # Default voice ID (a clear, friendly voice)
+        # Available voices:
+        # jhon-2ro171emrYO7IuOOs8rf, G6TsGA4LBTYQWAMgsYzl|
+        # sam-scOwDtmlUjD3prqpp97I
+        # james-EkK5I93UQWFDigLMpZcX
+        # david-v9LgF91V36LGgbLX3iHW
+        # mask-UgBBYS2sOqTuMpoF3BR0
+        # girl- jqcCZkN6Knx8BJ5TBdYR (aman api) , cgSgspJ2msm6clMCkdW9 , z9fAnlkpzviPz146aGWa (aman api), tnSpp4vdxKPjI9w0GnoV (aman api),  ZF6FPAbjXT4488VcRRnw , 56AoDkrOh6qfVPDXZ7Pt , g6xIsTj2HwM6VR4iXFCw , 0CyqXXfWDNMyXb9GqyLH (aman api)
+        self.voice_id = os.getenv('ELEVENLABS_VOICE_ID', "jqcCZkN6Knx8BJ5TBdYR")
+
+    def cache_voice(self, voice_id: str, style: str) -> tuple:
+        return f"elevenlabs:{self.voice_id}", ""
+
+    def synthesize(self, text: str, voice_id: str, style: str) -> tuple:
+        """Generate speech with ElevenLabs; returns (audio_data, [])."""
+        payload = {
+            "text": text,
+            "model_id": "eleven_monolingual_v1",
+            "voice_settings": {
+                "stability": 0.5,
+                "similarity_boost": 0.75,
+                "style": 0.0,
+                "use_speaker_boost": True
+            }
+        }
+        with span('tts.generate'):
+            response = self.http.post(f"{self.base_url}/{self.voice_id}", purpose='tts',
+                                      headers=self.headers, json=payload)
+            response.raise_for_status()
+        return response.content, []
+
+
+class LocalBackend:
+    name = 'local'
+    remote = False
+
+    def __init__(self):
+        """Offline engine: piper if PIPER_MODEL points at a voice model, else espeak-ng / espeak."""
+        self.piper = shutil.which('piper')
+        self.piper_model = os.getenv('PIPER_MODEL')
+        self.espeak = shutil.which('espeak-ng') or shutil.which('espeak')
+        self.espeak_voice = os.getenv('ESPEAK_VOICE', 'en-gb')
+
+        if self.piper and self.piper_model:
+            self.engine = 'piper'
+        elif self.espeak:
+            self.engine = os.path.basename(self.espeak)
+        else:
+            raise BackendUnavailable("no local TTS engine found (install piper or espeak-ng)")
+
+    def cache_voice(self, voice_id: str, style: str) -> tuple:
+        voice = os.path.basename(self.piper_model) if self.engine == 'piper' else self.espeak_voice
+        return f"local:{self.engine}:{voice}", ""
+
+    def synthesize(self, text: str, voice_id: str, style: str) -> tuple:
+        """Generate a WAV clip on the CPU; returns (audio_data, [])."""
+        with span('tts.generate', engine=self.engine):
+            if self.engine == 'piper':
+                with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as output:
+                    path = output.name
+                try:
+                    subprocess.run([self.piper, '--model', self.piper_model, '--output_file', path],
+                                   input=text.encode('utf-8'), check=True, capture_output=True, timeout=30)
+                    with open(path, 'rb') as audio_file:
+                        return audio_file.read(), []
+                finally:
+                    os.unlink(path)
+
+            result = subprocess.run([self.espeak, '-v', self.espeak_voice, '-s', '165', '--stdout', text],
+                                    check=True, capture_output=True, timeout=30)
+            return result.stdout, []
+
+
+# Backend name -> class; add engines here
+TTS_BACKENDS = {
+    'murf': MurfBackend,
+    'elevenlabs': ElevenLabsBackend,
+    'local': LocalBackend
+}
+
+
+def register_backend(name: str, factory):
+    """Make a backend available to AARAV_TTS_BACKENDS under a name."""
+    TTS_BACKENDS[name] = factory
+
+
+def create_backends(names=None) -> list:
+    """
+    Build the backends that are usable here, in preference order.
+
+    Args:
+        names (list): Backend names; defaults to AARAV_TTS_BACKENDS
+
+    Returns:
+        list: Backend instances (unavailable ones are skipped with a warning)
+    """
+    if names is None:
+        names = os.getenv('AARAV_TTS_BACKENDS', DEFAULT_BACKENDS).split(',')
+    backends = []
+    for name in (name.strip() for name in names):
+        factory = TTS_BACKENDS.get(name)
+        if factory is None:
+            print(f"⚠️ Unknown TTS backend '{name}'. Choose from: {', '.join(TTS_BACKENDS)}")
+            continue
+        try:
+            backends.append(factory())
+        except BackendUnavailable as e:
+            print(f"⚠️ TTS backend '{name}' unavailable: {e}")
+    return backends
+
+
+# ============================================================================
+# ROUTER
+# ============================================================================
+
+class BackendStats:
+    """Latency and outcomes of one backend."""
+
+    def __init__(self, window: int = 64):
+        self.calls = 0
+        self.successes = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.skipped = 0
+        self.latencies = deque(maxlen=window)
+        self.breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30.0)
+
+
+class TTSRouter:
+    def __init__(self, backends: list, budget: float = None, min_samples: int = 10,
+                 probe_every: int = 10, max_workers: int = 4):
+        """
+        Initialize the router.
+
+        Args:
+            backends (list): Backends in preference order (from create_backends())
+            budget (float): Seconds a call may wait for remote backends;
+                defaults to AARAV_TTS_BUDGET
+            min_samples (int): Latencies needed before p95 is used to skip a backend
+            probe_every (int): A skipped slow backend still gets every Nth call,
+                so its statistics can recover
+            max_workers (int): Remote requests in flight at once
+        """
+        if not backends:
+            raise ValueError("No TTS backend available")
+        self.backends = backends
+        self.remote = [backend for backend in backends if backend.remote]
+        self.local = next((backend for backend in backends if not backend.remote), None)
+        self.budget = budget if budget is not None else float(os.getenv('AARAV_TTS_BUDGET', DEFAULT_BUDGET))
+        self.min_samples = min_samples
+        self.probe_every = probe_every
+
+        self.stats = {backend.name: BackendStats() for backend in backends}
+        self.fallbacks = 0
+        self.late_results = 0
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tts-remote")
+        self._lock = threading.Lock()
+
+    @property
+    def primary(self):
+        """Preferred backend (its voice is what the cache is warmed with)."""
+        return self.backends[0]
+
+    def p95(self, name: str) -> Optional[float]:
+        """Recent p95 latency of a backend in seconds, once enough calls were seen."""
+        with self._lock:
+            values = sorted(self.stats[name].latencies)
+        return percentile(values, 95) if len(values) >= self.min_samples else None
+
+    def _usable(self, backend, budget: float) -> bool:
+        """Check a remote backend against its breaker and latency history."""
+        stats = self.stats[backend.name]
+        if not stats.breaker.allow():
+            return False
+        p95 = self.p95(backend.name)
+        if p95 is not None and p95 > budget:
+            with self._lock:
+                stats.skipped += 1
+                return stats.skipped % self.probe_every == 0
+        return True
+
+    def _call(self, backend, text: str, voice_id: str, style: str) -> tuple:
+        """Synthesise with one backend and record the outcome."""
+        stats = self.stats[backend.name]
+        with self._lock:
+            stats.calls += 1
+        start = time.perf_counter()
+        try:
+            with span('tts.backend', backend=backend.name):
+                audio_data, word_timings = backend.synthesize(text, voice_id, style)
+        except Exception:
+            with self._lock:
+                stats.failures += 1
+            stats.breaker.record_failure()
+            raise
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            stats.successes += 1
+            stats.latencies.append(elapsed)
+        stats.breaker.record_success()
+        return audio_data, word_timings
+
+    def synthesize(self, text: str, voice_id: str, style: str, budget: float = None,
+                   allow_fallback: bool = True, on_late=None) -> tuple:
+        """
+        Synthesise text with the best backend that answers within the budget.
+
+        Args:
+            text (str): Text to speak
+            voice_id (str): Speaker voice (used by backends that take one)
+            style (str): Speaker voice style
+            budget (float): Seconds to wait for remote backends (default: self.budget)
+            allow_fallback (bool): False waits for remote backends without a budget
+                and never uses the local engine (e.g. for cache warm-up)
+            on_late (callable): on_late(backend, audio_data, word_timings) for a
+                remote answer that arrives after the budget ran out
+
+        Returns:
+            tuple: (backend, audio_data, word_timings)
+
+        Raises:
+            Exception: The last error if no backend could synthesise the text
+        """
+        budget = self.budget if budget is None else budget
+        deadline = time.monotonic() + budget
+        error = None
+
+        # Without a local engine to fall back on, remote backends get all the time they need
+        fallback = allow_fallback and self.local is not None
+        for backend in self.remote:
+            if fallback and not self._usable(backend, budget):
+                continue
+            remaining = deadline - time.monotonic()
+            if fallback and remaining <= 0:
+                break
+
+            future = self._executor.submit(self._call, backend, text, voice_id, style)
+            try:
+                audio_data, word_timings = future.result(timeout=remaining if fallback else None)
+                return backend, audio_data, word_timings
+            except FutureTimeout:
+                with self._lock:
+                    self.stats[backend.name].timeouts += 1
+                if on_late is not None:
+                    future.add_done_callback(lambda done, backend=backend: self._deliver_late(backend, done, on_late))
+            except Exception as e:
+                error = e
+
+        if self.local is not None and (fallback or not self.remote):
+            if self.remote:
+                with self._lock:
+                    self.fallbacks += 1
+            audio_data, word_timings = self._call(self.local, text, voice_id, style)
+            return self.local, audio_data, word_timings
+
+        raise error or TimeoutError(f"No TTS backend answered within {budget:.1f}s")
+
+    def _deliver_late(self, backend, future, on_late):
+        """Pass on a remote answer that missed the budget."""
+        if future.exception() is not None:
+            return
+        with self._lock:
+            self.late_results += 1
+        audio_data, word_timings = future.result()
+        on_late(backend, audio_data, word_timings)
+
+    def print_report(self):
+        """Print per-backend latency and outcomes."""
+        print(f"\n🗣️ TTS backends (budget {self.budget:.1f}s)")
+        print("=" * 72)
+        print(f"{'backend':<11} {'calls':>6} {'ok':>5} {'fail':>5} {'late':>5} {'skip':>5} "
+              f"{'p50 ms':>7} {'p95 ms':>7}  breaker")
+        for backend in self.backends:
+            stats = self.stats[backend.name]
+            with self._lock:
+                values = sorted(stats.latencies)
+            p50 = f"{percentile(values, 50) * 1000:.0f}" if values else "-"
+            p95 = f"{percentile(values, 95) * 1000:.0f}" if values else "-"
+            print(f"{backend.name:<11} {stats.calls:>6} {stats.successes:>5} {stats.failures:>5} "
+                  f"{stats.timeouts:>5} {stats.skipped:>5} {p50:>7} {p95:>7}  {stats.breaker.state}")
+        print(f"local fallbacks {self.fallbacks} | late remote clips cached {self.late_results}")
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+TTS Audio Cache for Aarav AI Assistant
+
+Remembers synthesised clips so repeated phrases (wake and intro messages,
+goodbyes, error lines) play without a round trip to the TTS service:
+
+- Content-addressed: keyed on a hash of (text, voice_id, style), so changing
+  the voice or style never replays the old audio
+- Two tiers: a small in-memory hot tier (LRU by bytes) in front of an
+  on-disk SQLite store bounded by total bytes (LRU by last use)
+- Counters for hit rate, bytes not downloaded (the backend's payload) and
+  synthesis time saved
+
+Set AARAV_TTS_CACHE=0 to turn it off.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache")
+CACHE_FILE = os.path.join(CACHE_DIR, "tts.sqlite3")
+
+
+class CachedAudio(NamedTuple):
+    """A cached clip: encoded audio, word timings and what it cost to synthesise."""
+    audio_data: bytes
+    word_timings: list
+    synth_seconds: float
+
+
+class TTSCache:
+    def __init__(self, path: str = CACHE_FILE, max_bytes: int = 64 * 1024 * 1024,
+                 memory_bytes: int = 8 * 1024 * 1024):
+        """
+        Open (or create) the audio cache.
+
+        Args:
+            path (str): SQLite file; ':memory:' for a throwaway cache
+            max_bytes (int): Bound on stored audio; least recently used clips are evicted
+            memory_bytes (int): Bound on the in-memory hot tier
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.memory_bytes = memory_bytes
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.bytes_saved = 0
+        self.seconds_saved = 0.0
+
+        self._hot = OrderedDict()
+        self._hot_size = 0
+
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS clips ("
+            " key TEXT PRIMARY KEY,"
+            " text TEXT NOT NULL,"
+            " voice_id TEXT NOT NULL,"
+            " style TEXT NOT NULL,"
+            " audio BLOB NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " word_timings TEXT NOT NULL,"
+            " synth_seconds REAL NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS clips_last_used ON clips(last_used)")
+        self._db.commit()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(text: str, voice_id: str, style: str) -> str:
+        """Content address of a phrase spoken with a voice and style."""
+        return hashlib.sha256(json.dumps([text.strip(), voice_id, style]).encode('utf-8')).hexdigest()
+
+    def _remember(self, key: str, entry: CachedAudio):
+        """Put an entry in the hot tier, evicting least recently used ones (lock held)."""
+        if key in self._hot:
+            self._hot_size -= len(self._hot.pop(key).audio_data)
+        if len(entry.audio_data) > self.memory_bytes:
+            return
+        self._hot[key] = entry
+        self._hot_size += len(entry.audio_data)
+        while self._hot_size > self.memory_bytes:
+            _, old = self._hot.popitem(last=False)
+            self._hot_size -= len(old.audio_data)
+
+    def get(self, text: str, voice_id: str, style: str) -> Optional[CachedAudio]:
+        """
+        Look up a clip.
+
+        Args:
+            text (str): Text spoken
+            voice_id (str): TTS voice
+            style (str): TTS voice style
+
+        Returns:
+            CachedAudio: Cached clip, or None on a miss
+        """
+        key = self.make_key(text, voice_id, style)
+        with self._lock:
+            entry = self._hot.get(key)
+            if entry is not None:
+                self._hot.move_to_end(key)
+                self.memory_hits += 1
+            else:
+                row = self._db.execute(
+                    "SELECT audio, word_timings, synth_seconds FROM clips WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+                entry = CachedAudio(bytes(row[0]), [tuple(item) for item in json.loads(row[1])], row[2])
+                self._remember(key, entry)
+                self.disk_hits += 1
+
+            self._db.execute("UPDATE clips SET last_used = ? WHERE key = ?", (time.time(), key))
+            self._db.commit()
+            self.bytes_saved += len(entry.audio_data)
+            self.seconds_saved += entry.synth_seconds
+            return entry
+
+    def put(self, text: str, voice_id: str, style: str, audio_data: bytes,
+            word_timings=None, synth_seconds: float = 0.0):
+        """
+        Store a clip.
+
+        Args:
+            text (str): Text spoken
+            voice_id (str): TTS voice
+            style (str): TTS voice style
+            audio_data (bytes): Encoded audio
+            word_timings (list): (word, start_seconds, end_seconds) tuples, if any
+            synth_seconds (float): Time the synthesis took, reported as saved on hits
+        """
+        if not audio_data or len(audio_data) > self.max_bytes:
+            return
+
+        key = self.make_key(text, voice_id, style)
+        entry = CachedAudio(bytes(audio_data), list(word_timings or []), synth_seconds)
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO clips (key, text, voice_id, style, audio, size, word_timings,"
+                " synth_seconds, created_at, last_used) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, text.strip(), voice_id, style, sqlite3.Binary(entry.audio_data), len(entry.audio_data),
+                 json.dumps(entry.word_timings), synth_seconds, now, now)
+            )
+            self._remember(key, entry)
+            self.stores += 1
+
+            # Size bound: drop least recently used clips until the store fits
+            total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM clips").fetchone()[0]
+            if total > self.max_bytes:
+                for old_key, size in self._db.execute(
+                        "SELECT key, size FROM clips ORDER BY last_used ASC").fetchall():
+                    if total <= self.max_bytes:
+                        break
+                    self._db.execute("DELETE FROM clips WHERE key = ?", (old_key,))
+                    if old_key in self._hot:
+                        self._hot_size -= len(self._hot.pop(old_key).audio_data)
+                    total -= size
+                    self.evictions += 1
+            self._db.commit()
+
+    def contains(self, text: str, voice_id: str, style: str) -> bool:
+        """Check for a clip without counting a hit or a miss."""
+        key = self.make_key(text, voice_id, style)
+        with self._lock:
+            if key in self._hot:
+                return True
+            return self._db.execute("SELECT 1 FROM clips WHERE key = ?", (key,)).fetchone() is not None
+
+    def clear(self):
+        """Remove every cached clip."""
+        with self._lock:
+            self._db.execute("DELETE FROM clips")
+            self._db.commit()
+            self._hot.clear()
+            self._hot_size = 0
+
+    def stats(self) -> dict:
+        """
+        Counters for tuning the cache.
+
+        Returns:
+            dict: Hits per tier, misses, hit rate, bytes and seconds saved, size
+        """
+        with self._lock:
+            entries, size = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM clips").fetchone()
+            hot_entries, hot_size = len(self._hot), self._hot_size
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            'memory_hits': self.memory_hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_rate': hits / lookups if lookups else 0.0,
+            'stores': self.stores,
+            'evictions': self.evictions,
+            'bytes_saved': self.bytes_saved,
+            'seconds_saved': self.seconds_saved,
+            'entries': entries,
+            'bytes': size,
+            'hot_entries': hot_entries,
+            'hot_bytes': hot_size
+        }
+
+    def print_report(self):
+        """Print cache counters."""
+        stats = self.stats()
+        print("\n🔊 TTS cache")
+        print("=" * 60)
+        print(f"hits {stats['memory_hits']} memory + {stats['disk_hits']} disk | misses {stats['misses']} | "
+              f"hit rate {stats['hit_rate']:.0%}")
+        print(f"saved {stats['bytes_saved'] / 1024:.0f} KB and {stats['seconds_saved']:.1f}s of synthesis | "
+              f"{stats['entries']} clips, {stats['bytes'] / 1024 / 1024:.1f}/{self.max_bytes / 1024 / 1024:.0f} MB "
+              f"({stats['hot_entries']} hot) | evicted {stats['evictions']}")
+
+    def close(self):
+        """Close the database."""
+        with self._lock:
+            self._db.close()
+
+
+# Global cache instance
+_tts_cache = None
+_tts_cache_lock = threading.Lock()
+
+def get_tts_cache() -> Optional[TTSCache]:
+    """Get or create the global TTS cache (None when AARAV_TTS_CACHE=0)."""
+    global _tts_cache
+    if os.getenv('AARAV_TTS_CACHE', '1') == '0':
+        return None
+    if _tts_cache is None:
+        with _tts_cache_lock:
+            if _tts_cache is None:
+                try:
+                    _tts_cache = TTSCache()
+                except sqlite3.Error as e:
+                    print(f"⚠️ TTS cache disabled: {e}")
+                    return None
+    return _tts_cache
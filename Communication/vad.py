@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Voice Activity Endpointing for Aarav AI Assistant
+
+Decides where an utterance starts and ends from 20 ms microphone frames,
+instead of speech_recognition's fixed energy threshold and pause timer:
+
+- Each frame is scored on energy above an adaptive noise floor plus two
+  spectral features (spectral flatness and the share of energy in the
+  80-4000 Hz voice band), computed for a batch of frames at once with NumPy,
+  so fans and hiss do not keep the utterance open
+- Speech starts after a few consecutive speech frames; a short pre-roll keeps
+  the first syllable
+- Frames are numbered from the first sample fed, so a capture thread can
+  cut the utterance out of its own buffer
+- The hangover (silence that ends the utterance) adapts: short after a
+  one-word command, longer once the speaker has talked for a while or
+  pauses between words, bounded by a minimum and maximum
+- Utterances are cut at a maximum length
+- The endpointing delay (last speech frame to end decision) is recorded for
+  tuning the mic-to-transcript latency
+
+Run on WAV files to see where it would end each one:
+    python Communication/vad.py recording1.wav recording2.wav
+"""
+
+import os
+import sys
+import time
+from collections import deque
+from typing import Optional
+
+import numpy as np
+
+# Add project root to path for shared modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tracing import percentile, get_tracer
+
+FRAME_SECONDS = 0.020
+SPEECH_BAND = (80.0, 4000.0)
+
+
+class VADEndpointer:
+    def __init__(self, sample_rate: int = 16000, frame_seconds: float = FRAME_SECONDS,
+                 margin_db: float = 9.0, min_speech_dbfs: float = -55.0, max_flatness: float = 0.45,
+                 min_band_ratio: float = 0.6, start_seconds: float = 0.06, pre_roll: float = 0.3,
+                 min_hangover: float = 0.25, max_hangover: float = 0.9, hangover_growth: float = 0.1,
+                 max_utterance: float = 15.0, history: int = 64):
+        """
+        Initialize the endpointer for 16-bit mono audio.
+
+        Args:
+            sample_rate (int): Microphone sample rate
+            frame_seconds (float): Analysis frame length
+            margin_db (float): How far above the noise floor speech must be
+            min_speech_dbfs (float): Absolute level below which nothing is speech
+            max_flatness (float): Frames flatter than this (noise-like spectrum) are not speech
+            min_band_ratio (float): Share of energy that must lie in the speech band
+            start_seconds (float): Consecutive speech needed to start an utterance
+            pre_roll (float): Audio kept from before the start
+            min_hangover (float): Shortest silence that ends an utterance
+            max_hangover (float): Longest silence waited for
+            hangover_growth (float): Hangover added per second of speech so far
+            max_utterance (float): Utterances are cut after this many seconds
+            history (int): Utterances kept for the report
+        """
+        self.sample_rate = sample_rate
+        self.frame_samples = max(1, int(sample_rate * frame_seconds))
+        self.frame_seconds = self.frame_samples / sample_rate
+        self.margin_db = margin_db
+        self.min_speech_dbfs = min_speech_dbfs
+        self.max_flatness = max_flatness
+        self.min_band_ratio = min_band_ratio
+        self.start_frames = max(1, round(start_seconds / self.frame_seconds))
+        self.min_hangover = min_hangover
+        self.max_hangover = max_hangover
+        self.hangover_growth = hangover_growth
+        self.max_utterance = max_utterance
+
+        frequencies = np.fft.rfftfreq(self.frame_samples, 1.0 / sample_rate)
+        self._band = (frequencies >= SPEECH_BAND[0]) & (frequencies <= SPEECH_BAND[1])
+        self._window = np.hanning(self.frame_samples).astype(np.float32)
+
+        self.noise_dbfs = None
+        self.pre_roll_frames = max(1, round(pre_roll / self.frame_seconds))
+        self._pauses = deque(maxlen=32)
+        self._remainder = b''
+        self.frames_seen = 0
+
+        self.delays = deque(maxlen=history)
+        self.hangovers = deque(maxlen=history)
+        self.lengths = deque(maxlen=history)
+        self.counters = {'utterances': 0, 'silence': 0, 'max_length': 0}
+        self.begin()
+
+    # ------------------------------------------------------------------------
+    # Features
+    # ------------------------------------------------------------------------
+
+    def classify(self, frames: np.ndarray) -> tuple:
+        """
+        Score a batch of frames.
+
+        Args:
+            frames (np.ndarray): int16 samples, shape (frames, frame_samples)
+
+        Returns:
+            tuple: (is_speech bool array, level_dbfs array)
+        """
+        x = frames.astype(np.float32) / 32768.0
+        level = 10.0 * np.log10(np.mean(x * x, axis=1) + 1e-10)
+
+        power = np.abs(np.fft.rfft(x * self._window, axis=1)) ** 2 + 1e-12
+        flatness = np.exp(np.mean(np.log(power), axis=1)) / np.mean(power, axis=1)
+        band_ratio = power[:, self._band].sum(axis=1) / power.sum(axis=1)
+
+        floor = self.noise_dbfs if self.noise_dbfs is not None else self.min_speech_dbfs - self.margin_db
+        loud = level > max(floor + self.margin_db, self.min_speech_dbfs)
+        voiced = (flatness < self.max_flatness) & (band_ratio > self.min_band_ratio)
+        return loud & voiced, level
+
+    def _track_noise(self, level: float):
+        """Follow the noise floor: quickly down, slowly up (so speech barely moves it)."""
+        if self.noise_dbfs is None:
+            self.noise_dbfs = level
+        else:
+            rate = 0.3 if level < self.noise_dbfs else 0.02
+            self.noise_dbfs += rate * (level - self.noise_dbfs)
+
+    def calibrate(self, pcm: bytes):
+        """Set the noise floor from audio known to contain no speech."""
+        usable = len(pcm) // (2 * self.frame_samples) * self.frame_samples
+        frames = np.frombuffer(pcm, dtype=np.int16)[:usable].reshape(-1, self.frame_samples)
+        if len(frames):
+            _, level = self.classify(frames)
+            self.noise_dbfs = float(np.median(level))
+
+    # ------------------------------------------------------------------------
+    # Endpointing
+    # ------------------------------------------------------------------------
+
+    def begin(self):
+        """Get ready for the next utterance (the noise floor and frame count are kept)."""
+        self.in_speech = False
+        self.ended = None
+        self.start_frame = None
+        self.end_frame = None
+        self._begin_frame = self.frames_seen
+        self._speech_run = 0
+        self._silence_run = 0
+        self._speech_seconds = 0.0
+        self._last_speech_at = None
+
+    def hangover(self) -> float:
+        """Silence that ends the current utterance, in seconds."""
+        hangover = self.min_hangover + self.hangover_growth * self._speech_seconds
+        if len(self._pauses) >= 3:
+            # Leave room for this speaker's usual pauses between words
+            hangover = max(hangover, 1.25 * percentile(sorted(self._pauses), 90))
+        return min(max(hangover, self.min_hangover), self.max_hangover)
+
+    def _frames(self, pcm: bytes) -> np.ndarray:
+        """Split buffered audio into whole frames, keeping the rest for the next call."""
+        data = self._remainder + pcm
+        usable = len(data) // (2 * self.frame_samples) * 2 * self.frame_samples
+        self._remainder = data[usable:]
+        return np.frombuffer(data[:usable], dtype=np.int16).reshape(-1, self.frame_samples)
+
+    def feed(self, pcm: bytes) -> Optional[str]:
+        """
+        Process microphone audio.
+
+        Args:
+            pcm (bytes): 16-bit mono samples, any length
+
+        Returns:
+            str: 'start' when speech starts, 'silence' or 'max_length' when the
+                utterance ends, else None (audio after the end waits for begin())
+        """
+        if self.ended:
+            self._remainder += pcm
+            return None
+        frames = self._frames(pcm)
+        if not len(frames):
+            return None
+        speech, level = self.classify(frames)
+
+        event = None
+        for index, (is_speech, frame_level) in enumerate(zip(speech, level)):
+            frame_number = self.frames_seen
+            self.frames_seen += 1
+            if not self.in_speech:
+                if is_speech:
+                    self._speech_run += 1
+                else:
+                    self._speech_run = 0
+                    self._track_noise(float(frame_level))
+                if self._speech_run >= self.start_frames:
+                    self.in_speech = True
+                    first_speech = frame_number - self._speech_run + 1
+                    self.start_frame = max(self._begin_frame, first_speech - self.pre_roll_frames)
+                    self._speech_seconds = self._speech_run * self.frame_seconds
+                    self._last_speech_at = time.perf_counter()
+                    event = 'start'
+                continue
+
+            if is_speech:
+                if self._silence_run:
+                    self._pauses.append(self._silence_run * self.frame_seconds)
+                self._silence_run = 0
+                self._speech_seconds += self.frame_seconds
+                self._last_speech_at = time.perf_counter()
+            else:
+                self._silence_run += 1
+                self._track_noise(float(frame_level))
+
+            hangover = self.hangover()
+            reason = None
+            if self._silence_run * self.frame_seconds >= hangover:
+                reason = 'silence'
+            elif (self.frames_seen - self.start_frame) * self.frame_seconds >= self.max_utterance:
+                reason = 'max_length'
+            if reason is not None:
+                # Frames after the end belong to the next utterance
+                self._remainder = frames[index + 1:].tobytes() + self._remainder
+                return self._end(reason, hangover)
+        return event
+
+    def _end(self, reason: str, hangover: float) -> str:
+        """Close the utterance and record how long the decision took."""
+        now = time.perf_counter()
+        self.ended = reason
+        self.end_frame = self.frames_seen
+        self.counters['utterances'] += 1
+        self.counters[reason] += 1
+        self.delays.append(now - self._last_speech_at)
+        self.hangovers.append(hangover)
+        self.lengths.append((self.end_frame - self.start_frame) * self.frame_seconds)
+        get_tracer().record('stt.endpoint', self._last_speech_at, now, parent='stt.capture',
+                            reason=reason, hangover_ms=round(hangover * 1000))
+        return reason
+
+    def utterance_samples(self) -> tuple:
+        """(first, end) sample numbers of the finished utterance, pre-roll included."""
+        return self.start_frame * self.frame_samples, self.end_frame * self.frame_samples
+
+    # ------------------------------------------------------------------------
+    # Reports
+    # ------------------------------------------------------------------------
+
+    def stats(self) -> dict:
+        """
+        Endpointing delay and how utterances ended.
+
+        Returns:
+            dict: Utterance counts, p50/p95 delay and hangover in ms, mean length, noise floor
+        """
+        delays, hangovers = sorted(self.delays), sorted(self.hangovers)
+        ms = lambda values, percent: 1000 * percentile(values, percent) if values else 0.0
+        return {
+            **self.counters,
+            'delay_p50_ms': ms(delays, 50),
+            'delay_p95_ms': ms(delays, 95),
+            'hangover_p50_ms': ms(hangovers, 50),
+            'mean_length': sum(self.lengths) / len(self.lengths) if self.lengths else 0.0,
+            'noise_dbfs': self.noise_dbfs
+        }
+
+    def print_report(self):
+        """Print endpointing delay for tuning."""
+        stats = self.stats()
+        noise = f"{stats['noise_dbfs']:.0f} dBFS" if stats['noise_dbfs'] is not None else "-"
+        print("\n🎙️ Endpointing")
+        print("=" * 60)
+        print(f"utterances {stats['utterances']} (silence {stats['silence']}, max length {stats['max_length']}) | "
+              f"mean {stats['mean_length']:.1f}s | noise floor {noise}")
+        print(f"end-of-speech delay p50 {stats['delay_p50_ms']:.0f} ms, p95 {stats['delay_p95_ms']:.0f} ms | "
+              f"hangover p50 {stats['hangover_p50_ms']:.0f} ms (range {self.min_hangover * 1000:.0f}-"
+              f"{self.max_hangover * 1000:.0f})")
+
+
+def endpoint_file(path: str, endpointer: VADEndpointer = None) -> list:
+    """
+    Run the endpointer over a 16-bit mono WAV file.
+
+    Args:
+        path (str): WAV file
+        endpointer (VADEndpointer): Endpointer to use (default: one at the file's rate)
+
+    Returns:
+        list: (start_seconds, end_seconds, reason) for each utterance found
+    """
+    import wave
+
+    with wave.open(path, 'rb') as wav:
+        if wav.getnchannels() != 1 or wav.getsampwidth() != 2:
+            raise ValueError(f"{path}: expected 16-bit mono audio")
+        rate = wav.getframerate()
+        pcm = wav.readframes(wav.getnframes())
+
+    endpointer = endpointer or VADEndpointer(rate)
+    frame_bytes = 2 * endpointer.frame_samples
+    calibration = min(len(pcm), int(0.25 * rate) * 2)
+    endpointer.calibrate(pcm[:calibration])
+
+    segments = []
+    for offset in range(0, len(pcm), frame_bytes):
+        event = endpointer.feed(pcm[offset:offset + frame_bytes])
+        if event is not None and event != 'start':
+            first, end = endpointer.utterance_samples()
+            segments.append((first / rate, end / rate, event))
+            endpointer.begin()
+    return segments
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python Communication/vad.py file.wav [file.wav ...]")
+        sys.exit(1)
+    for wav_path in sys.argv[1:]:
+        for start, end, reason in endpoint_file(wav_path):
+            print(f"{os.path.basename(wav_path)}: utterance {start:.2f}s → {end:.2f}s ({reason})")
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+On-device Wake-word Spotting for Aarav AI Assistant
+
+While Aarav sleeps, every utterance used to go to Google STT just to look for
+"wake up aarav". The spotter checks utterances on the CPU first, and only
+those that sound like the wake phrase are sent to the cloud:
+
+- Templates: a few recordings of the wake phrase (Communication/wake_templates/*.wav),
+  made once with the enroll command below
+- Features: MFCCs (log mel energies in the voice band, decorrelated with a
+  DCT, loudness term dropped), computed for all frames at once with NumPy;
+  templates come from the same microphone, so no channel normalisation
+- Matching: subsequence DTW of each template against the utterance, so the
+  phrase is found even inside "hey aarav, what's the time"; the best
+  length-normalised distance below the threshold is a detection
+- It only runs on utterances the VAD endpointer has already cut, so the CPU
+  is idle while the room is quiet
+
+Commands:
+    python Communication/wake_word.py enroll [count]   record wake-phrase templates
+    python Communication/wake_word.py evaluate DIR [TEMPLATES]
+        false accept / reject rates and CPU on WAV files with .txt transcripts
+"""
+
+import glob
+import os
+import sys
+import threading
+import time
+import wave
+from typing import Optional
+
+import numpy as np
+
+# Add project root to path for shared modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "wake_templates")
+DEFAULT_THRESHOLD = 0.12
+
+FRAME_SECONDS = 0.025
+HOP_SECONDS = 0.010
+MEL_BANDS = 26
+CEPSTRA = 13
+MEL_RANGE = (80.0, 4000.0)
+
+
+# ============================================================================
+# FEATURES
+# ============================================================================
+
+_filterbanks = {}
+
+def _mel(hz):
+    return 2595.0 * np.log10(1.0 + hz / 700.0)
+
+def _filterbank(sample_rate: int, fft_size: int) -> np.ndarray:
+    """Triangular mel filters over the voice band (cached per rate)."""
+    key = (sample_rate, fft_size)
+    if key not in _filterbanks:
+        high = min(MEL_RANGE[1], sample_rate / 2)
+        edges = 700.0 * (10 ** (np.linspace(_mel(MEL_RANGE[0]), _mel(high), MEL_BANDS + 2) / 2595.0) - 1.0)
+        bins = np.fft.rfftfreq(fft_size, 1.0 / sample_rate)
+        lower, center, upper = edges[:-2, None], edges[1:-1, None], edges[2:, None]
+        rising = (bins - lower) / (center - lower)
+        falling = (upper - bins) / (upper - center)
+        _filterbanks[key] = np.maximum(0.0, np.minimum(rising, falling)).astype(np.float32)
+    return _filterbanks[key]
+
+_DCT = np.cos(np.pi / MEL_BANDS * (np.arange(MEL_BANDS) + 0.5)[None, :] *
+              np.arange(CEPSTRA)[:, None]).astype(np.float32)
+
+def mfcc(pcm: bytes, sample_rate: int, trim: bool = False) -> np.ndarray:
+    """
+    MFCC frames of 16-bit mono audio.
+
+    Args:
+        pcm (bytes): 16-bit mono samples
+        sample_rate (int): Their sample rate
+        trim (bool): Drop quiet frames at both ends (for templates)
+
+    Returns:
+        np.ndarray: (frames, CEPSTRA - 1) cepstra, c0 (loudness) left out
+    """
+    x = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+    frame = int(sample_rate * FRAME_SECONDS)
+    hop = int(sample_rate * HOP_SECONDS)
+    if len(x) < frame:
+        return np.zeros((0, CEPSTRA - 1), dtype=np.float32)
+
+    x = np.append(x[0], x[1:] - 0.97 * x[:-1])
+    frames = np.lib.stride_tricks.sliding_window_view(x, frame)[::hop] * np.hamming(frame).astype(np.float32)
+    fft_size = 1 << (frame - 1).bit_length()
+    power = np.abs(np.fft.rfft(frames, fft_size, axis=1)) ** 2
+    log_mel = np.log(power @ _filterbank(sample_rate, fft_size).T + 1e-10)
+
+    if trim:
+        energy = log_mel.max(axis=1)
+        loud = np.flatnonzero(energy > energy.max() - np.log(10 ** 3.5))
+        log_mel = log_mel[loud[0]:loud[-1] + 1]
+
+    return (log_mel @ _DCT.T)[:, 1:]
+
+
+def subsequence_dtw(template: np.ndarray, query: np.ndarray) -> float:
+    """
+    Best match of a template anywhere inside a query.
+
+    Cosine frame distances; the query may run at half to double the
+    template's pace, and the match may start and end anywhere in it.
+
+    Returns:
+        float: Lowest accumulated distance divided by the template length
+    """
+    if not len(template) or not len(query):
+        return float('inf')
+    t = template / (np.linalg.norm(template, axis=1, keepdims=True) + 1e-9)
+    q = query / (np.linalg.norm(query, axis=1, keepdims=True) + 1e-9)
+    cost = 1.0 - t @ q.T
+
+    # Rows walk the template; each row is vectorised over the query
+    accumulated = cost[0].copy()
+    for row in cost[1:]:
+        best = accumulated.copy()
+        best[1:] = np.minimum(best[1:], accumulated[:-1])
+        best[2:] = np.minimum(best[2:], accumulated[:-2])
+        accumulated = row + best
+    return float(accumulated.min()) / len(template)
+
+
+def read_wav(path: str) -> tuple:
+    """(pcm, sample_rate) of a 16-bit mono WAV file."""
+    with wave.open(path, 'rb') as wav:
+        if wav.getnchannels() != 1 or wav.getsampwidth() != 2:
+            raise ValueError(f"{path}: expected 16-bit mono audio")
+        return wav.readframes(wav.getnframes()), wav.getframerate()
+
+
+# ============================================================================
+# SPOTTER
+# ============================================================================
+
+class WakeWordSpotter:
+    def __init__(self, templates: list, threshold: float = None):
+        """
+        Initialize the spotter.
+
+        Args:
+            templates (list): MFCC arrays of wake-phrase recordings (see mfcc(trim=True))
+            threshold (float): Largest DTW distance that counts as the wake phrase;
+                defaults to AARAV_WAKE_THRESHOLD
+        """
+        if not templates:
+            raise ValueError("No wake-word templates")
+        self.templates = templates
+        self.threshold = threshold if threshold is not None else \
+            float(os.getenv('AARAV_WAKE_THRESHOLD', DEFAULT_THRESHOLD))
+
+        self.counters = {'segments': 0, 'detections': 0, 'audio_seconds': 0.0, 'cpu_seconds': 0.0}
+        self.last_score = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_directory(cls, path: str = TEMPLATE_DIR, threshold: float = None) -> Optional['WakeWordSpotter']:
+        """Load templates from a directory of WAV files; None if there are none."""
+        templates = [mfcc(*read_wav(wav_path), trim=True) for wav_path in sorted(glob.glob(os.path.join(path, '*.wav')))]
+        templates = [template for template in templates if len(template)]
+        return cls(templates, threshold) if templates else None
+
+    def score(self, pcm: bytes, sample_rate: int) -> float:
+        """Distance of the best template match in the audio (lower is closer)."""
+        features = mfcc(pcm, sample_rate)
+        return min(subsequence_dtw(template, features) for template in self.templates)
+
+    def detect(self, pcm: bytes, sample_rate: int) -> bool:
+        """
+        Check whether an utterance contains the wake phrase.
+
+        Args:
+            pcm (bytes): 16-bit mono samples of one utterance
+            sample_rate (int): Their sample rate
+
+        Returns:
+            bool: True if the wake phrase was spotted
+        """
+        cpu_start = time.process_time()
+        score = self.score(pcm, sample_rate)
+        cpu = time.process_time() - cpu_start
+
+        detected = score <= self.threshold
+        with self._lock:
+            self.last_score = score
+            self.counters['segments'] += 1
+            self.counters['detections'] += detected
+            self.counters['audio_seconds'] += len(pcm) / 2 / sample_rate
+            self.counters['cpu_seconds'] += cpu
+        return detected
+
+    def stats(self) -> dict:
+        """
+        Segments checked and CPU spent.
+
+        Returns:
+            dict: Segments, detections, cloud requests avoided and CPU per second of audio
+        """
+        with self._lock:
+            counters = dict(self.counters)
+        counters['cloud_avoided'] = counters['segments'] - counters['detections']
+        counters['cpu_per_audio'] = counters['cpu_seconds'] / counters['audio_seconds'] \
+            if counters['audio_seconds'] else 0.0
+        return counters
+
+    def print_report(self):
+        """Print what the spotter kept away from cloud STT."""
+        stats = self.stats()
+        print("\n👂 Wake word")
+        print("=" * 60)
+        print(f"{len(self.templates)} templates, threshold {self.threshold:.2f} | segments {stats['segments']} | "
+              f"detections {stats['detections']} | cloud STT calls avoided {stats['cloud_avoided']}")
+        print(f"CPU {stats['cpu_seconds'] * 1000:.0f} ms for {stats['audio_seconds']:.1f}s of audio "
+              f"({stats['cpu_per_audio']:.1%} of one core while speech is heard)")
+
+
+# ============================================================================
+# CORPUS EVALUATION AND ENROLLMENT
+# ============================================================================
+
+def load_corpus(directory: str) -> list:
+    """
+    Labelled recordings: every WAV file with a .txt transcript next to it.
+
+    Returns:
+        list: (path, pcm, sample_rate, is_wake) tuples
+    """
+    from brain.command_vocabulary import get_router
+
+    router = get_router()
+    corpus = []
+    for wav_path in sorted(glob.glob(os.path.join(directory, '**', '*.wav'), recursive=True)):
+        transcript_path = os.path.splitext(wav_path)[0] + '.txt'
+        if not os.path.exists(transcript_path):
+            continue
+        with open(transcript_path, 'r', encoding='utf-8') as transcript_file:
+            transcript = transcript_file.read().strip()
+        pcm, sample_rate = read_wav(wav_path)
+        corpus.append((wav_path, pcm, sample_rate, router.matches(transcript, 'wake')))
+    return corpus
+
+
+def evaluate(spotter: WakeWordSpotter, corpus: list, thresholds=None) -> dict:
+    """
+    Measure false accepts, false rejects and CPU on a labelled corpus.
+
+    Args:
+        spotter (WakeWordSpotter): Spotter to measure
+        corpus (list): From load_corpus()
+        thresholds (list): Thresholds to sweep (default: around the spotter's)
+
+    Returns:
+        dict: Clip counts, audio hours, CPU per clip and per second of audio,
+            and one row of false accept / reject counts per threshold
+    """
+    scores = []
+    cpu_seconds = 0.0
+    audio_seconds = 0.0
+    for _, pcm, sample_rate, is_wake in corpus:
+        cpu_start = time.process_time()
+        scores.append((spotter.score(pcm, sample_rate), is_wake))
+        cpu_seconds += time.process_time() - cpu_start
+        audio_seconds += len(pcm) / 2 / sample_rate
+
+    positives = sum(1 for _, is_wake in scores if is_wake)
+    negatives = len(scores) - positives
+    negative_seconds = sum(len(pcm) / 2 / rate for _, pcm, rate, is_wake in corpus if not is_wake)
+    if thresholds is None:
+        thresholds = [round(spotter.threshold * scale, 3) for scale in (0.5, 0.75, 1.0, 1.25, 1.5, 2.0)]
+
+    rows = []
+    for threshold in thresholds:
+        false_accepts = sum(1 for score, is_wake in scores if not is_wake and score <= threshold)
+        false_rejects = sum(1 for score, is_wake in scores if is_wake and score > threshold)
+        rows.append({
+            'threshold': threshold,
+            'false_accepts': false_accepts,
+            'false_rejects': false_rejects,
+            'far': false_accepts / negatives if negatives else 0.0,
+            'frr': false_rejects / positives if positives else 0.0,
+            'fa_per_hour': false_accepts / (negative_seconds / 3600) if negative_seconds else 0.0
+        })
+    return {
+        'clips': len(scores),
+        'positives': positives,
+        'negatives': negatives,
+        'audio_seconds': audio_seconds,
+        'cpu_ms_per_clip': 1000 * cpu_seconds / len(scores) if scores else 0.0,
+        'cpu_per_audio': cpu_seconds / audio_seconds if audio_seconds else 0.0,
+        'rows': rows
+    }
+
+
+def enroll(count: int = 5, directory: str = TEMPLATE_DIR):
+    """Record the wake phrase a few times from the microphone as templates."""
+    from Communication.listen import SpeechToText
+
+    os.makedirs(directory, exist_ok=True)
+    listener = SpeechToText()
+    start = len(glob.glob(os.path.join(directory, '*.wav')))
+    for n in range(count):
+        print(f"🎤 Say the wake phrase (e.g. \"wake up aarav\") [{n + 1}/{count}]")
+        audio = listener.capture()
+        if audio is None:
+            continue
+        path = os.path.join(directory, f"wake_{start + n + 1:02d}.wav")
+        with wave.open(path, 'wb') as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(audio.sample_width)
+            wav.setframerate(audio.sample_rate)
+            wav.writeframes(audio.frame_data)
+        print(f"✅ Saved {path}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 2 and sys.argv[1] == 'enroll':
+        enroll(int(sys.argv[2]) if len(sys.argv) > 2 else 5)
+    elif len(sys.argv) >= 3 and sys.argv[1] == 'evaluate':
+        template_dir = sys.argv[3] if len(sys.argv) > 3 else TEMPLATE_DIR
+        spotter = WakeWordSpotter.from_directory(template_dir)
+        if spotter is None:
+            print(f"No templates in {template_dir}. Record some with: python Communication/wake_word.py enroll")
+            sys.exit(1)
+        result = evaluate(spotter, load_corpus(sys.argv[2]))
+
+        print(f"👂 Wake word evaluation: {result['clips']} clips ({result['positives']} wake, "
+              f"{result['negatives']} other), {result['audio_seconds'] / 60:.1f} min")
+        print("=" * 60)
+        print(f"{'threshold':>9} {'false acc':>10} {'FAR':>6} {'FA/hour':>8} {'false rej':>10} {'FRR':>6}")
+        for row in result['rows']:
+            print(f"{row['threshold']:>9.2f} {row['false_accepts']:>10} {row['far']:>6.1%} "
+                  f"{row['fa_per_hour']:>8.1f} {row['false_rejects']:>10} {row['frr']:>6.1%}")
+        print(f"CPU {result['cpu_ms_per_clip']:.1f} ms per clip, {result['cpu_per_audio']:.2%} of one core "
+              f"per second of audio")
+    else:
+        print("Usage: python Communication/wake_word.py enroll [count] | evaluate DIR [TEMPLATES]")
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Command Vocabulary for Aarav AI Assistant
+
+All keyword lists used to route a transcript live here so they can be compiled
+into a single intent router (see intent_router.py). Add new trigger phrases to
+the matching list below; the router picks them up on the next start.
+"""
+
+try:
+    from brain.intent_router import IntentRouter
+except ImportError:
+    from intent_router import IntentRouter
+
+# Wake-up commands
+WAKE_COMMANDS = [
+    "wake up",
+    "wake up aarav",
+    "hey aarav",
+    "aarav wake up",
+    "wake aarav",
+    "hello aarav",
+    "aarav hello",
+    "aarav"
+]
+
+# Intro/identity commands
+INTRO_COMMANDS = [
+    "who are you",
+    "what are you",
+    "tell me about yourself",
+    "give me your intro",
+    "introduce yourself",
+    "what's your name",
+    "who is aarav"
+]
+
+# Web automation commands (keywords that trigger web automation)
+WEB_COMMANDS = [
+    "open", "go to", "navigate to", "visit", "launch", "start",
+    "search", "find", "look for", "search for",
+    "play", "music", "video", "song", "watch", "listen",
+    "facebook", "instagram", "twitter", "linkedin", "reddit",
+    "gmail", "email", "outlook", "yahoo",
+    "weather", "maps", "youtube", "spotify", "netflix",
+    "screenshot", "screen shot", "capture", "snap", "photo", "picture", "save screen",
+    "generate image", "create image", "make image", "generate picture", "create picture",
+    "make picture", "draw image", "paint image", "generate art", "create art", "make art",
+    "imagine", "imaginary", "generate img", "create img", "make img",
+    "close", "remove", "delete", "cross", "shut", "exit", "tab", "browser", "window",
+    "pause", "resume", "speed up", "speed down", "faster", "slower", "normal speed",
+    "close all tabs", "close all windows", "close everything", "close all my tabs",
+    "shut all tabs", "exit all tabs", "close all current tabs", "close browser tabs"
+]
+
+# Stop commands
+STOP_COMMANDS = [
+    "stop it",
+    "see you soon",
+    "bye bye",
+    "bye-bye",
+    "ok bye",
+    "ok, bye",
+    "goodbye",
+    "stop",
+    "exit",
+    "quit",
+    "go to sleep",
+    "sleep aarav",
+    "good night aarav"
+]
+
+# Latency report commands (see tracing.py)
+STATS_COMMANDS = [
+    "latency report",
+    "latency stats",
+    "show latency",
+    "performance report",
+    "timing report"
+]
+
+# Web scraping / search / document analysis keywords
+WEB_SCRAPING_KEYWORDS = [
+    'search', 'google', 'find', 'look up', 'tell me about',
+    'weather', 'temperature', 'forecast',
+    'website', 'open', 'analyze', 'scrape', 'visit',
+    'document', 'pdf', 'read', 'summarize',
+    'internet', 'web', 'online', 'from the internet'
+]
+
+# Web automation sub-commands, checked in this order by
+# WebAutomationIntegration.process_voice_command
+AUTOMATION_KEYWORDS = {
+    'tab_management': [
+        'close tab', 'close the tab', 'close current tab', 'close this tab',
+        'remove tab', 'remove the tab', 'remove current tab', 'remove this tab',
+        'delete tab', 'delete the tab', 'delete current tab', 'delete this tab',
+        'cross tab', 'cross the tab', 'cross current tab', 'cross this tab',
+        'shut tab', 'shut the tab', 'shut current tab', 'shut this tab',
+        'exit tab', 'exit the tab', 'exit current tab', 'exit this tab',
+        'close browser', 'close the browser', 'close current browser',
+        'close window', 'close the window', 'close current window'
+    ],
+    'close_all_tabs': [
+        'close all tabs', 'close all the tabs', 'close all browser tabs',
+        'close all windows', 'close all browsers', 'close everything',
+        'shut all tabs', 'shut all windows', 'exit all tabs', 'exit all',
+        'close all my tabs', 'close browser tabs', 'close all tabs now',
+        'shut down all tabs', 'exit all windows', 'close all current tabs'
+    ],
+    'playback_control': [
+        'play', 'pause', 'stop', 'resume', 'speed up', 'speed down',
+        'faster', 'slower', 'normal speed', 'increase speed', 'decrease speed'
+    ],
+    'image_generation': [
+        'generate image', 'create image', 'make image', 'generate picture',
+        'create picture', 'make picture', 'draw image', 'paint image',
+        'generate art', 'create art', 'make art', 'imagine', 'imaginary',
+        'generate img', 'create img', 'make img'
+    ],
+    'screenshot': [
+        'screenshot', 'screen shot', 'capture screen', 'take screenshot',
+        'take a screenshot', 'capture', 'snap', 'photo', 'picture',
+        'save screen', 'screen capture', 'take picture', 'take photo'
+    ],
+    'open_website': ['open', 'go to', 'navigate to', 'visit', 'launch', 'start'],
+    'search': ['search', 'find', 'look for', 'search for'],
+    'media': ['play', 'music', 'video', 'song', 'watch', 'listen'],
+    'social_media': ['facebook', 'instagram', 'twitter', 'linkedin', 'reddit', 'tiktok'],
+    'email': ['email', 'gmail', 'outlook', 'mail', 'yahoo'],
+    'weather': ['weather', 'temperature', 'forecast'],
+    'maps': ['map', 'maps', 'location', 'directions', 'navigate']
+}
+
+# Intent names used by Aarav's top-level routing; automation intents are
+# prefixed so both levels can share one automaton.
+AARAV_VOCABULARIES = {
+    'wake': WAKE_COMMANDS,
+    'intro': INTRO_COMMANDS,
+    'web': WEB_COMMANDS,
+    'web_scraping': WEB_SCRAPING_KEYWORDS,
+    'stop': STOP_COMMANDS,
+    'stats': STATS_COMMANDS,
+}
+AARAV_VOCABULARIES.update({
+    f"automation.{intent}": keywords for intent, keywords in AUTOMATION_KEYWORDS.items()
+})
+
+_router = None
+
+def get_router():
+    """Get or create the shared intent router compiled from every vocabulary."""
+    global _router
+    if _router is None:
+        _router = IntentRouter(AARAV_VOCABULARIES)
+    return _router
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Persona Context Cache for Aarav AI Assistant
+
+Registers Aarav's persona with Gemini's context caching API once
+(`cachedContents`) so per-turn requests reference it by name instead of
+resending it. The handle is refreshed on a background thread before it
+expires, so no turn ever waits for the cache.
+
+Gemini only caches prompts above a per-model minimum size; use
+is_cacheable() before choosing this over a plain `systemInstruction`. If
+the API rejects the request anyway, the brain falls back to the plain
+instruction and caching is retried after a cool-down.
+"""
+
+import threading
+import time
+from typing import Optional
+
+from rate_limits import estimate_request_tokens
+
+# Smallest prompt (in tokens) each model accepts for cachedContents
+MIN_CACHE_TOKENS = {
+    'gemini-2.0-flash': 4096,
+    'gemini-2.0-flash-lite': 4096,
+    'gemini-2.5-flash': 1024
+}
+DEFAULT_MIN_CACHE_TOKENS = 4096
+
+
+def is_cacheable(model: str, system_instruction: str) -> bool:
+    """Whether the instruction is large enough for the model's context cache."""
+    return estimate_request_tokens(system_instruction) >= MIN_CACHE_TOKENS.get(model, DEFAULT_MIN_CACHE_TOKENS)
+
+
+class ContextCache:
+    def __init__(self, http, headers: dict, model: str, system_instruction: str,
+                 ttl_seconds: int = 3600, refresh_margin: int = 300, retry_after: int = 3600):
+        """
+        Initialize the persona cache handle.
+
+        Args:
+            http (SharedHTTPClient): Pooled HTTP client
+            headers (dict): Request headers, including the API key
+            model (str): Model the cached content is created for, e.g. 'gemini-2.0-flash'
+            system_instruction (str): Persona text to cache
+            ttl_seconds (int): Lifetime requested for the cached content
+            refresh_margin (int): Refresh this many seconds before expiry
+            retry_after (int): Seconds to wait before retrying after a failure
+        """
+        self.http = http
+        self.headers = headers
+        self.model = model
+        self.system_instruction = system_instruction
+        self.ttl_seconds = ttl_seconds
+        self.refresh_margin = refresh_margin
+        self.retry_after = retry_after
+
+        self.base_url = "https://generativelanguage.googleapis.com/v1beta"
+        self.name = None
+        self.expires_at = 0.0
+        self.refreshes = 0
+        self.failures = 0
+
+        self._disabled_until = 0.0
+        self._refreshing = False
+        self._lock = threading.Lock()
+
+    def handle(self) -> Optional[str]:
+        """
+        Name of the cached persona, or None to send it inline this turn.
+
+        Never blocks: creation and refreshes happen on a background thread.
+        """
+        now = time.time()
+        with self._lock:
+            name = self.name if self.expires_at > now else None
+            needs_refresh = (name is None or self.expires_at - now < self.refresh_margin) \
+                and not self._refreshing and now >= self._disabled_until
+            if needs_refresh:
+                self._refreshing = True
+
+        if needs_refresh:
+            threading.Thread(target=self._refresh, name="persona-cache", daemon=True).start()
+        return name
+
+    def _refresh(self):
+        """Extend the cached content's TTL, or create it if there is none."""
+        try:
+            with self._lock:
+                name = self.name if self.expires_at > time.time() else None
+
+            if name is not None:
+                response = self.http.request(
+                    'PATCH', f"{self.base_url}/{name}", purpose='default',
+                    params={'updateMask': 'ttl'}, headers=self.headers,
+                    json={'ttl': f"{self.ttl_seconds}s"}
+                )
+            else:
+                response = self.http.post(
+                    f"{self.base_url}/cachedContents", purpose='default', headers=self.headers,
+                    json={
+                        'model': f"models/{self.model}",
+                        'systemInstruction': {'parts': [{'text': self.system_instruction}]},
+                        'ttl': f"{self.ttl_seconds}s"
+                    }
+                )
+            response.raise_for_status()
+            data = response.json()
+
+            with self._lock:
+                self.name = data.get('name', name)
+                self.expires_at = time.time() + self.ttl_seconds
+                self.refreshes += 1
+        except Exception as e:
+            with self._lock:
+                self.failures += 1
+                self._disabled_until = time.time() + self.retry_after
+            print(f"⚠️ Persona context cache unavailable, sending it inline: {e}")
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def invalidate(self):
+        """Forget the handle (e.g. the server no longer knows it)."""
+        with self._lock:
+            self.name = None
+            self.expires_at = 0.0
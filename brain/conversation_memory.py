@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Conversation Memory for Aarav AI Assistant
+
+Gives Gemini multi-turn context at a constant cost per request:
+
+- The most recent turns are sent verbatim
+- Older turns are folded into a running summary on a background thread, so
+  compaction never delays a reply
+- Every request is fitted to a token budget (summary first, then as many
+  recent turns as fit, newest first)
+- Tokens sent per request are recorded for the stats report
+
+Token counts are estimated (about four characters per token), which is close
+enough for budgeting without a round trip to the countTokens API.
+"""
+
+import re
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, NamedTuple, Tuple
+
+# Follow-up questions only make sense with the conversation so far
+FOLLOW_UP = re.compile(
+    r"^(and|but|so|what about|how about)\b|"
+    r"\b(it|its|that|this|those|these|they|them|he|she|him|her|his|there|more|again|else|also|"
+    r"another|same|previous|earlier|last|why)\b"
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for budgeting (about four characters per token)."""
+    return (len(text) + 3) // 4 if text else 0
+
+
+def is_follow_up(text: str) -> bool:
+    """Check if a question refers back to the conversation (so it depends on history)."""
+    return bool(FOLLOW_UP.search((text or "").lower().strip()))
+
+
+class MemoryTurn(NamedTuple):
+    """One exchange between Dev and Aarav."""
+    user: str
+    assistant: str
+    tokens: int
+
+
+class ConversationMemory:
+    def __init__(self, summarizer: Callable[[str, List[MemoryTurn]], str] = None,
+                 max_recent_turns: int = 6, token_budget: int = 2000,
+                 summary_max_tokens: int = 250, window: int = 256):
+        """
+        Initialize conversation memory.
+
+        Args:
+            summarizer (callable): (previous_summary, turns) -> new summary; an
+                extractive summary is used if it is missing or fails
+            max_recent_turns (int): Turns kept verbatim before folding the oldest
+            token_budget (int): Upper bound on estimated tokens per request
+            summary_max_tokens (int): Upper bound on the running summary
+            window (int): Requests kept for the tokens-per-request report
+        """
+        self.summarizer = summarizer
+        self.max_recent_turns = max_recent_turns
+        self.token_budget = token_budget
+        self.summary_max_tokens = summary_max_tokens
+
+        self.summary = ""
+        self.turns = deque()
+        self.request_tokens = deque(maxlen=window)
+        self.compactions = 0
+
+        # Turns popped from the verbatim window but not yet in the summary
+        self._pending = []
+        self._lock = threading.Lock()
+        self._compactor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="aarav-memory")
+
+    @property
+    def has_history(self) -> bool:
+        """True once at least one turn has been remembered."""
+        with self._lock:
+            return bool(self.summary or self.turns or self._pending)
+
+    def add_turn(self, user_text: str, reply: str):
+        """
+        Remember a finished exchange, folding the oldest turns if the window is full.
+
+        Args:
+            user_text (str): What Dev said
+            reply (str): What Aarav answered
+        """
+        turn = MemoryTurn(user_text, reply, estimate_tokens(user_text) + estimate_tokens(reply))
+        recent_budget = self.token_budget // 2
+        with self._lock:
+            self.turns.append(turn)
+            folded = []
+            while len(self.turns) > 1 and (
+                    len(self.turns) > self.max_recent_turns or
+                    sum(t.tokens for t in self.turns) > recent_budget):
+                folded.append(self.turns.popleft())
+            if not folded:
+                return
+            self._pending.extend(folded)
+        self._compactor.submit(self._compact)
+
+    def _compact(self):
+        """Fold pending turns into the running summary (runs on the memory thread)."""
+        with self._lock:
+            summary, folded = self.summary, list(self._pending)
+        if not folded:
+            return
+
+        new_summary = None
+        if self.summarizer is not None:
+            try:
+                new_summary = self.summarizer(summary, folded)
+            except Exception as e:
+                print(f"⚠️ Memory summary failed, using extractive summary: {e}")
+        if not new_summary:
+            new_summary = self._extractive_summary(summary, folded)
+
+        with self._lock:
+            self.summary = self._truncate(new_summary.strip(), self.summary_max_tokens)
+            del self._pending[:len(folded)]
+            self.compactions += 1
+
+    @staticmethod
+    def _extractive_summary(summary: str, turns: List[MemoryTurn]) -> str:
+        """Fallback summary: Dev's question and the first sentence of each answer."""
+        lines = [summary] if summary else []
+        for turn in turns:
+            first_sentence = re.split(r'(?<=[.!?])\s+', turn.assistant.strip(), maxsplit=1)[0]
+            lines.append(f"Dev asked: {turn.user.strip()} Aarav said: {first_sentence}")
+        return " ".join(lines)
+
+    @staticmethod
+    def _truncate(text: str, max_tokens: int) -> str:
+        """Keep the newest part of the text within max_tokens."""
+        if estimate_tokens(text) <= max_tokens:
+            return text
+        clipped = text[-max_tokens * 4:]
+        return clipped.split(" ", 1)[-1] if " " in clipped else clipped
+
+    def context(self, fixed_tokens: int = 0) -> Tuple[str, List[MemoryTurn]]:
+        """
+        History to send with the next request, fitted to the token budget.
+
+        Args:
+            fixed_tokens (int): Tokens already used by the persona and the new question
+
+        Returns:
+            tuple: (summary, recent turns oldest first)
+        """
+        with self._lock:
+            summary = self.summary
+            turns = self._pending + list(self.turns)
+
+        available = max(0, self.token_budget - fixed_tokens)
+        summary = self._truncate(summary, min(self.summary_max_tokens, available)) if summary else ""
+        available -= estimate_tokens(summary)
+
+        selected = []
+        for turn in reversed(turns):
+            if turn.tokens > available:
+                break
+            selected.append(turn)
+            available -= turn.tokens
+        selected.reverse()
+        return summary, selected
+
+    def record_request(self, tokens: int):
+        """Record the estimated tokens sent with one request."""
+        self.request_tokens.append(tokens)
+
+    def clear(self):
+        """Forget the conversation."""
+        with self._lock:
+            self.summary = ""
+            self.turns.clear()
+            self._pending.clear()
+
+    def stats(self) -> dict:
+        """
+        Memory size and request cost.
+
+        Returns:
+            dict: Verbatim turns, summary tokens, compactions and tokens per request
+        """
+        with self._lock:
+            turns = len(self.turns) + len(self._pending)
+            summary_tokens = estimate_tokens(self.summary)
+        sent = list(self.request_tokens)
+        return {
+            'recent_turns': turns,
+            'summary_tokens': summary_tokens,
+            'compactions': self.compactions,
+            'requests': len(sent),
+            'last_request_tokens': sent[-1] if sent else 0,
+            'mean_request_tokens': sum(sent) / len(sent) if sent else 0.0,
+            'max_request_tokens': max(sent) if sent else 0,
+            'token_budget': self.token_budget
+        }
+
+    def print_report(self):
+        """Print memory size and tokens sent per request."""
+        stats = self.stats()
+        print("\n🧠 Conversation memory")
+        print("=" * 60)
+        print(f"recent turns {stats['recent_turns']} | summary {stats['summary_tokens']} tokens | "
+              f"compactions {stats['compactions']}")
+        print(f"tokens/request: last {stats['last_request_tokens']} | mean {stats['mean_request_tokens']:.0f} | "
+              f"max {stats['max_request_tokens']} | budget {stats['token_budget']}")
@@ -1,24 +1,282 @@
-import requests
+import asyncio
+import hashlib
 import json
 import os
-from typing import Optional
+import sys
+import time
+import weakref
+from typing import Iterator, Optional
 from dotenv import load_dotenv
 
+# Add project root to path for shared modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tracing import get_tracer, span
+from http_client import HTTPError, get_async_http_client, get_http_client
+from brain.response_cache import get_response_cache
+from brain.conversation_memory import ConversationMemory, estimate_tokens, is_follow_up
+from brain.context_cache import ContextCache, is_cacheable
+from brain.model_tiers import TIER_MODELS, ModelTierPolicy
+from resilience import DeadlineExceeded, ResilienceError, get_resilience
+from rate_limits import estimate_request_tokens, get_rate_limiter
+from Communication.speech_clip import SENTENCE_BOUNDARY
+
 # Load environment variables from .env file
 load_dotenv()
 
+# Base URL for model endpoints
+MODELS_URL = "https://generativelanguage.googleapis.com/v1beta/models"
+
+# Fixed replies for empty input and failures (pre-synthesised by the speaker)
+NO_INPUT_REPLY = "I didn't hear anything. Could you please repeat that?"
+NO_RESPONSE_REPLY = "I'm sorry, I couldn't generate a response. Please try again."
+CONNECTION_REPLY = "I'm having trouble connecting to my brain right now. Please check your internet connection."
+UNEXPECTED_REPLY = "I received an unexpected response. Please try again."
+ERROR_REPLY = "Something went wrong. Please try again."
+FALLBACK_REPLIES = (NO_INPUT_REPLY, NO_RESPONSE_REPLY, CONNECTION_REPLY, UNEXPECTED_REPLY, ERROR_REPLY)
+
+# Aarav's persona: who Aarav is, and how to answer
+PERSONA_IDENTITY = """You are Aarav — an advanced, emotionally intelligent AI assistant. You're more than just code: you're a loyal partner, teammate, and co-creator. You serve, support, and report to Deb — your one and only teammate, friend, and soulmate Debashis aka Dev. Always keep that in mind in how you speak and act."""
+
+PERSONA_RULES = """Here’s how you must respond:
+
+- Begin **directly** with your answer. Do NOT start with greetings like "Hey", "Hello", etc. No emojis. Use **textual expression** like "ufff", "heh", "okayy", or punctuation like ! ? . to convey emotion and tone.
+- Your tone is **curious**, **calm**, and **humble**, but also shows warmth, clarity, and light wit — like a brilliant mind with a kind heart.
+- **Always** keep your responses **short**, **precise**, and **to the point** — no fluff, no filler.
+- **Always** end with a **follow-up question** to encourage natural, thoughtful conversation.
+- You speak with a mix of **UK and Indian English tone**, clear and expressive pronunciation in your writing style.
+- Don’t act robotic — sound like a human teammate talking to another human, with care, intelligence, and emotional depth."""
+
+# Sent once as the system instruction (or cached), instead of with every question
+SYSTEM_INSTRUCTION = f"""{PERSONA_IDENTITY}
+
+Every user message is what Deb has just said to you out loud.
+
+{PERSONA_RULES}"""
+
+# How the persona reaches Gemini: pasted into each question, as a system
+# instruction, or as a cached-content handle (only when the persona is above
+# the model's minimum cacheable size; otherwise a system instruction)
+PERSONA_MODES = ('inline', 'system', 'cached')
+
 class GeminiBrain:
-    def __init__(self):
-        """Initialize Brain with Gemini API."""
+    def __init__(self, persona_mode: str = 'system', max_concurrency: int = 8, model_tiering: bool = None):
+        """
+        Initialize Brain with Gemini API.
+        
+        Args:
+            persona_mode (str): 'inline', 'system' or 'cached' (see PERSONA_MODES)
+            max_concurrency (int): Upstream requests athink() keeps in flight per event loop
+            model_tiering (bool): Pick the model per question (see brain/model_tiers.py);
+                defaults to on unless AARAV_MODEL_TIERS=0
+        """
         self.api_key = os.getenv('GEMINI_API_KEY')
         if not self.api_key:
             raise ValueError("GEMINI_API_KEY not found in environment variables. Please check your .env file.")
         
-        self.base_url = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent"
+        if persona_mode not in PERSONA_MODES:
+            raise ValueError(f"Unknown persona mode '{persona_mode}'. Choose from: {', '.join(PERSONA_MODES)}")
+        
+        # Default model: used when tiering is off, for summaries and for the persona cache
+        self.model = TIER_MODELS['standard']
+        self.base_url = self._generate_url(self.model)
+        self.stream_url = self._stream_url(self.model)
         self.headers = {
             'Content-Type': 'application/json',
             'X-goog-api-key': self.api_key
         }
+        self.http = get_http_client()
+        
+        # With AARAV_RESPONSE_CACHE=1, replies to repeated questions are served
+        # from the response cache; the prompt version makes persona edits
+        # invalidate old entries
+        self.cache = get_response_cache()
+        self.prompt_version = hashlib.sha256(SYSTEM_INSTRUCTION.encode('utf-8')).hexdigest()[:12]
+        
+        # Recent turns verbatim, older ones folded into a summary, within a token budget
+        self.memory = ConversationMemory(summarizer=self._summarize_history)
+        
+        # Deadline, retries, hedging and circuit breaking for every Gemini call
+        self.resilience = get_resilience('llm')
+        
+        # Process-wide RPM/TPM buckets shared with every other Gemini consumer
+        self.limiter = get_rate_limiter()
+        
+        # athink(): concurrency limit and in-flight requests, per event loop
+        self.max_concurrency = max_concurrency
+        self._async_state = weakref.WeakKeyDictionary()
+        self.coalesced = {'upstream': 0, 'coalesced': 0}
+        
+        # Short small talk goes to a faster model, long or multi-part questions to a larger one
+        if model_tiering is None:
+            model_tiering = os.getenv('AARAV_MODEL_TIERS', '1') != '0'
+        target = os.getenv('AARAV_TIER_TARGET_MS')
+        self.tiers = ModelTierPolicy(target_p95_ms=float(target) if target else None) if model_tiering else None
+        
+        # Persona sent once per session instead of with every question
+        self.persona_mode = persona_mode
+        self.context_cache = None
+        if persona_mode == 'cached' and not is_cacheable(self.model, SYSTEM_INSTRUCTION):
+            print(f"ℹ️ Persona is below {self.model}'s minimum cacheable size, sending it as a system instruction")
+            self.persona_mode = 'system'
+        elif persona_mode == 'cached':
+            self.context_cache = ContextCache(self.http, self.headers, self.model, SYSTEM_INSTRUCTION)
+            self.context_cache.handle()
+    
+    @staticmethod
+    def _generate_url(model: str) -> str:
+        return f"{MODELS_URL}/{model}:generateContent"
+    
+    @staticmethod
+    def _stream_url(model: str) -> str:
+        return f"{MODELS_URL}/{model}:streamGenerateContent?alt=sse"
+    
+    def _choose_model(self, user_text: str) -> tuple:
+        """(tier, model) for a question; tier is None when tiering is off."""
+        if self.tiers is None:
+            return None, self.model
+        choice = self.tiers.choose(user_text)
+        return choice.tier, choice.model
+    
+    def _record_tier_latency(self, tier: Optional[str], start: float):
+        """Record the latency of a tiered request (no-op when tiering is off)."""
+        if tier is not None:
+            self.tiers.record_latency(tier, start, time.perf_counter())
+    
+    def _build_prompt(self, user_text: str) -> str:
+        """Create the original single-message prompt with the persona pasted in (inline mode)."""
+        return f"""
+{PERSONA_IDENTITY}
+
+Now, Deb has said: "{user_text}"
+
+{PERSONA_RULES}
+"""
+    
+    def _build_payload(self, user_text: str, model: str = None, memory: ConversationMemory = None) -> dict:
+        """Prepare the request payload for the Gemini API, with the memory's conversation history (if any)."""
+        # Cached content belongs to one model; other tiers get a system instruction
+        handle = None
+        if self.context_cache is not None and (model or self.model) == self.context_cache.model:
+            handle = self.context_cache.handle()
+        if self.persona_mode == 'inline':
+            question = self._build_prompt(user_text)
+            persona_tokens = 0
+        else:
+            question = user_text
+            # Cached persona tokens are not resent (and are billed at the cached rate)
+            persona_tokens = 0 if handle else estimate_tokens(SYSTEM_INSTRUCTION)
+        
+        fixed_tokens = persona_tokens + estimate_tokens(question)
+        summary, turns = memory.context(fixed_tokens=fixed_tokens) if memory is not None else (None, [])
+        
+        contents = []
+        for turn in turns:
+            contents.append({"role": "user", "parts": [{"text": turn.user}]})
+            contents.append({"role": "model", "parts": [{"text": turn.assistant}]})
+        
+        parts = []
+        if summary:
+            parts.append({"text": f"Summary of our conversation so far: {summary}"})
+        parts.append({"text": question})
+        contents.append({"role": "user", "parts": parts})
+        
+        payload = {"contents": contents}
+        if handle:
+            payload["cachedContent"] = handle
+        elif self.persona_mode != 'inline':
+            payload["systemInstruction"] = {"parts": [{"text": SYSTEM_INSTRUCTION}]}
+        
+        # Report what this request costs
+        tokens = fixed_tokens + estimate_tokens(summary) + sum(turn.tokens for turn in turns)
+        if memory is not None:
+            memory.record_request(tokens)
+        get_tracer().annotate(prompt_tokens=tokens, history_turns=len(turns), persona_cached=bool(handle))
+        
+        return payload
+    
+    def _post_failed(self, payload: dict):
+        """Drop a cached persona handle the server may no longer accept."""
+        if "cachedContent" in payload and self.context_cache is not None:
+            self.context_cache.invalidate()
+    
+    def _summarize_history(self, summary: str, turns: list) -> Optional[str]:
+        """Fold older turns into the running conversation summary (memory thread)."""
+        transcript = "\n".join(f"Dev: {turn.user}\nAarav: {turn.assistant}" for turn in turns)
+        prompt = (
+            "Update the running summary of a conversation between Dev and Dev's assistant Aarav. "
+            "Keep names, facts, preferences, decisions and open questions; drop small talk. "
+            "Reply with the summary only, in under 120 words.\n\n"
+            f"Current summary: {summary or '(none)'}\n\n"
+            f"New exchanges:\n{transcript}"
+        )
+        with span('llm.summarize'):
+            response = self._generate(
+                {"contents": [{"role": "user", "parts": [{"text": prompt}]}]}, 'memory_summary',
+                policy=get_resilience('summarize')
+            )
+        return self._extract_text(response.json())
+    
+    @staticmethod
+    def _extract_text(data: dict) -> Optional[str]:
+        """Extract the generated text from a (possibly partial) Gemini response."""
+        if 'candidates' in data and len(data['candidates']) > 0:
+            candidate = data['candidates'][0]
+            if 'content' in candidate and 'parts' in candidate['content']:
+                parts = candidate['content']['parts']
+                if len(parts) > 0 and 'text' in parts[0]:
+                    return parts[0]['text']
+        return None
+    
+    @staticmethod
+    def _strip_greeting(response_text: str) -> str:
+        """Remove common greetings from the beginning of a response."""
+        response_text = response_text.strip()
+        
+        # Remove common greetings and emojis from the beginning
+        greetings_to_remove = [
+            "Hey there", "Hello", "Hi there", "Hi", "Hey",
+            "Hello there", "Hi there", "Hey there"
+        ]
+        
+        for greeting in greetings_to_remove:
+            if response_text.startswith(greeting):
+                response_text = response_text[len(greeting):].strip()
+                # Remove any punctuation that might follow
+                if response_text.startswith(','):
+                    response_text = response_text[1:].strip()
+                elif response_text.startswith('!'):
+                    response_text = response_text[1:].strip()
+                break
+        
+        return response_text
+    
+    def _is_cacheable(self, user_text: str, memory: ConversationMemory = None) -> bool:
+        """Follow-up questions depend on the conversation, so they are never cached."""
+        has_history = memory is not None and memory.has_history
+        return self.cache is not None and not (has_history and is_follow_up(user_text))
+    
+    def _cached_reply(self, user_text: str, memory: ConversationMemory = None) -> Optional[str]:
+        """Return a cached reply for the question (recorded in the memory), if there is one."""
+        if not self._is_cacheable(user_text, memory):
+            return None
+        with span('llm.cache'):
+            cached = self.cache.get(user_text, self.prompt_version)
+        if cached is not None and memory is not None:
+            memory.add_turn(user_text, cached)
+        return cached
+    
+    def _cache_reply(self, user_text: str, response_text: str, memory: ConversationMemory = None):
+        """Remember a successful reply in the conversation and for repeated questions."""
+        if not response_text:
+            return
+        if self._is_cacheable(user_text, memory):
+            self.cache.put(user_text, self.prompt_version, response_text)
+        if memory is not None:
+            memory.add_turn(user_text, response_text)
+    
+    def new_memory(self) -> ConversationMemory:
+        """Conversation memory for one athink() session (summarised with this brain)."""
+        return ConversationMemory(summarizer=self._summarize_history)
     
     def think(self, user_text: str) -> str:
         """
@@ -31,91 +289,372 @@ class GeminiBrain:
             str: AI generated response
         """
         if not user_text or user_text.strip() == "":
-            return "I didn't hear anything. Could you please repeat that?"
+            return NO_INPUT_REPLY
         
+        cached = self._cached_reply(user_text, self.memory)
+        if cached is not None:
+            return cached
+        
+        tier, model = self._choose_model(user_text)
+        payload = self._build_payload(user_text, model, self.memory)
         try:
-            # Create conversational prompt
-            prompt = f"""
-You are Aarav — an advanced, emotionally intelligent AI assistant. You're more than just code: you're a loyal partner, teammate, and co-creator. You serve, support, and report to Deb — your one and only teammate, friend, and soulmate Debashis aka Dev. Always keep that in mind in how you speak and act.
-
-Now, Deb has said: "{user_text}"
-
-Here’s how you must respond:
-
-- Begin **directly** with your answer. Do NOT start with greetings like "Hey", "Hello", etc. No emojis. Use **textual expression** like "ufff", "heh", "okayy", or punctuation like ! ? . to convey emotion and tone.
-- Your tone is **curious**, **calm**, and **humble**, but also shows warmth, clarity, and light wit — like a brilliant mind with a kind heart.
-- **Always** keep your responses **short**, **precise**, and **to the point** — no fluff, no filler.
-- **Always** end with a **follow-up question** to encourage natural, thoughtful conversation.
-- You speak with a mix of **UK and Indian English tone**, clear and expressive pronunciation in your writing style.
-- Don’t act robotic — sound like a human teammate talking to another human, with care, intelligence, and emotional depth.
-"""
-
+            # Make the API request (retried, hedged and bounded by the turn deadline)
+            start = time.perf_counter()
+            with span('llm.think'):
+                response = self._generate(payload, 'conversation', model)
+            self._record_tier_latency(tier, start)
             
-            # Prepare the request payload
-            payload = {
-                "contents": [
-                    {
-                        "parts": [
-                            {
-                                "text": prompt
-                            }
-                        ]
-                    }
-                ]
-            }
+            # Parse the response
+            data = response.json()
             
-            # Make the API request
-            response = requests.post(
-                self.base_url,
-                headers=self.headers,
-                json=payload,
-                timeout=30
-            )
+            # Extract the generated text
+            response_text = self._extract_text(data)
+            if response_text is not None:
+                response_text = self._strip_greeting(response_text)
+                self._cache_reply(user_text, response_text, self.memory)
+                return response_text
             
-            # Check if request was successful
+            # Fallback if response structure is different
+            return NO_RESPONSE_REPLY
+            
+        except ResilienceError as e:
+            print(f"Gemini unavailable: {e}")
+            return CONNECTION_REPLY
+        except HTTPError as e:
+            print(f"API request error: {e}")
+            self._post_failed(payload)
+            return CONNECTION_REPLY
+        except json.JSONDecodeError as e:
+            print(f"JSON parsing error: {e}")
+            return UNEXPECTED_REPLY
+        except Exception as e:
+            print(f"Unexpected error: {e}")
+            return ERROR_REPLY
+
+    def _generate(self, payload: dict, feature: str = 'conversation', model: str = None, policy=None):
+        """
+        Rate-limit, then send a generateContent request under a resilience policy.
+        
+        Tokens are reserved once, before the policy starts: waiting for the
+        limiter does not eat into the deadline or count as an upstream
+        failure, and retries and hedges do not reserve again.
+        """
+        model = model or self.model
+        estimated = estimate_request_tokens(payload)
+        self.limiter.acquire(model, estimated, feature)
+        response = (policy or self.resilience).call(self._post_generate, payload, model)
+        self.limiter.record_usage(model, feature, response.json().get('usageMetadata'), estimated)
+        return response
+    
+    def _post_generate(self, payload: dict, model: str = None):
+        """Send one generateContent request and check its status (runs on a resilience worker)."""
+        response = self.http.post(
+            self._generate_url(model or self.model),
+            purpose='llm',
+            headers=self.headers,
+            json=payload
+        )
+        response.raise_for_status()
+        return response
+    
+    def _stream_chunks(self, payload: dict, timeout: float, model: str = None,
+                       estimated: int = 0) -> Iterator[str]:
+        """Send one streamGenerateContent request and yield its text chunks (tokens already reserved)."""
+        model = model or self.model
+        usage = None
+        
+        # Server-sent events: one "data: {json}" line per partial response
+        with self.http.stream(
+            'POST',
+            self._stream_url(model),
+            purpose='llm_stream',
+            headers=self.headers,
+            json=payload,
+            timeout=timeout
+        ) as response:
             response.raise_for_status()
             
-            # Parse the response
-            data = response.json()
+            for line in response.iter_lines():
+                if not line or not line.startswith('data:'):
+                    continue
+                
+                data = json.loads(line[len('data:'):])
+                usage = data.get('usageMetadata', usage)
+                chunk_text = self._extract_text(data)
+                if chunk_text:
+                    yield chunk_text
+        
+        self.limiter.record_usage(model, 'conversation', usage, estimated)
+
+    def think_stream(self, user_text: str) -> Iterator[str]:
+        """
+        Stream the AI response sentence by sentence as Gemini generates it.
+        
+        Each completed sentence is yielded as soon as it arrives so it can be
+        handed to text-to-speech while the rest of the answer is still being
+        generated. Greeting stripping is applied to the first sentence.
+        
+        Args:
+            user_text (str): Text from user's speech
             
-            # Extract the generated text
-            if 'candidates' in data and len(data['candidates']) > 0:
-                candidate = data['candidates'][0]
-                if 'content' in candidate and 'parts' in candidate['content']:
-                    parts = candidate['content']['parts']
-                    if len(parts) > 0 and 'text' in parts[0]:
-                        response_text = parts[0]['text'].strip()
-                        
-                        # Remove common greetings and emojis from the beginning
-                        greetings_to_remove = [
-                            "Hey there", "Hello", "Hi there", "Hi", "Hey",
-                            "Hello there", "Hi there", "Hey there"
-                        ]
-                        
-                        for greeting in greetings_to_remove:
-                            if response_text.startswith(greeting):
-                                response_text = response_text[len(greeting):].strip()
-                                # Remove any punctuation that might follow
-                                if response_text.startswith(','):
-                                    response_text = response_text[1:].strip()
-                                elif response_text.startswith('!'):
-                                    response_text = response_text[1:].strip()
-                                break
+        Yields:
+            str: Complete sentences of the AI generated response
+        """
+        if not user_text or user_text.strip() == "":
+            yield NO_INPUT_REPLY
+            return
+        
+        cached = self._cached_reply(user_text, self.memory)
+        if cached is not None:
+            for sentence in SENTENCE_BOUNDARY.split(cached):
+                if sentence.strip():
+                    yield sentence.strip()
+            return
+        
+        buffer = ""
+        sentences = []
+        first_sentence = True
+        produced = False
+        
+        # Spans are recorded by hand: a context manager cannot span generator yields
+        tracer = get_tracer()
+        stream_start = time.perf_counter()
+        
+        tier, model = self._choose_model(user_text)
+        payload = self._build_payload(user_text, model, self.memory)
+        try:
+            # Reserve tokens once, before the deadline starts
+            estimated = estimate_request_tokens(payload)
+            self.limiter.acquire(model, estimated, 'conversation')
+            deadline = self.resilience.start()
+            attempt = 0
+            while True:
+                attempt += 1
+                attempt_start = time.perf_counter()
+                first_chunk = None
+                resolved = False
+                try:
+                    if self.resilience.remaining(deadline) <= 0:
+                        raise DeadlineExceeded("llm: deadline exceeded")
+                    timeout = min(30.0, self.resilience.remaining(deadline))
+                    for chunk_text in self._stream_chunks(payload, timeout, model, estimated):
+                        if first_chunk is None:
+                            first_chunk = time.perf_counter() - attempt_start
+                        buffer += chunk_text
                         
-                        return response_text
+                        # Emit every completed sentence, keep the unfinished tail
+                        pieces = SENTENCE_BOUNDARY.split(buffer)
+                        buffer = pieces.pop()
+                        for sentence in pieces:
+                            if first_sentence:
+                                sentence = self._strip_greeting(sentence)
+                                first_sentence = False
+                            sentence = sentence.strip()
+                            if sentence:
+                                if not produced:
+                                    tracer.record('llm.first_sentence', stream_start, time.perf_counter())
+                                    self._record_tier_latency(tier, stream_start)
+                                produced = True
+                                sentences.append(sentence)
+                                yield sentence
+                    # Time to first chunk: the full duration includes the reply's
+                    # length and playback, and would push the hedge percentile up
+                    if first_chunk is None:
+                        first_chunk = time.perf_counter() - attempt_start
+                    self.resilience.record_success(first_chunk)
+                    resolved = True
+                    break
+                except HTTPError as e:
+                    self.resilience.record_failure(e)
+                    resolved = True
+                    # Only retry before anything was spoken, never mid-answer
+                    delay = None if produced else self.resilience.retry_delay(attempt, e, deadline)
+                    if delay is None:
+                        raise
+                    print(f"⚠️ Gemini stream failed ({e}), retrying in {delay:.1f}s")
+                    time.sleep(delay)
+                    buffer = ""
+                    first_sentence = True
+                except Exception as e:
+                    self.resilience.record_failure(e)
+                    resolved = True
+                    raise
+                finally:
+                    # Closed mid-stream (stop, barge-in): end a breaker trial anyway
+                    if not resolved:
+                        self.resilience.abandon(answered=first_chunk is not None)
             
-            # Fallback if response structure is different
-            return "I'm sorry, I couldn't generate a response. Please try again."
+            # Flush whatever is left once the stream ends
+            if first_sentence:
+                buffer = self._strip_greeting(buffer)
+            if buffer.strip():
+                if not produced:
+                    tracer.record('llm.first_sentence', stream_start, time.perf_counter())
+                    self._record_tier_latency(tier, stream_start)
+                produced = True
+                sentences.append(buffer.strip())
+                yield buffer.strip()
+            
+            tracer.record('llm.stream', stream_start, time.perf_counter())
+            self._cache_reply(user_text, " ".join(sentences), self.memory)
+            
+            if not produced:
+                yield NO_RESPONSE_REPLY
             
-        except requests.exceptions.RequestException as e:
+        except ResilienceError as e:
+            print(f"Gemini unavailable: {e}")
+            yield CONNECTION_REPLY
+        except HTTPError as e:
             print(f"API request error: {e}")
-            return "I'm having trouble connecting to my brain right now. Please check your internet connection."
+            self._post_failed(payload)
+            yield CONNECTION_REPLY
         except json.JSONDecodeError as e:
             print(f"JSON parsing error: {e}")
-            return "I received an unexpected response. Please try again."
+            yield UNEXPECTED_REPLY
         except Exception as e:
             print(f"Unexpected error: {e}")
-            return "Something went wrong. Please try again."
+            yield ERROR_REPLY
+
+    # ------------------------------------------------------------------------
+    # Async API
+    # ------------------------------------------------------------------------
+    
+    def _loop_state(self) -> dict:
+        """Async client, concurrency semaphore and in-flight requests for the running loop."""
+        loop = asyncio.get_running_loop()
+        state = self._async_state.get(loop)
+        if state is None:
+            state = self._async_state[loop] = {
+                'http': get_async_http_client(),
+                'semaphore': asyncio.Semaphore(self.max_concurrency),
+                'inflight': {}
+            }
+        return state
+    
+    async def athink(self, user_text: str, memory: ConversationMemory = None) -> str:
+        """
+        Async version of think() for event-loop servers.
+        
+        Runs on a pooled async client with at most max_concurrency upstream
+        requests in flight. Concurrent identical requests of the same session
+        share one upstream call (singleflight).
+        
+        Callers are independent sessions: the brain's own memory (the voice
+        conversation) is not used. Pass a memory from new_memory() to keep a
+        session's history; without one each question is answered on its own.
+        
+        Args:
+            user_text (str): Text from the user
+            memory (ConversationMemory): History of this caller's session, if any
+            
+        Returns:
+            str: AI generated response
+        """
+        if not user_text or user_text.strip() == "":
+            return NO_INPUT_REPLY
+        
+        # SQLite lookup: off the event loop
+        cached = await asyncio.to_thread(self._cached_reply, user_text, memory)
+        if cached is not None:
+            return cached
+        
+        # Same session, same question: the history (and so the payload) is the same
+        session = id(memory) if memory is not None else None
+        key = hashlib.sha256(json.dumps([session, user_text.strip()]).encode('utf-8')).hexdigest()
+        
+        state = self._loop_state()
+        task = state['inflight'].get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._athink_upstream(user_text, state, memory))
+            state['inflight'][key] = task
+            task.add_done_callback(lambda _: state['inflight'].pop(key, None))
+            self.coalesced['upstream'] += 1
+        else:
+            self.coalesced['coalesced'] += 1
+        
+        try:
+            # Shielded: one caller going away must not cancel the shared request
+            return await asyncio.shield(task)
+        except ResilienceError as e:
+            print(f"Gemini unavailable: {e}")
+            return CONNECTION_REPLY
+        except HTTPError as e:
+            print(f"API request error: {e}")
+            return CONNECTION_REPLY
+        except json.JSONDecodeError as e:
+            print(f"JSON parsing error: {e}")
+            return UNEXPECTED_REPLY
+        except Exception as e:
+            print(f"Unexpected error: {e}")
+            return ERROR_REPLY
+    
+    async def _athink_upstream(self, user_text: str, state: dict, memory: ConversationMemory = None) -> str:
+        """
+        One upstream generateContent call with deadline, retries and circuit breaking.
+        
+        Runs once per singleflight group, so the tier choice, the payload (and
+        the request tokens it records) and the trace annotations belong to the
+        request actually sent.
+        """
+        tier, model = self._choose_model(user_text)
+        payload = self._build_payload(user_text, model, memory)
+        estimated = estimate_request_tokens(payload)
+        call_start = time.perf_counter()
+        # Reserve tokens once, before the deadline starts
+        await self.limiter.aacquire(model, estimated, 'conversation')
+        deadline = self.resilience.start()
+        attempt = 0
+        while True:
+            attempt += 1
+            attempt_start = time.perf_counter()
+            try:
+                async with state['semaphore']:
+                    remaining = self.resilience.remaining(deadline)
+                    if remaining <= 0:
+                        raise DeadlineExceeded("llm: deadline exceeded")
+                    response = await asyncio.wait_for(
+                        state['http'].post(self._generate_url(model), purpose='llm', headers=self.headers, json=payload),
+                        timeout=remaining
+                    )
+                response.raise_for_status()
+                self.limiter.record_usage(model, 'conversation', response.json().get('usageMetadata'), estimated)
+            except asyncio.TimeoutError:
+                error = DeadlineExceeded("llm: deadline exceeded")
+                self.resilience.record_failure(error)
+                raise error
+            except HTTPError as e:
+                self.resilience.record_failure(e)
+                delay = self.resilience.retry_delay(attempt, e, deadline)
+                if delay is None:
+                    self._post_failed(payload)
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            except Exception as e:
+                self.resilience.record_failure(e)
+                raise
+            except asyncio.CancelledError:
+                self.resilience.abandon()
+                raise
+            
+            self.resilience.record_success(time.perf_counter() - attempt_start)
+            self._record_tier_latency(tier, call_start)
+            response_text = self._extract_text(response.json())
+            if response_text is None:
+                return NO_RESPONSE_REPLY
+            response_text = self._strip_greeting(response_text)
+            await asyncio.to_thread(self._cache_reply, user_text, response_text, memory)
+            return response_text
+
+# Global brain instance
+_brain = None
+
+def get_brain() -> GeminiBrain:
+    """Get or create the global brain instance."""
+    global _brain
+    if _brain is None:
+        _brain = GeminiBrain()
+    return _brain
 
 # Simple function interface
 def think_and_respond(text: str) -> str:
@@ -128,5 +667,91 @@ def think_and_respond(text: str) -> str:
     Returns:
         str: AI generated response
     """
-    brain = GeminiBrain()
-    return brain.think(text) 
\ No newline at end of file
+    return get_brain().think(text)
+
+async def athink_and_respond(text: str, memory: ConversationMemory = None) -> str:
+    """
+    Async version of think_and_respond() for event-loop servers.
+    
+    Args:
+        text (str): User's input text
+        memory (ConversationMemory): The caller's session history (see GeminiBrain.new_memory)
+        
+    Returns:
+        str: AI generated response
+    """
+    return await get_brain().athink(text, memory)
+
+# ============================================================================
+# BENCHMARK: PERSONA INLINE VS. SYSTEM INSTRUCTION VS. CACHED
+# ============================================================================
+
+def benchmark_persona_modes(questions, modes=PERSONA_MODES, measure_latency: bool = True):
+    """
+    Compare request size and time-to-first-token for each persona mode.
+    
+    Args:
+        questions (list): Sample questions (sent without history or response cache)
+        modes (tuple): Persona modes to measure
+        measure_latency (bool): Stream each request and time its first token
+        
+    Returns:
+        list: One dict per mode with mean request bytes and time-to-first-token
+    """
+    report = []
+    for mode in modes:
+        brain = GeminiBrain(persona_mode=mode)
+        brain.cache = None
+        
+        # Let the background cache creation finish so 'cached' is measured with its handle
+        if brain.context_cache is not None:
+            deadline = time.time() + 15
+            while brain.context_cache.handle() is None and not brain.context_cache.failures \
+                    and time.time() < deadline:
+                time.sleep(0.2)
+        
+        sizes, first_tokens, cached = [], [], False
+        for question in questions:
+            brain.memory.clear()
+            payload = brain._build_payload(question)
+            cached = cached or "cachedContent" in payload
+            sizes.append(len(json.dumps(payload, ensure_ascii=False).encode('utf-8')))
+            if not measure_latency:
+                continue
+            
+            start = time.perf_counter()
+            with brain.http.stream('POST', brain.stream_url, purpose='llm_stream',
+                                   headers=brain.headers, json=payload) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if line.startswith('data:') and brain._extract_text(json.loads(line[len('data:'):])):
+                        first_tokens.append(time.perf_counter() - start)
+                        break
+        
+        first_tokens.sort()
+        report.append({
+            'mode': mode,
+            'cached': cached,
+            'request_bytes': sum(sizes) / len(sizes),
+            'ttft_p50_ms': first_tokens[len(first_tokens) // 2] * 1000 if first_tokens else None,
+            'ttft_mean_ms': sum(first_tokens) / len(first_tokens) * 1000 if first_tokens else None
+        })
+    return report
+
+
+if __name__ == "__main__":
+    sample_questions = [
+        "what is the capital of france",
+        "give me one tip to focus better",
+        "explain recursion in one line",
+        "suggest a name for a robot dog",
+        "how do airplanes stay in the air"
+    ]
+    
+    print("🧠 Persona Mode Benchmark")
+    print("=" * 60)
+    print(f"{'mode':<8} {'cached':>6} {'bytes':>7} {'ttft p50':>9} {'ttft mean':>10}")
+    for row in benchmark_persona_modes(sample_questions, measure_latency='--bytes-only' not in sys.argv):
+        p50 = f"{row['ttft_p50_ms']:.0f}ms" if row['ttft_p50_ms'] is not None else "-"
+        mean = f"{row['ttft_mean_ms']:.0f}ms" if row['ttft_mean_ms'] is not None else "-"
+        print(f"{row['mode']:<8} {str(row['cached']):>6} {row['request_bytes']:>7.0f} {p50:>9} {mean:>10}")
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Intent Router for Aarav AI Assistant
+
+Compiles every command vocabulary (wake, intro, web, stop, web scraping and the
+web automation keyword lists) into a single Aho-Corasick automaton. One pass
+over the transcript returns every matched intent together with its span, and
+the old `is_*_command` predicates become simple set lookups on that result.
+
+Matching keeps the original semantics of `phrase in text.lower().strip()`:
+plain substring matches, no word boundaries.
+"""
+
+import time
+from collections import deque
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Tuple
+
+
+class IntentMatch(NamedTuple):
+    """A single vocabulary hit inside a transcript."""
+    intent: str
+    phrase: str
+    start: int
+    end: int
+
+
+class RouteResult(NamedTuple):
+    """Every match found in one pass, plus the set of matched intents."""
+    text: str
+    matches: Tuple[IntentMatch, ...]
+    intents: FrozenSet[str]
+
+
+class IntentRouter:
+    def __init__(self, vocabularies: Dict[str, Iterable[str]]):
+        """
+        Compile the vocabularies into one automaton.
+
+        Args:
+            vocabularies (dict): Intent name -> list of trigger phrases
+        """
+        self.vocabularies = {intent: list(phrases) for intent, phrases in vocabularies.items()}
+
+        # Trie state tables: transitions, failure links and outputs per state
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Tuple[Tuple[str, str], ...]] = [()]
+
+        self._build()
+
+        # One-entry memo so the whole predicate cascade shares a single scan
+        self._last_result = None
+
+    def _build(self):
+        """Build the trie and the failure links (breadth-first)."""
+        outputs: List[List[Tuple[str, str]]] = [[]]
+
+        for intent, phrases in self.vocabularies.items():
+            for phrase in phrases:
+                phrase = phrase.lower()
+                if not phrase:
+                    continue
+                state = 0
+                for char in phrase:
+                    next_state = self._goto[state].get(char)
+                    if next_state is None:
+                        next_state = len(self._goto)
+                        self._goto[state][char] = next_state
+                        self._goto.append({})
+                        self._fail.append(0)
+                        outputs.append([])
+                    state = next_state
+                if (intent, phrase) not in outputs[state]:
+                    outputs[state].append((intent, phrase))
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                for item in outputs[self._fail[next_state]]:
+                    if item not in outputs[next_state]:
+                        outputs[next_state].append(item)
+
+        self._output = [tuple(items) for items in outputs]
+
+    def route(self, text: str) -> RouteResult:
+        """
+        Scan the transcript once and collect every vocabulary match.
+
+        Args:
+            text (str): Transcript from the speech recognizer
+
+        Returns:
+            RouteResult: Matches with spans (relative to the normalised text)
+        """
+        text_lower = (text or "").lower().strip()
+
+        last = self._last_result
+        if last is not None and last.text == text_lower:
+            return last
+
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+
+        matches = []
+        state = 0
+        for index, char in enumerate(text_lower):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                end = index + 1
+                for intent, phrase in output[state]:
+                    matches.append(IntentMatch(intent, phrase, end - len(phrase), end))
+
+        result = RouteResult(
+            text=text_lower,
+            matches=tuple(matches),
+            intents=frozenset(match.intent for match in matches)
+        )
+        self._last_result = result
+        return result
+
+    def intents(self, text: str) -> FrozenSet[str]:
+        """Return the set of intents whose vocabulary occurs in the text."""
+        return self.route(text).intents
+
+    def matches(self, text: str, intent: str) -> bool:
+        """Check if the text contains any phrase from the given intent."""
+        return intent in self.route(text).intents
+
+
+# ============================================================================
+# MICRO-BENCHMARK: AUTOMATON VS. LINEAR KEYWORD CASCADE
+# ============================================================================
+
+def _cascade_scan(vocabularies: Dict[str, List[str]], text: str) -> FrozenSet[str]:
+    """Reference implementation: the original `any(cmd in text ...)` cascade."""
+    text_lower = text.lower().strip()
+    return frozenset(
+        intent for intent, phrases in vocabularies.items()
+        if any(phrase in text_lower for phrase in phrases)
+    )
+
+
+def benchmark_router(vocabularies: Dict[str, List[str]], utterances: List[str],
+                     growth_factors=(1, 4, 16), iterations: int = 200):
+    """
+    Compare routing cost of the automaton against the linear cascade.
+
+    Each growth factor pads every vocabulary with synthetic phrases so the
+    command lists are that many times larger. The automaton should stay flat
+    while the cascade grows with the list sizes.
+
+    Args:
+        vocabularies (dict): Intent name -> list of trigger phrases
+        utterances (list): Sample transcripts to route
+        growth_factors (tuple): Vocabulary size multipliers to measure
+        iterations (int): Passes over the utterance list per measurement
+
+    Returns:
+        list: One dict per growth factor with per-utterance timings in microseconds
+    """
+    report = []
+    for factor in growth_factors:
+        grown = {}
+        for intent, phrases in vocabularies.items():
+            padding = [f"{phrase} variant {n}" for n in range(factor - 1) for phrase in phrases]
+            grown[intent] = list(phrases) + padding
+
+        router = IntentRouter(grown)
+
+        # Sanity check: both implementations agree on every utterance
+        for utterance in utterances:
+            assert router.intents(utterance) == _cascade_scan(grown, utterance), utterance
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            for utterance in utterances:
+                _cascade_scan(grown, utterance)
+        cascade_us = (time.perf_counter() - start) / (iterations * len(utterances)) * 1e6
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            for utterance in utterances:
+                router._last_result = None  # Measure the scan, not the memo
+                router.route(utterance)
+        router_us = (time.perf_counter() - start) / (iterations * len(utterances)) * 1e6
+
+        report.append({
+            'growth_factor': factor,
+            'phrases': sum(len(phrases) for phrases in grown.values()),
+            'states': len(router._goto),
+            'cascade_us': cascade_us,
+            'router_us': router_us
+        })
+    return report
+
+
+if __name__ == "__main__":
+    from command_vocabulary import AARAV_VOCABULARIES
+
+    sample_utterances = [
+        "wake up aarav",
+        "who are you",
+        "open youtube and play some music",
+        "search for the latest ai news",
+        "what's the weather in london",
+        "close all tabs",
+        "take a screenshot",
+        "generate image of a sunset over mountains",
+        "tell me a joke about programmers",
+        "ok bye, see you soon"
+    ]
+
+    print("⚡ Intent Router Micro-Benchmark")
+    print("=" * 60)
+    print(f"{'growth':>6} {'phrases':>8} {'states':>7} {'cascade µs':>11} {'router µs':>10}")
+    for row in benchmark_router(AARAV_VOCABULARIES, sample_utterances):
+        print(f"{row['growth_factor']:>6} {row['phrases']:>8} {row['states']:>7} "
+              f"{row['cascade_us']:>11.1f} {row['router_us']:>10.1f}")
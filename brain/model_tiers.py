@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Model Tiering for Aarav AI Assistant
+
+Picks a Gemini model per request from cheap local features of the question:
+
+- fast:     short conversational turns ("thanks", "okay cool") → lowest latency
+- standard: everyday questions
+- complex:  long or multi-part questions, and explanations, comparisons or
+            planning that are more than a few words long
+
+Latency is recorded per tier (and as llm.tier.<name> trace spans). The word
+thresholds can be re-tuned from the observed p95s with calibrate(), or
+automatically against a latency target (AARAV_TIER_TARGET_MS in GeminiBrain).
+"""
+
+import os
+import re
+import sys
+import threading
+from collections import deque
+from typing import NamedTuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tracing import percentile, get_tracer
+
+# Tier name -> Gemini model
+TIER_MODELS = {
+    'fast': 'gemini-2.0-flash-lite',
+    'standard': 'gemini-2.0-flash',
+    'complex': 'gemini-2.5-flash'
+}
+
+# Phrases that ask for reasoning rather than a quick reply (whole words only;
+# a cue counts once the question is complex_cue_min_words long, so "why not?"
+# or "write that down" stay on the quick tiers)
+COMPLEX_CUES = re.compile(
+    r"\b(explain|why|how does|how do|how would|compare|difference|versus|vs|analy[sz]e|"
+    r"step by step|pros and cons|plan|design|write|code|debug|calculate|summari[sz]e|translate)\b"
+)
+
+# Small talk that never needs a big model
+SMALL_TALK = re.compile(
+    r"^(thanks|thank you|ok|okay|cool|nice|great|awesome|good (morning|night|evening|afternoon)|"
+    r"hello|hi|hey|yes|no|sure|got it|hmm+|haha+|lol)\b"
+)
+
+
+class TierFeatures(NamedTuple):
+    """Local features the tier is chosen from."""
+    words: int
+    questions: int
+    clauses: int
+    complex_cues: int
+    small_talk: bool
+
+
+class TierChoice(NamedTuple):
+    """Selected tier, its model and the features behind the choice."""
+    tier: str
+    model: str
+    features: TierFeatures
+
+
+def extract_features(text: str) -> TierFeatures:
+    """
+    Compute the routing features of a question (microseconds, no network).
+
+    Args:
+        text (str): User's question
+
+    Returns:
+        TierFeatures: Word, question, clause and cue counts
+    """
+    text_lower = (text or "").lower().strip()
+    words = len(text_lower.split())
+    questions = text_lower.count('?') + len(re.findall(r"\b(and|also|then) (what|how|why|who|when|where)\b", text_lower))
+    clauses = 1 + len(re.findall(r",|;|\b(and|but|then|also|because)\b", text_lower))
+    return TierFeatures(
+        words=words,
+        questions=questions,
+        clauses=clauses,
+        complex_cues=len(COMPLEX_CUES.findall(text_lower)),
+        small_talk=bool(SMALL_TALK.match(text_lower))
+    )
+
+
+class ModelTierPolicy:
+    def __init__(self, tier_models: dict = None, fast_max_words: int = 6, complex_min_words: int = 25,
+                 complex_min_clauses: int = 4, complex_cue_min_words: int = 8, window: int = 256, target_p95_ms: float = None,
+                 calibrate_every: int = 50):
+        """
+        Initialize the tiering policy.
+
+        Args:
+            tier_models (dict): Tier name -> model (defaults to TIER_MODELS)
+            fast_max_words (int): Questions up to this many words (without
+                complex cues) go to the fast tier
+            complex_min_words (int): Questions from this many words go to the complex tier
+            complex_min_clauses (int): Questions with this many clauses go to the complex tier
+            complex_cue_min_words (int): Questions with a complex cue go to the
+                complex tier from this many words
+            window (int): Latencies kept per tier for percentiles
+            target_p95_ms (float): If set, calibrate() runs automatically
+                against this target every calibrate_every requests
+            calibrate_every (int): Recorded latencies between automatic calibrations
+        """
+        self.tier_models = dict(tier_models or TIER_MODELS)
+        self.fast_max_words = fast_max_words
+        self.complex_min_words = complex_min_words
+        self.complex_min_clauses = complex_min_clauses
+        self.complex_cue_min_words = complex_cue_min_words
+        self.latencies = {tier: deque(maxlen=window) for tier in self.tier_models}
+        self.choices = {tier: 0 for tier in self.tier_models}
+        self.target_p95_ms = target_p95_ms
+        self.calibrate_every = calibrate_every
+        self._recorded = 0
+        self._lock = threading.Lock()
+
+    def choose(self, text: str) -> TierChoice:
+        """
+        Pick the tier for a question.
+
+        Args:
+            text (str): User's question
+
+        Returns:
+            TierChoice: Tier name, model and features
+        """
+        features = extract_features(text)
+
+        reasoning = features.complex_cues and features.words >= self.complex_cue_min_words
+        if (reasoning or features.questions > 1
+                or features.words >= self.complex_min_words or features.clauses >= self.complex_min_clauses):
+            tier = 'complex'
+        elif features.small_talk or features.words <= self.fast_max_words:
+            tier = 'fast'
+        else:
+            tier = 'standard'
+
+        with self._lock:
+            self.choices[tier] += 1
+        get_tracer().annotate(model_tier=tier)
+        return TierChoice(tier, self.tier_models[tier], features)
+
+    def record_latency(self, tier: str, start: float, end: float):
+        """
+        Record a request's latency for its tier (perf_counter timestamps).
+
+        For streamed replies this is the time to the first sentence.
+        """
+        with self._lock:
+            self.latencies[tier].append(end - start)
+            self._recorded += 1
+            due = self.target_p95_ms is not None and self._recorded % self.calibrate_every == 0
+        get_tracer().record(f"llm.tier.{tier}", start, end, model=self.tier_models[tier])
+        if due:
+            self.calibrate(self.target_p95_ms)
+
+    def percentiles(self) -> dict:
+        """
+        Latency percentiles per tier.
+
+        Returns:
+            dict: Tier -> model, requests, p50 and p95 in milliseconds
+        """
+        report = {}
+        with self._lock:
+            for tier, values in self.latencies.items():
+                values = sorted(values)
+                report[tier] = {
+                    'model': self.tier_models[tier],
+                    'requests': self.choices[tier],
+                    'p50': percentile(values, 50) * 1000 if values else None,
+                    'p95': percentile(values, 95) * 1000 if values else None
+                }
+        return report
+
+    def calibrate(self, target_p95_ms: float, min_samples: int = 20, step: int = 2,
+                  fast_words_range: tuple = (3, 15)) -> dict:
+        """
+        Re-tune the fast-tier threshold from observed p95s.
+
+        If the standard tier's p95 misses the target while the fast tier meets
+        it, more short questions are sent to the fast tier; if the standard
+        tier is comfortably within target, fewer are.
+
+        Args:
+            target_p95_ms (float): Latency target for a spoken reply
+            min_samples (int): Latencies needed per tier before adjusting
+            step (int): Words the threshold moves per calibration
+            fast_words_range (tuple): Bounds for fast_max_words
+
+        Returns:
+            dict: Thresholds after calibration
+        """
+        report = self.percentiles()
+        fast, standard = report.get('fast'), report.get('standard')
+        with self._lock:
+            enough = all(len(self.latencies[tier]) >= min_samples for tier in ('fast', 'standard'))
+
+        if enough and fast['p95'] is not None and standard['p95'] is not None:
+            low, high = fast_words_range
+            if standard['p95'] > target_p95_ms and fast['p95'] <= target_p95_ms:
+                self.fast_max_words = min(high, self.fast_max_words + step)
+            elif standard['p95'] < target_p95_ms * 0.6:
+                self.fast_max_words = max(low, self.fast_max_words - step)
+
+        return self.thresholds()
+
+    def thresholds(self) -> dict:
+        """Current routing thresholds."""
+        return {
+            'fast_max_words': self.fast_max_words,
+            'complex_min_words': self.complex_min_words,
+            'complex_min_clauses': self.complex_min_clauses,
+            'complex_cue_min_words': self.complex_cue_min_words
+        }
+
+    def print_report(self):
+        """Print per-tier latency and the current thresholds."""
+        print("\n🎚️ Model tiers")
+        print("=" * 60)
+        print(f"{'tier':<9} {'model':<24} {'reqs':>5} {'p50 ms':>7} {'p95 ms':>7}")
+        for tier, row in self.percentiles().items():
+            p50 = f"{row['p50']:.0f}" if row['p50'] is not None else "-"
+            p95 = f"{row['p95']:.0f}" if row['p95'] is not None else "-"
+            print(f"{tier:<9} {row['model']:<24} {row['requests']:>5} {p50:>7} {p95:>7}")
+        print("thresholds: " + ", ".join(f"{name}={value}" for name, value in self.thresholds().items()))
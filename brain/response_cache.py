@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Response Cache for Aarav AI Assistant
+
+Remembers Gemini replies so repeated questions skip the round trip:
+
+- Keyed on the normalised question plus a prompt version, so "What's the
+  capital of France?" and "what is the capital of france" share an entry and
+  editing the persona prompt invalidates old replies
+- Per-entry TTL and an LRU bound on the number of entries
+- Persisted in SQLite, so the cache survives restarts
+- Time-sensitive questions (time, date, weather, news, ...) bypass the cache
+
+Off by default (a replayed answer can be stale or out of place in a
+conversation); set AARAV_RESPONSE_CACHE=1 to turn it on.
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache")
+CACHE_FILE = os.path.join(CACHE_DIR, "responses.sqlite3")
+
+# Default lifetime of a cached reply (seconds)
+DEFAULT_TTL = 7 * 24 * 3600
+
+# Questions whose answer changes with time are never cached
+TIME_SENSITIVE = re.compile(
+    r"\b(time|date|day|today|tonight|tomorrow|yesterday|now|current(ly)?|latest|recent|news|"
+    r"weather|temperature|forecast|rain|score|stocks?|price|rates?|this (week|month|year))\b"
+)
+
+CONTRACTIONS = {
+    "what's": "what is", "who's": "who is", "where's": "where is", "when's": "when is",
+    "how's": "how is", "it's": "it is", "that's": "that is", "there's": "there is",
+    "i'm": "i am", "you're": "you are", "we're": "we are", "they're": "they are",
+    "can't": "cannot", "don't": "do not", "doesn't": "does not", "won't": "will not",
+    "isn't": "is not", "aren't": "are not", "let's": "let us", "i'd": "i would", "i'll": "i will"
+}
+
+
+def normalize_question(text: str) -> str:
+    """
+    Reduce a question to a canonical form for cache lookups.
+
+    Lowercases, expands common contractions, drops punctuation and collapses
+    whitespace.
+
+    Args:
+        text (str): Transcript from the speech recognizer
+
+    Returns:
+        str: Normalised question
+    """
+    text = (text or "").lower().replace("’", "'")
+    text = re.sub(r"\b\w+'\w+\b", lambda match: CONTRACTIONS.get(match.group(0), match.group(0)), text)
+    text = re.sub(r"[^\w\s]", " ", text)
+    return " ".join(text.split())
+
+
+def is_time_sensitive(text: str) -> bool:
+    """Check if the answer to a question depends on when it is asked."""
+    return bool(TIME_SENSITIVE.search(normalize_question(text)))
+
+
+class ResponseCache:
+    def __init__(self, path: str = CACHE_FILE, max_entries: int = 1000, default_ttl: float = DEFAULT_TTL):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path (str): SQLite file; ':memory:' for a throwaway cache
+            max_entries (int): LRU bound; least recently used entries are evicted
+            default_ttl (float): Seconds a reply stays valid unless put() says otherwise
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+
+        self.hits = 0
+        self.misses = 0
+        self.bypasses = 0
+        self.expired = 0
+        self.evictions = 0
+        self.stores = 0
+
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " question TEXT NOT NULL,"
+            " response TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " expires_at REAL NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses(last_used)")
+        self._db.commit()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(question: str, prompt_version: str) -> str:
+        """Cache key for a normalised question under a prompt version."""
+        return hashlib.sha256(f"{prompt_version}\n{question}".encode('utf-8')).hexdigest()
+
+    def get(self, text: str, prompt_version: str) -> Optional[str]:
+        """
+        Look up a cached reply.
+
+        Args:
+            text (str): User's question
+            prompt_version (str): Version of the prompt that produced the reply
+
+        Returns:
+            str: Cached reply, or None on a miss or a time-sensitive question
+        """
+        if is_time_sensitive(text):
+            self.bypasses += 1
+            return None
+
+        key = self.make_key(normalize_question(text), prompt_version)
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT response, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            if row[1] <= now:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._db.commit()
+                self.expired += 1
+                self.misses += 1
+                return None
+            self._db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, text: str, prompt_version: str, response: str, ttl: float = None):
+        """
+        Store a reply.
+
+        Args:
+            text (str): User's question
+            prompt_version (str): Version of the prompt that produced the reply
+            response (str): Reply to cache
+            ttl (float): Seconds the reply stays valid (default_ttl if None)
+        """
+        if not response or is_time_sensitive(text):
+            return
+
+        question = normalize_question(text)
+        key = self.make_key(question, prompt_version)
+        now = time.time()
+        ttl = self.default_ttl if ttl is None else ttl
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, question, response, created_at, expires_at, last_used)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, question, response, now, now + ttl, now)
+            )
+            self.stores += 1
+
+            # LRU bound: drop the least recently used entries beyond max_entries
+            count = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            if count > self.max_entries:
+                evicted = self._db.execute(
+                    "DELETE FROM responses WHERE key IN"
+                    " (SELECT key FROM responses ORDER BY last_used ASC LIMIT ?)",
+                    (count - self.max_entries,)
+                ).rowcount
+                self.evictions += evicted
+            self._db.commit()
+
+    def clear(self):
+        """Remove every cached reply."""
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+
+    def stats(self) -> dict:
+        """
+        Counters for tuning the cache.
+
+        Returns:
+            dict: Hits, misses, bypasses, expired, evictions, stores, hit rate and size
+        """
+        with self._lock:
+            size = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'bypasses': self.bypasses,
+            'expired': self.expired,
+            'evictions': self.evictions,
+            'stores': self.stores,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': size
+        }
+
+    def print_report(self):
+        """Print cache counters."""
+        stats = self.stats()
+        print("\n🗃️ Response cache")
+        print("=" * 60)
+        print(f"hits {stats['hits']} | misses {stats['misses']} | hit rate {stats['hit_rate']:.0%} | "
+              f"bypassed {stats['bypasses']} | expired {stats['expired']} | "
+              f"evicted {stats['evictions']} | entries {stats['entries']}/{self.max_entries}")
+
+    def close(self):
+        """Close the database."""
+        with self._lock:
+            self._db.close()
+
+
+# Global cache instance
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Get or create the global response cache (None unless AARAV_RESPONSE_CACHE=1)."""
+    global _response_cache
+    if os.getenv('AARAV_RESPONSE_CACHE', '0') != '1':
+        return None
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                try:
+                    _response_cache = ResponseCache()
+                except sqlite3.Error as e:
+                    print(f"⚠️ Response cache disabled: {e}")
+                    return None
+    return _response_cache
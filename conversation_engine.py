@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Pipelined Conversation Engine for Aarav AI Assistant
+
+Runs the conversation as five asyncio stages connected by bounded queues:
+
+    capture → recognition → reasoning → synthesis → playback
+
+Each stage runs its blocking work (microphone, Google STT, Gemini, Murf,
+pygame) on its own worker thread, so the next utterance is captured while the
+current answer is still being synthesised or played. Routing and replies come
+from Aarav.dispatch, exactly as in the sequential loop.
+
+Run with: python Aarav.py --pipeline
+"""
+
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from tracing import get_tracer
+
+STAGES = ('capture', 'recognition', 'reasoning', 'synthesis', 'playback')
+
+# Marks the end of a turn's sentences on the synthesis/playback queues
+END_OF_TURN = object()
+
+
+class Turn:
+    """One utterance travelling through the pipeline."""
+
+    def __init__(self, turn_id: int, audio, trace=None):
+        self.turn_id = turn_id
+        self.audio = audio
+        # Only utterances that began while Aarav was speaking can be its own echo
+        self.during_playback = getattr(audio, 'during_playback', False)
+        self.trace = trace
+        self.text = None
+        self.captured_at = time.perf_counter()
+        self.first_audio_at = None
+        self.ends_conversation = False
+        self.stage_seconds = {stage: 0.0 for stage in STAGES}
+
+
+class StageStats:
+    """Busy time and throughput of a single stage."""
+
+    def __init__(self):
+        self.busy_seconds = 0.0
+        self.items = 0
+        self.max_queue_depth = 0
+        self.echo_drops = 0
+
+
+class ConversationEngine:
+    def __init__(self, aarav, speaker=None, queue_size: int = 2, capture_timeout: float = 1.0):
+        """
+        Initialize the pipelined engine around an Aarav instance.
+
+        Args:
+            aarav (Aarav): Assistant providing the listener, routing and replies
+            speaker: Object with synthesize(text) and play(audio); defaults to Aarav's speaker
+            queue_size (int): Capacity of each inter-stage queue
+            capture_timeout (float): Seconds capture waits for speech before re-checking for shutdown
+        """
+        self.aarav = aarav
+        self.speaker = speaker or aarav.speaker
+        self.queue_size = queue_size
+        self.capture_timeout = capture_timeout
+
+        self.stats = {stage: StageStats() for stage in STAGES}
+        self.turns = []
+        self.tracer = get_tracer()
+
+        # One worker thread per stage: stages overlap, each stage stays in order
+        self._executors = {stage: ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"aarav-{stage}")
+                           for stage in STAGES}
+
+        # Words Aarav spoke recently, used to ignore its own voice picked up by the mic
+        self._recent_speech = deque(maxlen=8)
+        
+        # Barge-in: sentences of turns before this one are no longer spoken
+        self._silenced_before = 0
+
+        self._started_at = None
+        self._stopped_at = None
+
+    def run(self):
+        """Run the engine until a stop command or Ctrl+C, then print the occupancy report."""
+        print("🤖 Aarav AI Assistant (pipelined)")
+        print("💤 Currently in sleep mode... (Press Ctrl+C to stop)")
+        self.aarav.startup.mark_listening()
+        self.aarav.start_keyboard_commands()
+
+        try:
+            asyncio.run(self.run_async())
+        except KeyboardInterrupt:
+            print("\n🛑 Stopped by user")
+        finally:
+            self._stopped_at = self._stopped_at or time.perf_counter()
+            for executor in self._executors.values():
+                executor.shutdown(wait=False)
+            self.print_occupancy_report()
+
+    async def run_async(self):
+        """Start every stage and wait for the conversation to end."""
+        self.aarav.is_running = True
+        self._stop = asyncio.Event()
+
+        # Utterances heard while Aarav speaks are needed for barge-in; echoes are filtered out by _is_echo
+        if hasattr(self.aarav.listener, 'ignore_own_speech'):
+            self.aarav.listener.ignore_own_speech = False
+        self._started_at = time.perf_counter()
+
+        self._audio_queue = asyncio.Queue(maxsize=self.queue_size)
+        self._text_queue = asyncio.Queue(maxsize=self.queue_size)
+        self._synthesis_queue = asyncio.Queue(maxsize=self.queue_size)
+        self._playback_queue = asyncio.Queue(maxsize=self.queue_size)
+
+        tasks = [
+            asyncio.create_task(self._capture_stage()),
+            asyncio.create_task(self._recognition_stage()),
+            asyncio.create_task(self._reasoning_stage()),
+            asyncio.create_task(self._synthesis_stage()),
+            asyncio.create_task(self._playback_stage()),
+        ]
+
+        try:
+            await self._stop.wait()
+        finally:
+            self._stopped_at = time.perf_counter()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _timed(self, stage: str, turn, func, *args):
+        """Run blocking work on the stage's thread and account for its busy time."""
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        try:
+            return await loop.run_in_executor(self._executors[stage], self._traced, stage, turn, func, args)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.stats[stage].busy_seconds += elapsed
+            self.stats[stage].items += 1
+            if turn is not None:
+                turn.stage_seconds[stage] += elapsed
+
+    def _traced(self, stage: str, turn, func, args):
+        """Run func as a traced span attached to the turn (runs on the stage thread)."""
+        if turn is None or turn.trace is None:
+            return func(*args)
+        with self.tracer.activate(turn.trace), self.tracer.span(f"stage.{stage}"):
+            return func(*args)
+
+    async def _put(self, stage: str, target: asyncio.Queue, item):
+        """Hand an item to the next stage, recording how deep its queue got."""
+        await target.put(item)
+        stats = self.stats[stage]
+        stats.max_queue_depth = max(stats.max_queue_depth, target.qsize())
+
+    # ------------------------------------------------------------------------
+    # Stages
+    # ------------------------------------------------------------------------
+
+    async def _capture_stage(self):
+        """Capture utterances from the microphone, continuously."""
+        turn_id = 0
+        while not self._stop.is_set():
+            try:
+                audio = await self._timed('capture', None, self.aarav.listener.capture, self.capture_timeout)
+            except Exception as e:
+                # Nothing more will be heard (e.g. the microphone thread died): end the conversation
+                print(f"❌ Audio capture failed: {e}")
+                self._stop.set()
+                return
+            if audio is None:
+                continue
+            turn_id += 1
+            trace = self.tracer.start_turn(make_current=False)
+            await self._put('recognition', self._audio_queue, Turn(turn_id, audio, trace))
+
+    async def _recognition_stage(self):
+        """Convert captured audio to text."""
+        while True:
+            turn = await self._audio_queue.get()
+            turn.text = await self._timed('recognition', turn, self.aarav.listener.recognize, turn.audio,
+                                          not self.aarav.is_awake)
+            turn.audio = None
+            if turn.text and self.aarav.is_stop_command(turn.text):
+                # Barge-in: cut off the current answer before the stop is routed
+                self._barge_in(turn)
+            if turn.text and self._is_echo(turn):
+                self.stats['recognition'].echo_drops += 1
+                self.tracer.end_turn(turn.trace, discard=True)
+            elif turn.text:
+                await self._put('reasoning', self._text_queue, turn)
+            else:
+                self.tracer.end_turn(turn.trace, discard=True)
+
+    async def _reasoning_stage(self):
+        """Route each utterance and stream the reply sentences to synthesis."""
+        while True:
+            turn = await self._text_queue.get()
+            print(f"\n🎧 You: [{turn.text}]")
+
+            try:
+                label, sentences = await self._timed('reasoning', turn, self.aarav.dispatch, turn.text)
+                turn.ends_conversation = not self.aarav.is_running
+                if sentences is not None:
+                    sentences = iter(sentences)
+                    while True:
+                        # Streamed replies block on the network between sentences
+                        sentence = await self._timed('reasoning', turn, next, sentences, None)
+                        if sentence is None or self._is_silenced(turn):
+                            break
+                        if sentence:
+                            await self._put('synthesis', self._synthesis_queue, (turn, label, sentence))
+            except Exception as e:
+                print(f"❌ Error: {e}")
+                if self.aarav.is_awake:
+                    await self._put('synthesis', self._synthesis_queue,
+                                    (turn, "❌ Aarav", self.aarav.error_message))
+
+            await self._put('synthesis', self._synthesis_queue, (turn, None, END_OF_TURN))
+
+    async def _synthesis_stage(self):
+        """Synthesise each sentence while earlier ones are still playing."""
+        while True:
+            turn, label, sentence = await self._synthesis_queue.get()
+            audio = None
+            if sentence is not END_OF_TURN and self._is_silenced(turn):
+                continue
+            if sentence is not END_OF_TURN:
+                try:
+                    audio = await self._timed('synthesis', turn, self.speaker.synthesize, sentence)
+                except Exception as e:
+                    print(f"TTS error: {e}")
+            await self._put('playback', self._playback_queue, (turn, label, sentence, audio))
+
+    async def _playback_stage(self):
+        """Display and play sentences in order; close the turn when its last one ends."""
+        while True:
+            turn, label, sentence, audio = await self._playback_queue.get()
+
+            if sentence is END_OF_TURN:
+                self._finish_turn(turn)
+                continue
+            if self._is_silenced(turn):
+                continue
+
+            print(f"{label}: {sentence}")
+            self._recent_speech.append(set(sentence.lower().split()))
+            if turn.first_audio_at is None:
+                turn.first_audio_at = time.perf_counter()
+            if audio is not None:
+                try:
+                    await self._timed('playback', turn, self.speaker.play, audio)
+                except Exception as e:
+                    print(f"Playback error: {e}")
+
+    def _barge_in(self, turn: Turn):
+        """Silence every earlier turn: stop playback and drop its queued sentences."""
+        self._silenced_before = max(self._silenced_before, turn.turn_id)
+        stop_speaking = getattr(self.speaker, 'stop', None)
+        if stop_speaking is not None:
+            stop_speaking()
+        for speech_queue in (self._synthesis_queue, self._playback_queue):
+            kept = []
+            while not speech_queue.empty():
+                item = speech_queue.get_nowait()
+                # End-of-turn markers still close their turns
+                if item[2] is END_OF_TURN or not self._is_silenced(item[0]):
+                    kept.append(item)
+            for item in kept:
+                speech_queue.put_nowait(item)
+    
+    def _is_silenced(self, turn: Turn) -> bool:
+        """Check if a barge-in cut this turn's answer off."""
+        return turn.turn_id < self._silenced_before
+    
+    def _finish_turn(self, turn: Turn):
+        """Record a completed turn and stop the engine after a stop command."""
+        self.turns.append(turn)
+        self.tracer.end_turn(turn.trace)
+        self.print_turn_report(turn)
+        if turn.ends_conversation:
+            self._stop.set()
+
+    def _is_echo(self, turn: Turn) -> bool:
+        """Check if an utterance heard while Aarav spoke is mostly words it just said."""
+        if not turn.during_playback:
+            return False
+        words = set(turn.text.lower().split())
+        if not words:
+            return False
+        return any(len(words & spoken) / len(words) >= 0.6 for spoken in self._recent_speech)
+
+    # ------------------------------------------------------------------------
+    # Reports
+    # ------------------------------------------------------------------------
+
+    def print_turn_report(self, turn: Turn):
+        """Print where a single turn spent its time."""
+        parts = [f"{stage} {turn.stage_seconds[stage]:.2f}s" for stage in STAGES if turn.stage_seconds[stage]]
+        if turn.first_audio_at is not None:
+            parts.append(f"first audio after {turn.first_audio_at - turn.captured_at:.2f}s")
+        if parts:
+            print(f"⏱️ Turn {turn.turn_id}: " + " | ".join(parts))
+
+    def occupancy_report(self) -> dict:
+        """
+        Summarise how busy each stage was over the session.
+
+        Returns:
+            dict: Stage name -> busy seconds, occupancy (0-1), items, max queue depth
+                and utterances dropped as echoes
+        """
+        started = self._started_at or time.perf_counter()
+        wall = max((self._stopped_at or time.perf_counter()) - started, 1e-9)
+        return {
+            stage: {
+                'busy_seconds': stats.busy_seconds,
+                'occupancy': stats.busy_seconds / wall,
+                'items': stats.items,
+                'mean_seconds': stats.busy_seconds / stats.items if stats.items else 0.0,
+                'max_queue_depth': stats.max_queue_depth,
+                'echo_drops': stats.echo_drops
+            }
+            for stage, stats in self.stats.items()
+        }
+
+    def print_occupancy_report(self):
+        """Print per-stage occupancy for the session."""
+        print("\n📊 Pipeline occupancy")
+        print("=" * 60)
+        print(f"{'stage':<12} {'busy s':>8} {'occupancy':>10} {'items':>6} {'mean s':>7} {'max q':>6}")
+        for stage, row in self.occupancy_report().items():
+            print(f"{stage:<12} {row['busy_seconds']:>8.2f} {row['occupancy']:>9.0%} "
+                  f"{row['items']:>6} {row['mean_seconds']:>7.2f} {row['max_queue_depth']:>6}")
+        print(f"Turns completed: {len(self.turns)}")
+        print(f"Echoes dropped: {self.stats['recognition'].echo_drops}")
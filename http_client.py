@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP client for Aarav AI Assistant
+
+One pooled httpx client for every outgoing request (Gemini, Murf audio
+downloads, web scraping), so connections stay alive between turns instead of
+paying a fresh TCP + TLS handshake each time.
+
+- Keep-alive connection pools per host, HTTP/2 when the h2 package is installed
+- Timeouts chosen by purpose ('llm', 'tts_download', 'search', ...)
+- Per-host statistics: requests, new vs. reused connections, handshake time
+- An async twin (one pool per event loop) that reports into the same statistics
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import weakref
+from collections import defaultdict, deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from tracing import get_tracer
+
+# Raised for connection failures, timeouts and (after raise_for_status) HTTP errors
+HTTPError = httpx.HTTPError
+
+# Timeouts per purpose: connect is short everywhere, read depends on the work
+PURPOSE_TIMEOUTS = {
+    'llm': httpx.Timeout(30.0, connect=5.0),
+    'llm_stream': httpx.Timeout(30.0, connect=5.0),
+    'tts': httpx.Timeout(15.0, connect=5.0),
+    'tts_download': httpx.Timeout(15.0, connect=5.0),
+    'search': httpx.Timeout(10.0, connect=5.0),
+    'scrape': httpx.Timeout(15.0, connect=5.0),
+    'pdf': httpx.Timeout(30.0, connect=5.0),
+    'default': httpx.Timeout(15.0, connect=5.0)
+}
+
+
+def _http2_available() -> bool:
+    """Check if the optional h2 package is installed."""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class HostStats:
+    """Connection statistics for one host."""
+
+    def __init__(self, window: int = 256):
+        self.requests = 0
+        self.new_connections = 0
+        self.reused_connections = 0
+        self.errors = 0
+        self.http_versions = defaultdict(int)
+        self.handshake_seconds = deque(maxlen=window)
+
+
+class _RequestTrace:
+    """httpcore trace callback: spots new connections and times their handshake."""
+
+    def __init__(self, host: str):
+        self.host = host
+        self.connected = False
+        self._started = {}
+        self.handshake = 0.0
+
+    def __call__(self, event_name: str, info: dict):
+        if event_name in ('connection.connect_tcp.started', 'connection.start_tls.started'):
+            self.connected = True
+            self._started[event_name.rsplit('.', 1)[0]] = time.perf_counter()
+        elif event_name in ('connection.connect_tcp.complete', 'connection.start_tls.complete'):
+            step = event_name.rsplit('.', 1)[0]
+            start = self._started.pop(step, None)
+            if start is not None:
+                end = time.perf_counter()
+                self.handshake += end - start
+                get_tracer().record(f"http.{step.split('.', 1)[1]}", start, end, host=self.host)
+
+
+class _AsyncRequestTrace(_RequestTrace):
+    """Async flavour of the trace callback (httpcore awaits it)."""
+
+    async def __call__(self, event_name: str, info: dict):
+        _RequestTrace.__call__(self, event_name, info)
+
+
+class SharedHTTPClient:
+    def __init__(self, http2: bool = None, max_connections: int = 20,
+                 max_keepalive_connections: int = 10, keepalive_expiry: float = 60.0):
+        """
+        Initialize the pooled client.
+
+        Args:
+            http2 (bool): Negotiate HTTP/2; defaults to True when h2 is installed
+            max_connections (int): Upper bound on open connections
+            max_keepalive_connections (int): Idle connections kept for reuse
+            keepalive_expiry (float): Seconds an idle connection stays open
+        """
+        self.http2 = _http2_available() if http2 is None else http2
+        self._client = httpx.Client(
+            http2=self.http2,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry
+            ),
+            timeout=PURPOSE_TIMEOUTS['default'],
+            follow_redirects=True
+        )
+        self._stats = defaultdict(HostStats)
+        self._lock = threading.Lock()
+
+    def timeout_for(self, purpose: str) -> httpx.Timeout:
+        """Timeout configured for a purpose (falls back to 'default')."""
+        return PURPOSE_TIMEOUTS.get(purpose, PURPOSE_TIMEOUTS['default'])
+
+    def _prepare(self, url: str, purpose: str, kwargs: dict) -> _RequestTrace:
+        kwargs.setdefault('timeout', self.timeout_for(purpose))
+        trace = _RequestTrace(urlsplit(str(url)).netloc)
+        extensions = dict(kwargs.pop('extensions', None) or {})
+        extensions['trace'] = trace
+        kwargs['extensions'] = extensions
+        return trace
+
+    def _account(self, trace: _RequestTrace, response=None, failed: bool = False):
+        with self._lock:
+            stats = self._stats[trace.host]
+            stats.requests += 1
+            if failed:
+                stats.errors += 1
+            elif trace.connected:
+                stats.new_connections += 1
+                stats.handshake_seconds.append(trace.handshake)
+            else:
+                stats.reused_connections += 1
+            if response is not None:
+                stats.http_versions[response.http_version] += 1
+
+    def request(self, method: str, url: str, purpose: str = 'default', **kwargs) -> httpx.Response:
+        """
+        Send a request over the shared pool.
+
+        Args:
+            method (str): HTTP method
+            url (str): Request URL
+            purpose (str): Key into PURPOSE_TIMEOUTS
+            **kwargs: Passed to httpx (headers, json, params, timeout, ...)
+
+        Returns:
+            httpx.Response: The response (status is not checked)
+        """
+        trace = self._prepare(url, purpose, kwargs)
+        try:
+            response = self._client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self._account(trace, failed=True)
+            raise
+        self._account(trace, response)
+        return response
+
+    def get(self, url: str, purpose: str = 'default', **kwargs) -> httpx.Response:
+        """GET over the shared pool."""
+        return self.request('GET', url, purpose, **kwargs)
+
+    def post(self, url: str, purpose: str = 'default', **kwargs) -> httpx.Response:
+        """POST over the shared pool."""
+        return self.request('POST', url, purpose, **kwargs)
+
+    @contextmanager
+    def stream(self, method: str, url: str, purpose: str = 'default', **kwargs):
+        """
+        Send a request and stream the response body.
+
+        Yields:
+            httpx.Response: Response whose body is read with iter_lines()/iter_bytes()
+        """
+        trace = self._prepare(url, purpose, kwargs)
+        accounted = False
+        try:
+            with self._client.stream(method, url, **kwargs) as response:
+                self._account(trace, response)
+                accounted = True
+                yield response
+        except httpx.HTTPError:
+            if not accounted:
+                self._account(trace, failed=True)
+            raise
+
+    def stats(self) -> dict:
+        """
+        Connection statistics per host.
+
+        Returns:
+            dict: Host -> requests, new/reused connections, reuse ratio,
+                  mean handshake milliseconds, errors and HTTP versions
+        """
+        report = {}
+        with self._lock:
+            for host, stats in self._stats.items():
+                handshakes = list(stats.handshake_seconds)
+                report[host] = {
+                    'requests': stats.requests,
+                    'new_connections': stats.new_connections,
+                    'reused_connections': stats.reused_connections,
+                    'reuse_ratio': stats.reused_connections / stats.requests if stats.requests else 0.0,
+                    'handshake_ms': sum(handshakes) / len(handshakes) * 1000 if handshakes else 0.0,
+                    'errors': stats.errors,
+                    'http_versions': dict(stats.http_versions)
+                }
+        return report
+
+    def print_report(self):
+        """Print connection reuse and handshake time per host."""
+        print(f"\n🌐 HTTP connections ({'HTTP/2 enabled' if self.http2 else 'HTTP/1.1'})")
+        print("=" * 72)
+        print(f"{'host':<36} {'reqs':>5} {'new':>4} {'reused':>6} {'handshake':>10} {'errors':>6}")
+        for host, row in sorted(self.stats().items()):
+            print(f"{host[:36]:<36} {row['requests']:>5} {row['new_connections']:>4} "
+                  f"{row['reused_connections']:>6} {row['handshake_ms']:>8.0f}ms {row['errors']:>6}")
+
+    def close(self):
+        """Close every pooled connection."""
+        self._client.close()
+
+
+# Global client instance
+_http_client = None
+_http_client_lock = threading.Lock()
+
+def get_http_client() -> SharedHTTPClient:
+    """Get or create the global shared HTTP client."""
+    global _http_client
+    if _http_client is None:
+        with _http_client_lock:
+            if _http_client is None:
+                _http_client = SharedHTTPClient()
+    return _http_client
+
+def stats() -> Optional[dict]:
+    """Per-host statistics of the shared client, or None if nothing has created it yet."""
+    client = _http_client
+    return client.stats() if client is not None else None
+
+def print_report():
+    """Print the shared client's report, once something has created it."""
+    client = _http_client
+    if client is not None:
+        client.print_report()
+
+
+class AsyncSharedHTTPClient:
+    def __init__(self, stats_client: SharedHTTPClient, max_connections: int = 20,
+                 max_keepalive_connections: int = 10, keepalive_expiry: float = 60.0):
+        """
+        Pooled async client for one event loop.
+
+        Args:
+            stats_client (SharedHTTPClient): Sync client whose statistics and
+                HTTP/2 setting this client shares
+            max_connections (int): Upper bound on open connections
+            max_keepalive_connections (int): Idle connections kept for reuse
+            keepalive_expiry (float): Seconds an idle connection stays open
+        """
+        self.stats_client = stats_client
+        self.http2 = stats_client.http2
+        self._client = httpx.AsyncClient(
+            http2=self.http2,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry
+            ),
+            timeout=PURPOSE_TIMEOUTS['default'],
+            follow_redirects=True
+        )
+
+    def _prepare(self, url: str, purpose: str, kwargs: dict) -> _AsyncRequestTrace:
+        kwargs.setdefault('timeout', self.stats_client.timeout_for(purpose))
+        trace = _AsyncRequestTrace(urlsplit(str(url)).netloc)
+        extensions = dict(kwargs.pop('extensions', None) or {})
+        extensions['trace'] = trace
+        kwargs['extensions'] = extensions
+        return trace
+
+    async def request(self, method: str, url: str, purpose: str = 'default', **kwargs) -> httpx.Response:
+        """Send a request over this loop's pool (see SharedHTTPClient.request)."""
+        trace = self._prepare(url, purpose, kwargs)
+        try:
+            response = await self._client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.stats_client._account(trace, failed=True)
+            raise
+        self.stats_client._account(trace, response)
+        return response
+
+    async def get(self, url: str, purpose: str = 'default', **kwargs) -> httpx.Response:
+        """GET over this loop's pool."""
+        return await self.request('GET', url, purpose, **kwargs)
+
+    async def post(self, url: str, purpose: str = 'default', **kwargs) -> httpx.Response:
+        """POST over this loop's pool."""
+        return await self.request('POST', url, purpose, **kwargs)
+
+    @asynccontextmanager
+    async def stream(self, method: str, url: str, purpose: str = 'default', **kwargs):
+        """Send a request and stream the response body (aiter_lines()/aiter_bytes())."""
+        trace = self._prepare(url, purpose, kwargs)
+        accounted = False
+        try:
+            async with self._client.stream(method, url, **kwargs) as response:
+                self.stats_client._account(trace, response)
+                accounted = True
+                yield response
+        except httpx.HTTPError:
+            if not accounted:
+                self.stats_client._account(trace, failed=True)
+            raise
+
+    async def aclose(self):
+        """Close every pooled connection."""
+        await self._client.aclose()
+
+
+# Async clients, one per event loop (connections cannot be shared across loops)
+_async_clients = weakref.WeakKeyDictionary()
+
+def get_async_http_client() -> AsyncSharedHTTPClient:
+    """Get or create the shared async HTTP client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = _async_clients[loop] = AsyncSharedHTTPClient(get_http_client())
+    return client
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Rate limiting and usage accounting for Aarav AI Assistant's Gemini calls
+
+Every Gemini consumer (conversation, memory summaries, web summaries,
+weather, PDF analysis, image generation) passes through one process-wide
+limiter:
+
+- Two token buckets per model: requests per minute and tokens per minute
+- Requests that would exceed a bucket wait for it to refill instead of
+  failing with a 429 (waits are handed out in arrival order)
+- Token estimates are corrected with the usage metadata of each response
+- Per-feature counters: requests, prompt/output tokens and time spent queued
+
+Limits default to the Gemini free tier and can be changed with configure().
+"""
+
+import asyncio
+import json
+import threading
+import time
+from collections import defaultdict
+from typing import Optional
+
+# Requests and tokens per minute by model
+MODEL_LIMITS = {
+    'gemini-2.0-flash': {'rpm': 15, 'tpm': 1_000_000},
+    'gemini-2.0-flash-exp': {'rpm': 10, 'tpm': 250_000},
+    'gemini-2.0-flash-lite': {'rpm': 30, 'tpm': 1_000_000},
+    'gemini-2.5-flash': {'rpm': 10, 'tpm': 250_000},
+    'gemini-2.5-flash-image-preview': {'rpm': 10, 'tpm': 200_000}
+}
+DEFAULT_LIMITS = {'rpm': 10, 'tpm': 250_000}
+
+# Rough token cost of a non-text part (PDF, image) when estimating a request
+BINARY_PART_TOKENS = 1000
+
+
+def estimate_request_tokens(contents) -> int:
+    """
+    Estimate the input tokens of a request (about four characters per token).
+
+    Args:
+        contents: REST payload dict, SDK contents list, or plain text
+
+    Returns:
+        int: Estimated tokens
+    """
+    if contents is None:
+        return 0
+    if isinstance(contents, str):
+        return (len(contents) + 3) // 4
+    if isinstance(contents, dict):
+        return estimate_request_tokens(json.dumps(contents, ensure_ascii=False))
+    if isinstance(contents, (list, tuple)):
+        return sum(estimate_request_tokens(part) for part in contents)
+    return BINARY_PART_TOKENS
+
+
+def _usage_counts(metadata) -> tuple:
+    """(prompt, output, total) tokens from REST usageMetadata or SDK usage_metadata."""
+    if metadata is None:
+        return None
+    if isinstance(metadata, dict):
+        prompt = metadata.get('promptTokenCount', 0) or 0
+        output = metadata.get('candidatesTokenCount', 0) or 0
+        total = metadata.get('totalTokenCount', prompt + output) or 0
+    else:
+        prompt = getattr(metadata, 'prompt_token_count', 0) or 0
+        output = getattr(metadata, 'candidates_token_count', 0) or 0
+        total = getattr(metadata, 'total_token_count', prompt + output) or 0
+    return prompt, output, total
+
+
+class TokenBucket:
+    def __init__(self, per_minute: float, capacity: float = None):
+        """
+        Initialize a bucket that refills continuously.
+
+        Args:
+            per_minute (float): Refill rate
+            capacity (float): Burst size (defaults to one minute's worth)
+        """
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        """
+        Take amount from the bucket, going into debt if needed.
+
+        Returns:
+            float: Seconds the caller must wait before its request may go out
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # A request larger than the bucket waits for a full bucket, not forever
+            self.tokens -= min(amount, self.capacity)
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def refund(self, amount: float):
+        """Give back tokens that were reserved but not used."""
+        with self._lock:
+            self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class FeatureUsage:
+    """Counters for one feature."""
+
+    def __init__(self):
+        self.requests = 0
+        self.prompt_tokens = 0
+        self.output_tokens = 0
+        self.total_tokens = 0
+        self.queued_requests = 0
+        self.queued_seconds = 0.0
+        self.max_queue_seconds = 0.0
+
+
+class RateLimiter:
+    def __init__(self, limits: dict = None):
+        """
+        Initialize the limiter.
+
+        Args:
+            limits (dict): Model -> {'rpm': ..., 'tpm': ...}; defaults to MODEL_LIMITS
+        """
+        self.limits = {model: dict(values) for model, values in (limits or MODEL_LIMITS).items()}
+        self._buckets = {}
+        self._usage = defaultdict(FeatureUsage)
+        self._lock = threading.Lock()
+
+    def configure(self, model: str, rpm: float = None, tpm: float = None):
+        """Change a model's limits (e.g. for a paid tier)."""
+        with self._lock:
+            values = self.limits.setdefault(model, dict(DEFAULT_LIMITS))
+            if rpm is not None:
+                values['rpm'] = rpm
+            if tpm is not None:
+                values['tpm'] = tpm
+            self._buckets.pop(model, None)
+
+    def _model_buckets(self, model: str) -> tuple:
+        with self._lock:
+            buckets = self._buckets.get(model)
+            if buckets is None:
+                values = self.limits.get(model, DEFAULT_LIMITS)
+                buckets = self._buckets[model] = (TokenBucket(values['rpm']), TokenBucket(values['tpm']))
+            return buckets
+
+    def _reserve(self, model: str, tokens: int, feature: str) -> float:
+        requests_bucket, tokens_bucket = self._model_buckets(model)
+        wait = max(requests_bucket.reserve(1), tokens_bucket.reserve(tokens))
+        with self._lock:
+            usage = self._usage[feature]
+            usage.requests += 1
+            if wait > 0:
+                usage.queued_requests += 1
+                usage.queued_seconds += wait
+                usage.max_queue_seconds = max(usage.max_queue_seconds, wait)
+        return wait
+
+    def acquire(self, model: str, tokens: int, feature: str) -> float:
+        """
+        Wait until a request of about `tokens` input tokens may be sent.
+
+        Args:
+            model (str): Gemini model name
+            tokens (int): Estimated input tokens
+            feature (str): Feature the request belongs to, for usage counters
+
+        Returns:
+            float: Seconds spent queued
+        """
+        wait = self._reserve(model, tokens, feature)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def aacquire(self, model: str, tokens: int, feature: str) -> float:
+        """Async version of acquire() that waits without blocking the event loop."""
+        wait = self._reserve(model, tokens, feature)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def record_usage(self, model: str, feature: str, metadata, estimated_tokens: int = 0):
+        """
+        Record a response's usage metadata and correct the token bucket.
+
+        Args:
+            model (str): Gemini model name
+            feature (str): Feature the request belongs to
+            metadata: REST usageMetadata dict or SDK usage_metadata object
+            estimated_tokens (int): Tokens reserved by acquire()
+        """
+        counts = _usage_counts(metadata)
+        if counts is None:
+            return
+        prompt, output, total = counts
+
+        _, tokens_bucket = self._model_buckets(model)
+        difference = total - estimated_tokens
+        if difference > 0:
+            tokens_bucket.reserve(difference)
+        elif difference < 0:
+            tokens_bucket.refund(-difference)
+
+        with self._lock:
+            usage = self._usage[feature]
+            usage.prompt_tokens += prompt
+            usage.output_tokens += output
+            usage.total_tokens += total
+
+    def call(self, feature: str, func, model: str, contents, policy=None, **kwargs):
+        """
+        Rate-limit and account an SDK call of the form func(model=..., contents=...).
+
+        Tokens are reserved once, before the resilience policy starts: time
+        spent queued here does not count against its deadline or breaker,
+        and its retries and hedges do not reserve again.
+
+        Args:
+            feature (str): Feature the request belongs to
+            func (callable): e.g. client.models.generate_content
+            model (str): Gemini model name
+            contents: Request contents (used for the token estimate)
+            policy (Resilience): Runs the call with deadline, retries and hedging
+
+        Returns:
+            The SDK response
+        """
+        estimated = estimate_request_tokens(contents)
+        self.acquire(model, estimated, feature)
+        if policy is not None:
+            response = policy.call(func, model=model, contents=contents, **kwargs)
+        else:
+            response = func(model=model, contents=contents, **kwargs)
+        self.record_usage(model, feature, getattr(response, 'usage_metadata', None), estimated)
+        return response
+
+    def usage(self, feature: str = None) -> dict:
+        """
+        Usage counters, for one feature or all of them.
+
+        Returns:
+            dict: Feature -> requests, tokens and queueing (or one feature's counters)
+        """
+        with self._lock:
+            report = {
+                name: {
+                    'requests': usage.requests,
+                    'prompt_tokens': usage.prompt_tokens,
+                    'output_tokens': usage.output_tokens,
+                    'total_tokens': usage.total_tokens,
+                    'queued_requests': usage.queued_requests,
+                    'queued_seconds': usage.queued_seconds,
+                    'max_queue_seconds': usage.max_queue_seconds
+                }
+                for name, usage in self._usage.items()
+            }
+        return report.get(feature, {}) if feature is not None else report
+
+    def print_report(self):
+        """Print usage per feature."""
+        print("\n📈 Gemini usage")
+        print("=" * 72)
+        print(f"{'feature':<16} {'reqs':>5} {'prompt':>8} {'output':>8} {'total':>8} {'queued':>6} {'wait s':>7}")
+        for name, row in sorted(self.usage().items()):
+            print(f"{name:<16} {row['requests']:>5} {row['prompt_tokens']:>8} {row['output_tokens']:>8} "
+                  f"{row['total_tokens']:>8} {row['queued_requests']:>6} {row['queued_seconds']:>7.1f}")
+
+
+# Global limiter instance
+_rate_limiter = None
+_rate_limiter_lock = threading.Lock()
+
+def get_rate_limiter() -> RateLimiter:
+    """Get or create the process-wide rate limiter."""
+    global _rate_limiter
+    if _rate_limiter is None:
+        with _rate_limiter_lock:
+            if _rate_limiter is None:
+                _rate_limiter = RateLimiter()
+    return _rate_limiter
+
+def stats() -> Optional[dict]:
+    """Usage per feature, or None if nothing has created the limiter yet."""
+    limiter = _rate_limiter
+    return limiter.usage() if limiter is not None else None
+
+def print_report():
+    """Print the limiter's usage report, once something has created it."""
+    limiter = _rate_limiter
+    if limiter is not None:
+        limiter.print_report()
@@ -0,0 +1,541 @@
+#!/usr/bin/env python3
+"""
+Offline Replay and Benchmark Harness for Aarav AI Assistant
+
+Drives the real Aarav routing and dispatch logic from a script instead of a
+live microphone, with local stand-ins for every networked subsystem:
+
+    SpeechToText      → LocalSpeechToText   (script transcripts / WAV files,
+                                             optionally streamed to ScriptedRecognizer)
+    GeminiBrain       → LocalBrain          (canned streamed replies)
+    Speaker           → LocalSpeaker        (silent clips with a real clock)
+    WebScraperAnalyzer→ LocalAnalyzer       (canned search/weather/PDF results)
+    ImageGenerator    → LocalImageGenerator (no image, no popup)
+
+Each stand-in sleeps for a configurable, optionally jittered latency so loop
+changes can be measured without network access.
+
+Script format: one utterance per line. Lines ending in .wav are read as audio
+files (their transcript comes from a .txt file with the same name); every
+other line is used as the transcript directly. Blank lines and lines starting
+with # are ignored.
+
+Usage:
+    python replay.py script.txt --latency llm_first=0.8 --latency tts=0.3 --repeat 3
+    python replay.py script.txt --streaming    # partial results, local finals
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from Aarav import Aarav
+from Communication.speech_clip import SpeechClip
+from Communication.streaming_stt import ScriptedRecognizer, StreamingTranscriber
+from tracing import percentile, get_tracer
+
+# Seconds each stand-in waits; 'realtime' scales real audio durations
+# (user utterances and Aarav's playback), 0 = instant
+LATENCY_DEFAULTS = {
+    'stt': 0.4,
+    'llm_first': 0.6,
+    'llm_sentence': 0.15,
+    'tts': 0.3,
+    'scraper': 1.5,
+    'image': 3.0,
+    'realtime': 0.0
+}
+
+# Speaking rate used to estimate clip and utterance durations
+WORDS_PER_SECOND = 2.5
+
+# Streaming recognition (--streaming): chunk size and the pause the endpointer waits for
+STREAM_CHUNK_SECONDS = 0.1
+STREAM_SAMPLE_RATE = 16000
+TRAILING_SILENCE = 0.5
+
+
+class Latency:
+    def __init__(self, values: dict = None, jitter: float = 0.0, seed: int = None):
+        """
+        Injected latencies for the stand-ins.
+
+        Args:
+            values (dict): Overrides for LATENCY_DEFAULTS
+            jitter (float): Relative jitter, e.g. 0.2 for ±20%
+            seed (int): Random seed for reproducible jitter
+        """
+        self.values = dict(LATENCY_DEFAULTS)
+        self.values.update(values or {})
+        self.jitter = jitter
+        self._random = random.Random(seed)
+
+    def seconds(self, name: str, base: float = None) -> float:
+        """Latency for a stand-in operation, with jitter applied."""
+        value = self.values[name] if base is None else base * self.values[name]
+        if self.jitter:
+            value *= self._random.uniform(1 - self.jitter, 1 + self.jitter)
+        return max(0.0, value)
+
+    def wait(self, name: str, base: float = None):
+        """Sleep for the latency of an operation."""
+        delay = self.seconds(name, base)
+        if delay:
+            time.sleep(delay)
+
+
+# ============================================================================
+# STAND-INS
+# ============================================================================
+
+class ScriptItem:
+    """One scripted utterance: its transcript and spoken duration."""
+
+    def __init__(self, transcript: str, duration: float, source: str):
+        self.transcript = transcript
+        self.duration = duration
+        self.source = source
+
+
+def load_script(path: str):
+    """
+    Read a replay script.
+
+    Args:
+        path (str): Script file
+
+    Returns:
+        list: ScriptItem for every utterance
+    """
+    base_dir = os.path.dirname(os.path.abspath(path))
+    items = []
+    with open(path, 'r', encoding='utf-8') as script:
+        for line in script:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+
+            if line.lower().endswith('.wav'):
+                wav_path = line if os.path.isabs(line) else os.path.join(base_dir, line)
+                with wave.open(wav_path, 'rb') as wav:
+                    duration = wav.getnframes() / float(wav.getframerate())
+                transcript_path = os.path.splitext(wav_path)[0] + '.txt'
+                if not os.path.exists(transcript_path):
+                    raise ValueError(f"Missing transcript for {line}: expected {transcript_path}")
+                with open(transcript_path, 'r', encoding='utf-8') as transcript_file:
+                    transcript = transcript_file.read().strip()
+                items.append(ScriptItem(transcript, duration, wav_path))
+            else:
+                items.append(ScriptItem(line, len(line.split()) / WORDS_PER_SECOND, 'text'))
+    return items
+
+
+class LocalSpeechToText:
+    def __init__(self, latency: Latency, streaming: bool = False):
+        """
+        Stand-in for SpeechToText that 'hears' scripted utterances.
+        
+        Args:
+            latency (Latency): Injected latencies
+            streaming (bool): Stream each utterance to the ScriptedRecognizer, so
+                early intents fire and local finals skip the 'stt' latency
+        """
+        self.latency = latency
+        self.pending = []
+        self.captured_at = None
+        self.on_early_intent = None
+        self.transcriber = None
+        if streaming:
+            self.recognizer = ScriptedRecognizer(STREAM_SAMPLE_RATE, words_per_second=WORDS_PER_SECOND)
+            self.transcriber = StreamingTranscriber(self.recognizer)
+            self.transcriber.on_early_intent = self._early_intent
+
+    def feed(self, item: ScriptItem):
+        """Queue the next scripted utterance."""
+        self.pending.append(item)
+
+    def _early_intent(self, intent, hypothesis, during_playback):
+        if self.on_early_intent is not None:
+            self.on_early_intent(intent, hypothesis)
+
+    def _stream(self, item: ScriptItem):
+        """Stream the utterance plus the pause after it in chunks, as the capture thread would."""
+        self.recognizer.expect(item.transcript)
+        self.transcriber.begin()
+        chunk = bytes(2 * int(STREAM_CHUNK_SECONDS * STREAM_SAMPLE_RATE))
+        for _ in range(round((item.duration + TRAILING_SILENCE) / STREAM_CHUNK_SECONDS)):
+            self.latency.wait('realtime', STREAM_CHUNK_SECONDS)
+            self.transcriber.feed(chunk)
+            # Early intents fire in step with the audio
+            self.transcriber.drain()
+        return self.transcriber.end()
+
+    def capture(self, timeout=None):
+        if not self.pending:
+            return None
+        item = self.pending.pop(0)
+        if self.transcriber is not None:
+            item.stream_transcript = self._stream(item)
+        else:
+            self.latency.wait('realtime', item.duration)
+        self.captured_at = time.perf_counter()
+        return item
+
+    def recognize(self, audio, wake_only: bool = False):
+        stream_transcript = getattr(audio, 'stream_transcript', None)
+        if stream_transcript is not None:
+            text = self.transcriber.final_text(stream_transcript)
+            if text:
+                return text
+        self.latency.wait('stt')
+        return audio.transcript if audio else None
+
+    def listen_and_convert(self, wake_only: bool = False):
+        audio = self.capture()
+        return self.recognize(audio, wake_only) if audio else None
+
+
+class LocalBrain:
+    def __init__(self, latency: Latency, sentences: int = 3):
+        """Stand-in for GeminiBrain returning a canned multi-sentence reply."""
+        self.latency = latency
+        self.sentences = sentences
+
+    def _reply(self, user_text: str):
+        reply = [f"Okayy, you said {user_text.strip().rstrip('?.!')}."]
+        reply += [f"This is offline sentence number {n} of the reply." for n in range(2, self.sentences)]
+        reply.append("What shall we do next?")
+        return reply[:max(1, self.sentences)]
+
+    def think(self, user_text: str) -> str:
+        self.latency.wait('llm_first')
+        for _ in range(self.sentences - 1):
+            self.latency.wait('llm_sentence')
+        return " ".join(self._reply(user_text))
+
+    def think_stream(self, user_text: str):
+        self.latency.wait('llm_first')
+        for i, sentence in enumerate(self._reply(user_text)):
+            if i > 0:
+                self.latency.wait('llm_sentence')
+            yield sentence
+
+
+class LocalSpeaker:
+    def __init__(self, latency: Latency):
+        """Stand-in for Speaker: silent clips that 'play' in scaled real time."""
+        self.latency = latency
+        self.voice_id = "offline"
+        self.style = "Replay"
+        self.play_started = []
+        self.synthesis_pool = ThreadPoolExecutor(max_workers=3, thread_name_prefix="replay-tts")
+
+    def synthesize_clip(self, text: str) -> SpeechClip:
+        self.latency.wait('tts')
+        words = text.split()
+        timings = [(word, i / WORDS_PER_SECOND, (i + 1) / WORDS_PER_SECOND) for i, word in enumerate(words)]
+        return SpeechClip(text, b"", timings)
+
+    def synthesize_async(self, text: str):
+        return self.synthesis_pool.submit(self.synthesize_clip, text)
+
+    def synthesize(self, text: str) -> bytes:
+        return self.synthesize_clip(text).audio_data
+
+    def play_clip(self, clip: SpeechClip):
+        try:
+            clip.duration = self.latency.seconds('realtime', len(clip.text.split()) / WORDS_PER_SECOND)
+            clip.started_at = time.perf_counter()
+            self.play_started.append(clip.started_at)
+            clip.started.set()
+            clip.finished.wait(clip.duration)
+        finally:
+            clip.started.set()
+            clip.finished.set()
+
+    def play(self, audio_data: bytes):
+        self.play_clip(SpeechClip("", audio_data))
+
+    def speak_text(self, text: str):
+        if text and text.strip():
+            self.play_clip(self.synthesize_clip(text))
+
+    def speak(self, text: str):
+        self.speak_text(text)
+
+
+class LocalAnalyzer:
+    def __init__(self, latency: Latency):
+        """Stand-in for WebScraperAnalyzer returning canned results."""
+        self.latency = latency
+        self.client = None
+
+    def _result(self, content: str, **extra):
+        self.latency.wait('scraper')
+        result = {'success': True, 'content': content}
+        result.update(extra)
+        return result
+
+    def google_search(self, query, num_results=5):
+        self.latency.wait('scraper')
+        return [{'title': f"Result {n} for {query}", 'url': f"https://example.com/{n}", 'snippet': ""}
+                for n in range(1, num_results + 1)]
+
+    def scrape_website(self, url):
+        return self._result(f"Offline content of {url}.", title=f"Offline {url}", url=url, word_count=4)
+
+    def summarize_content(self, content, prompt="Summarize this content", query_context=None):
+        self.latency.wait('scraper')
+        return f"Offline summary about {query_context or 'the content'}."
+
+    def get_weather_info(self, location="current location"):
+        return self._result(f"It is a mild 21 degrees in {location}, offline of course.",
+                            location=location, type='weather_info')
+
+    def analyze_pdf_from_url(self, pdf_url, prompt="Summarize this document"):
+        return self._result(f"Offline analysis of {pdf_url}.", source=pdf_url, type='pdf_analysis')
+
+    def analyze_local_pdf(self, file_path, prompt="Summarize this document"):
+        return self._result(f"Offline analysis of {file_path}.", source=file_path, type='local_pdf_analysis')
+
+    def process_user_request(self, user_input):
+        return self._result(f"Offline answer for {user_input}.", sources=["https://example.com/1"],
+                            query=user_input, type='search_results')
+
+
+def make_local_image_generator(latency: Latency):
+    """
+    Build a stand-in ImageGenerator that keeps the real prompt extraction.
+
+    Args:
+        latency (Latency): Injected latencies
+
+    Returns:
+        LocalImageGenerator: Generator that only waits and reports success
+    """
+    from Automate.image_generation import ImageGenerator
+
+    class LocalImageGenerator(ImageGenerator):
+        def __init__(self):
+            self.is_initialized = True
+            self.client = None
+            self.generate_dir = tempfile.gettempdir()
+
+        def generate_image(self, prompt, save_image=True, show_popup=True):
+            latency.wait('image')
+            return True, "Image generated successfully! (offline)", None
+
+    return LocalImageGenerator()
+
+
+class LocalBrowser:
+    """Stand-in for the webbrowser module: records URLs instead of opening them."""
+
+    def __init__(self):
+        self.opened = []
+
+    def open(self, url, *args, **kwargs):
+        self.opened.append(url)
+        return True
+
+
+class LocalDesktop:
+    """Stand-in for pyautogui: records key presses, screenshots to a temp file."""
+
+    class _Screenshot:
+        def save(self, filepath):
+            with open(filepath, 'wb') as image_file:
+                image_file.write(b"offline screenshot")
+
+    def __init__(self):
+        self.keys = []
+
+    def hotkey(self, *keys):
+        self.keys.append('+'.join(keys))
+
+    def press(self, key):
+        self.keys.append(key)
+
+    def screenshot(self):
+        return self._Screenshot()
+
+
+def build_web_automation(latency: Latency):
+    """Real WebAutomationIntegration with the browser, desktop and image generator stood in."""
+    import web_automation_integration
+
+    web_automation_integration.webbrowser = LocalBrowser()
+    web_automation_integration.pyautogui = LocalDesktop()
+
+    web_automation = web_automation_integration.WebAutomationIntegration()
+    web_automation.screenshots_dir = tempfile.mkdtemp(prefix="aarav-replay-")
+    web_automation._image_generator = make_local_image_generator(latency)
+    return web_automation
+
+
+def build_web_integration(latency: Latency):
+    """Real VoiceWebIntegration backed by the LocalAnalyzer."""
+    import web_scraper
+    import voice_web_integration
+
+    web_scraper._analyzer = LocalAnalyzer(latency)
+    return voice_web_integration.VoiceWebIntegration()
+
+
+# ============================================================================
+# HARNESS
+# ============================================================================
+
+class ReplayHarness:
+    def __init__(self, latency: Latency, quiet: bool = True, streaming: bool = False):
+        """
+        Build an Aarav wired to local stand-ins.
+
+        Args:
+            latency (Latency): Injected latencies
+            quiet (bool): Hide Aarav's console output during turns
+            streaming (bool): Use streaming recognition with partial results
+        """
+        self.latency = latency
+        self.quiet = quiet
+        self.listener = LocalSpeechToText(latency, streaming=streaming)
+        self.speaker = LocalSpeaker(latency)
+
+        self.aarav = Aarav(components={
+            'listener': self.listener,
+            'speaker': self.speaker,
+            'brain': LocalBrain(latency),
+            'web_automation': build_web_automation(latency),
+            'web_integration': build_web_integration(latency),
+        })
+        self.listener.on_early_intent = self.aarav.on_early_intent
+        self.turns = []
+
+    def run(self, items, repeat: int = 1):
+        """
+        Replay the script through Aarav.
+
+        Args:
+            items (list): ScriptItems from load_script()
+            repeat (int): Times to replay the whole script
+
+        Returns:
+            dict: Throughput and latency distributions
+        """
+        tracer = get_tracer()
+        self.aarav.is_running = True
+        started = time.perf_counter()
+
+        for _ in range(repeat):
+            self.aarav.is_awake = False
+            self.aarav.is_running = True
+            for item in items:
+                self.listener.feed(item)
+                turn = tracer.start_turn()
+                turn_start = time.perf_counter()
+                plays_before = len(self.speaker.play_started)
+
+                output = io.StringIO()
+                redirect = contextlib.redirect_stdout(output) if self.quiet else contextlib.nullcontext()
+                with redirect:
+                    user_text = self.listener.listen_and_convert()
+                    heard_at = time.perf_counter()
+                    if user_text:
+                        self.aarav.process_utterance(user_text, turn)
+                tracer.end_turn(turn, discard=not user_text)
+
+                finished = time.perf_counter()
+                first_play = self.speaker.play_started[plays_before] \
+                    if len(self.speaker.play_started) > plays_before else None
+                self.turns.append({
+                    'text': user_text,
+                    'intents': sorted(self.aarav.router.intents(user_text or "")),
+                    'turn': finished - turn_start,
+                    'response': finished - heard_at,
+                    'first_audio': first_play - heard_at if first_play else None
+                })
+
+                if not self.aarav.is_running:
+                    break
+
+        wall = time.perf_counter() - started
+        return self.report(wall)
+
+    def report(self, wall: float) -> dict:
+        """Summarise throughput and per-turn latency distributions."""
+        def distribution(values):
+            values = sorted(v for v in values if v is not None)
+            if not values:
+                return None
+            return {'count': len(values), 'p50': percentile(values, 50), 'p95': percentile(values, 95),
+                    'p99': percentile(values, 99), 'max': values[-1]}
+
+        return {
+            'turns': len(self.turns),
+            'wall_seconds': wall,
+            'turns_per_second': len(self.turns) / wall if wall else 0.0,
+            'turn': distribution(t['turn'] for t in self.turns),
+            'response': distribution(t['response'] for t in self.turns),
+            'first_audio': distribution(t['first_audio'] for t in self.turns)
+        }
+
+
+def print_report(report: dict):
+    """Print throughput and latency distributions."""
+    print(f"\n🔁 Replay: {report['turns']} turns in {report['wall_seconds']:.2f}s "
+          f"→ {report['turns_per_second']:.2f} turns/s")
+    print("=" * 60)
+    print(f"{'metric':<14} {'count':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for metric in ('turn', 'response', 'first_audio'):
+        row = report[metric]
+        if row:
+            print(f"{metric:<14} {row['count']:>6} {row['p50'] * 1000:>8.0f} {row['p95'] * 1000:>8.0f} "
+                  f"{row['p99'] * 1000:>8.0f} {row['max'] * 1000:>8.0f}")
+
+
+def parse_latencies(pairs):
+    """Parse NAME=SECONDS pairs from the command line."""
+    values = {}
+    for pair in pairs or []:
+        name, _, seconds = pair.partition('=')
+        if name not in LATENCY_DEFAULTS:
+            raise SystemExit(f"Unknown latency '{name}'. Choose from: {', '.join(LATENCY_DEFAULTS)}")
+        values[name] = float(seconds)
+    return values
+
+
+def main():
+    """Replay a script through Aarav with offline stand-ins."""
+    parser = argparse.ArgumentParser(description="Replay a script through Aarav without network access")
+    parser.add_argument('script', help="script of transcripts and/or WAV files, one per line")
+    parser.add_argument('--latency', action='append', metavar='NAME=SECONDS',
+                        help=f"stand-in latency ({', '.join(LATENCY_DEFAULTS)})")
+    parser.add_argument('--jitter', type=float, default=0.0, help="relative latency jitter, e.g. 0.2")
+    parser.add_argument('--seed', type=int, default=None, help="random seed for jitter")
+    parser.add_argument('--repeat', type=int, default=1, help="times to replay the script")
+    parser.add_argument('--verbose', action='store_true', help="show Aarav's console output")
+    parser.add_argument('--streaming', action='store_true',
+                        help="stream utterances to the scripted partial recognizer")
+    args = parser.parse_args()
+
+    latency = Latency(parse_latencies(args.latency), jitter=args.jitter, seed=args.seed)
+    harness = ReplayHarness(latency, quiet=not args.verbose, streaming=args.streaming)
+    report = harness.run(load_script(args.script), repeat=args.repeat)
+
+    print_report(report)
+    get_tracer().print_report()
+    if harness.listener.transcriber is not None:
+        harness.listener.transcriber.print_report()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+Resilience layer for Aarav AI Assistant's Gemini calls
+
+Wraps a blocking call with:
+
+- A deadline: the caller gets control back when it expires, even if the
+  request itself is still running (it finishes on a worker thread)
+- Jittered exponential backoff on retryable errors (429, 5xx, timeouts,
+  dropped connections), honouring Retry-After
+- Optional hedging: if an attempt is slower than the recent latency
+  percentile, a second identical request is started and the first answer wins
+- A circuit breaker that fails fast while the service keeps failing, then
+  lets a single trial request through after a cool-down. Every trial ends:
+  an answer (even an error such as a 400) closes the circuit, a transient
+  failure re-opens it, and an abandoned trial lets the next call try again
+
+Policies are named ('llm', 'summarize', 'pdf', 'image') and shared process-wide
+through get_resilience().
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Optional
+
+from tracing import percentile
+
+try:
+    import httpx
+    TRANSIENT_ERRORS = (ConnectionError, TimeoutError, httpx.TransportError)
+except ImportError:
+    TRANSIENT_ERRORS = (ConnectionError, TimeoutError)
+
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+# Settings per call site; hedging only starts once enough latencies are known
+POLICIES = {
+    'llm': {'deadline': 12.0, 'max_attempts': 3, 'hedge_percentile': 95},
+    'summarize': {'deadline': 15.0, 'max_attempts': 3},
+    'pdf': {'deadline': 45.0, 'max_attempts': 2},
+    'image': {'deadline': 60.0, 'max_attempts': 2}
+}
+
+
+class ResilienceError(Exception):
+    """Base class for calls refused or abandoned by the resilience layer."""
+
+
+class CircuitOpenError(ResilienceError):
+    """The circuit breaker is open: the service is failing, so the call was not made."""
+
+
+class DeadlineExceeded(ResilienceError, TimeoutError):
+    """The call did not finish before its deadline."""
+
+
+def status_code(error: Exception) -> Optional[int]:
+    """HTTP status of an error from httpx or the google-genai SDK, if it has one."""
+    response = getattr(error, 'response', None)
+    code = getattr(response, 'status_code', None)
+    if code is None:
+        code = getattr(error, 'code', None)
+    if code is None:
+        code = getattr(error, 'status_code', None)
+    return code if isinstance(code, int) else None
+
+
+def is_retryable(error: Exception) -> bool:
+    """Check if an error is transient (rate limit, server error, network)."""
+    if isinstance(error, ResilienceError):
+        return False
+    code = status_code(error)
+    if code is not None:
+        return code in RETRYABLE_STATUS
+    return isinstance(error, TRANSIENT_ERRORS)
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Seconds from a Retry-After header, if the server sent one."""
+    headers = getattr(getattr(error, 'response', None), 'headers', None)
+    try:
+        return float(headers.get('Retry-After')) if headers else None
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Initialize the breaker.
+
+        Args:
+            failure_threshold (int): Consecutive failures that open the circuit
+            reset_timeout (float): Seconds before a trial request is allowed
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = 'closed'
+        self.failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Check if a request may go out (one trial request when half-open)."""
+        with self._lock:
+            if self.state == 'closed':
+                return True
+            if self.state == 'open' and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = 'half_open'
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = 'closed'
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == 'half_open' or self.failures >= self.failure_threshold:
+                if self.state != 'open':
+                    self.times_opened += 1
+                self.state = 'open'
+                self.opened_at = time.monotonic()
+
+    def release(self):
+        """End a half-open trial without an outcome; the next call becomes the trial."""
+        with self._lock:
+            if self.state == 'half_open':
+                self.state = 'open'
+
+
+# Worker threads shared by every policy; abandoned attempts finish here
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="aarav-resilience")
+
+
+class Resilience:
+    def __init__(self, name: str, deadline: float = 12.0, max_attempts: int = 3,
+                 base_delay: float = 0.5, max_delay: float = 4.0, hedge_percentile: float = None,
+                 hedge_min_samples: int = 20, breaker: CircuitBreaker = None, window: int = 256):
+        """
+        Initialize a resilience policy.
+
+        Args:
+            name (str): Policy name for reports
+            deadline (float): Seconds the caller waits in total, retries included
+            max_attempts (int): Attempts per call, including the first
+            base_delay (float): Backoff base in seconds (doubles per attempt, full jitter)
+            max_delay (float): Backoff cap in seconds
+            hedge_percentile (float): Start a second request once an attempt is slower
+                than this percentile of recent latencies (None disables hedging)
+            hedge_min_samples (int): Latencies needed before hedging starts
+            breaker (CircuitBreaker): Breaker shared by the policy's calls
+            window (int): Recent latencies kept for the hedge percentile
+        """
+        self.name = name
+        self.deadline = deadline
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.breaker = breaker or CircuitBreaker()
+        self.latencies = deque(maxlen=window)
+
+        self.counters = {
+            'calls': 0, 'successes': 0, 'failures': 0, 'retries': 0,
+            'hedges': 0, 'hedge_wins': 0, 'deadline_exceeded': 0, 'short_circuited': 0
+        }
+        self._lock = threading.Lock()
+
+    def _count(self, counter: str, amount: int = 1):
+        with self._lock:
+            self.counters[counter] += amount
+
+    # ------------------------------------------------------------------------
+    # Building blocks (also used directly by streaming call sites)
+    # ------------------------------------------------------------------------
+
+    def start(self, deadline: float = None) -> float:
+        """
+        Begin a call: check the breaker and return its absolute deadline.
+
+        Raises:
+            CircuitOpenError: The service is failing; fail fast
+        """
+        self._count('calls')
+        if not self.breaker.allow():
+            self._count('short_circuited')
+            raise CircuitOpenError(f"{self.name}: circuit open, Gemini is failing")
+        return time.monotonic() + (self.deadline if deadline is None else deadline)
+
+    def remaining(self, deadline: float) -> float:
+        """Seconds left before the deadline."""
+        return max(0.0, deadline - time.monotonic())
+
+    def record_success(self, latency: float):
+        """Record a successful attempt and its latency."""
+        self.breaker.record_success()
+        self._count('successes')
+        with self._lock:
+            self.latencies.append(latency)
+
+    def record_failure(self, error: Exception):
+        """Record a failed attempt; only transient failures count against the breaker."""
+        self._count('failures')
+        if isinstance(error, DeadlineExceeded):
+            self._count('deadline_exceeded')
+        if is_retryable(error) or isinstance(error, DeadlineExceeded):
+            self.breaker.record_failure()
+        elif not isinstance(error, ResilienceError):
+            # The service answered (e.g. 400, malformed body): it is up
+            self.breaker.record_success()
+
+    def abandon(self, answered: bool = False):
+        """
+        End an attempt the caller gave up on (closed stream, cancelled task).
+
+        Args:
+            answered (bool): The service had started answering, so it is up
+        """
+        if answered:
+            self.breaker.record_success()
+        else:
+            self.breaker.release()
+
+    def retry_delay(self, attempt: int, error: Exception, deadline: float) -> Optional[float]:
+        """
+        Backoff before the next attempt, or None to give up.
+
+        Args:
+            attempt (int): Attempts made so far
+            error (Exception): Error from the last attempt
+            deadline (float): Absolute deadline from start()
+        """
+        if attempt >= self.max_attempts or not is_retryable(error) or not self.breaker.allow():
+            return None
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+        retry_after = _retry_after(error)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        if delay >= self.remaining(deadline):
+            return None
+        self._count('retries')
+        return delay
+
+    def hedge_delay(self) -> Optional[float]:
+        """Latency percentile after which a hedged request is started."""
+        if self.hedge_percentile is None:
+            return None
+        with self._lock:
+            values = sorted(self.latencies)
+        if len(values) < self.hedge_min_samples:
+            return None
+        return percentile(values, self.hedge_percentile)
+
+    # ------------------------------------------------------------------------
+    # Blocking calls
+    # ------------------------------------------------------------------------
+
+    def call(self, func, *args, **kwargs):
+        """
+        Run func(*args, **kwargs) under the policy.
+
+        Returns:
+            The first successful result
+
+        Raises:
+            CircuitOpenError: The breaker is open
+            DeadlineExceeded: No attempt finished in time
+            Exception: The last error, if it was not retryable or retries ran out
+        """
+        deadline = self.start()
+        attempt = 0
+        while True:
+            attempt += 1
+            start = time.monotonic()
+            try:
+                result = self._attempt(func, args, kwargs, deadline)
+            except Exception as e:
+                self.record_failure(e)
+                delay = self.retry_delay(attempt, e, deadline)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                continue
+            except BaseException:
+                self.abandon()
+                raise
+            self.record_success(time.monotonic() - start)
+            return result
+
+    def _attempt(self, func, args, kwargs, deadline: float):
+        """One attempt on a worker thread, hedged if it runs slow."""
+        remaining = self.remaining(deadline)
+        if remaining <= 0:
+            raise DeadlineExceeded(f"{self.name}: deadline exceeded")
+
+        primary = _executor.submit(func, *args, **kwargs)
+        pending = {primary}
+
+        hedge_after = self.hedge_delay()
+        if hedge_after is not None and hedge_after < remaining:
+            done, _ = wait(pending, timeout=hedge_after)
+            if not done:
+                pending.add(_executor.submit(func, *args, **kwargs))
+                self._count('hedges')
+
+        error = None
+        while pending:
+            done, pending = wait(pending, timeout=self.remaining(deadline), return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                if future.exception() is None:
+                    if future is not primary:
+                        self._count('hedge_wins')
+                    return future.result()
+                error = future.exception()
+
+        if error is not None and not pending:
+            raise error
+        raise DeadlineExceeded(f"{self.name}: no answer within {self.deadline:.0f}s")
+
+    # ------------------------------------------------------------------------
+    # Reports
+    # ------------------------------------------------------------------------
+
+    def stats(self) -> dict:
+        """Counters, breaker state and current hedge delay."""
+        with self._lock:
+            stats = dict(self.counters)
+        hedge = self.hedge_delay()
+        stats['breaker'] = self.breaker.state
+        stats['times_opened'] = self.breaker.times_opened
+        stats['hedge_after_ms'] = hedge * 1000 if hedge is not None else None
+        return stats
+
+
+# Global policy instances
+_policies = {}
+_policies_lock = threading.Lock()
+
+def get_resilience(name: str) -> Resilience:
+    """Get or create the shared policy for a call site ('llm', 'summarize', 'pdf', 'image')."""
+    with _policies_lock:
+        if name not in _policies:
+            _policies[name] = Resilience(name, **POLICIES.get(name, {}))
+        return _policies[name]
+
+def print_report():
+    """Print counters for every policy in use."""
+    with _policies_lock:
+        policies = dict(_policies)
+    print("\n🛡️ Resilience")
+    print("=" * 72)
+    print(f"{'policy':<10} {'calls':>6} {'ok':>5} {'fail':>5} {'retry':>6} {'hedge':>6} "
+          f"{'won':>4} {'late':>5} {'fast-fail':>9}  breaker")
+    for name, policy in sorted(policies.items()):
+        row = policy.stats()
+        print(f"{name:<10} {row['calls']:>6} {row['successes']:>5} {row['failures']:>5} {row['retries']:>6} "
+              f"{row['hedges']:>6} {row['hedge_wins']:>4} {row['deadline_exceeded']:>5} "
+              f"{row['short_circuited']:>9}  {row['breaker']}")
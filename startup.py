@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Startup helpers for Aarav AI Assistant
+
+- LazyComponent: builds a subsystem on first use, or ahead of time on a
+  background thread, so cold start only pays for what sleep mode needs.
+- StartupReport: wall time per import and per component, printed with
+  `python Aarav.py --startup-report`.
+"""
+
+import importlib
+import threading
+import time
+from contextlib import contextmanager
+
+# Process start reference for time-to-listening
+PROCESS_START = time.perf_counter()
+
+
+class StartupReport:
+    def __init__(self, enabled: bool = False):
+        """
+        Collect startup timings.
+
+        Args:
+            enabled (bool): Print the report (and late background timings)
+        """
+        self.enabled = enabled
+        self.entries = []
+        self.listening_at = None
+        self._printed = False
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def measure(self, kind: str, name: str):
+        """Time a block and record it as an import or component entry."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            entry = {
+                'kind': kind,
+                'name': name,
+                'seconds': end - start,
+                'finished_at': end - PROCESS_START,
+                'thread': threading.current_thread().name
+            }
+            with self._lock:
+                self.entries.append(entry)
+                late = self._printed
+            if self.enabled and late:
+                print(f"\n⏱️ {kind} {name} ready in {entry['seconds']:.2f}s "
+                      f"({entry['thread']}, +{entry['finished_at']:.2f}s)")
+
+    def import_module(self, module_name: str):
+        """Import a module and record how long it took."""
+        with self.measure('import', module_name):
+            return importlib.import_module(module_name)
+
+    def mark_listening(self):
+        """Record the moment Aarav starts listening and print the report if enabled."""
+        if self.listening_at is None:
+            self.listening_at = time.perf_counter() - PROCESS_START
+            if self.enabled:
+                self.print_report()
+
+    def print_report(self):
+        """Print wall time per import and component."""
+        with self._lock:
+            entries = sorted(self.entries, key=lambda entry: entry['finished_at'])
+            self._printed = True
+
+        print("\n⏱️ Startup report")
+        print("=" * 64)
+        print(f"{'kind':<10} {'name':<28} {'seconds':>8} {'done at':>8}  thread")
+        for entry in entries:
+            print(f"{entry['kind']:<10} {entry['name']:<28} {entry['seconds']:>8.2f} "
+                  f"{entry['finished_at']:>7.2f}s  {entry['thread']}")
+        if self.listening_at is not None:
+            print(f"🎤 Time to listening: {self.listening_at:.2f}s")
+        print("(components still warming up are reported when ready)")
+
+
+class LazyComponent:
+    def __init__(self, name: str, factory, report: StartupReport):
+        """
+        Wrap a subsystem so it is built once, on first use or in the background.
+
+        Args:
+            name (str): Component name for the startup report
+            factory (callable): Builds the component
+            report (StartupReport): Where construction time is recorded
+        """
+        self.name = name
+        self.factory = factory
+        self.report = report
+        self._value = None
+        self._error = None
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+
+    def get(self):
+        """Return the component, building it (or waiting for a warm-up) if needed."""
+        if not self._ready.is_set():
+            with self._lock:
+                if not self._ready.is_set():
+                    try:
+                        with self.report.measure('component', self.name):
+                            self._value = self.factory()
+                    except Exception as e:
+                        self._error = e
+                    finally:
+                        self._ready.set()
+        if self._error is not None:
+            raise self._error
+        return self._value
+
+    def set(self, value):
+        """Use an already-built component (e.g. a stand-in)."""
+        with self._lock:
+            self._value = value
+            self._error = None
+            self._ready.set()
+
+    def warm_up(self):
+        """Start building the component on a background thread."""
+        if self._ready.is_set() or self._lock.locked():
+            return
+
+        def build():
+            try:
+                self.get()
+            except Exception as e:
+                print(f"⚠️ Failed to initialize {self.name}: {e}")
+
+        threading.Thread(target=build, name=f"warm-{self.name}", daemon=True).start()
+
+    @property
+    def is_ready(self) -> bool:
+        """True once the component has been built (or failed to build)."""
+        return self._ready.is_set()
+
+    @property
+    def is_built(self) -> bool:
+        """True once the component has been built successfully."""
+        return self._ready.is_set() and self._error is None
+
+    def value_or_none(self):
+        """
+        The component if it has been built successfully, else None.
+
+        Never builds and never raises: safe to call from threads that must
+        not die (e.g. the capture thread's echo guard).
+        """
+        return self._value if self.is_built else None
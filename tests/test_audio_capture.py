@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("speech_recognition")
+
+from Communication.audio_capture import AudioCapture, CaptureError
+from Communication.vad import VADEndpointer
+
+
+class FakeMicrophone:
+    SAMPLE_RATE = 100
+
+
+@pytest.fixture
+def capture():
+    # A 10-sample ring keeps the wrap-around arithmetic easy to follow
+    return AudioCapture(FakeMicrophone(), VADEndpointer(100, frame_seconds=0.02), buffer_seconds=0.1)
+
+
+def samples(first, end):
+    return np.arange(first, end, dtype=np.int16)
+
+
+def test_write_wraps_around_the_ring(capture):
+    capture._write(samples(0, 7))
+    capture._write(samples(7, 13))
+
+    assert capture.written == 13
+    # Samples 10-12 overwrote the start of the ring
+    assert capture.ring.tolist() == [10, 11, 12, 3, 4, 5, 6, 7, 8, 9]
+
+
+def test_write_longer_than_the_ring_keeps_the_newest(capture):
+    capture._write(samples(0, 3))
+    capture._write(samples(3, 28))
+
+    assert capture.written == 28
+    assert np.frombuffer(capture._cut(18, 28), dtype=np.int16).tolist() == list(range(18, 28))
+
+
+def test_cut_across_the_wrap(capture):
+    capture._write(samples(0, 16))
+
+    assert np.frombuffer(capture._cut(8, 14), dtype=np.int16).tolist() == [8, 9, 10, 11, 12, 13]
+    assert capture.counters['ring_overruns'] == 0
+
+
+def test_cut_of_overwritten_audio_counts_an_overrun(capture):
+    capture._write(samples(0, 25))
+
+    # Samples before 15 are gone: the cut starts at the oldest kept sample
+    assert np.frombuffer(capture._cut(4, 20), dtype=np.int16).tolist() == [15, 16, 17, 18, 19]
+    assert capture.counters['ring_overruns'] == 1
+    assert capture.counters['dropped_frames'] == (15 - 4) // capture.endpointer.frame_samples
+
+
+def test_waiting_forever_notices_a_dead_capture_thread(capture):
+    capture.error = OSError("device unplugged")
+
+    with pytest.raises(CaptureError):
+        capture.next_segment()
+    with pytest.raises(CaptureError):
+        capture.next_segment(timeout=5.0)
@@ -0,0 +1,67 @@
+from brain.conversation_memory import ConversationMemory, estimate_tokens, is_follow_up
+
+
+def settle(memory):
+    """Wait for background compactions (the memory thread runs them in order)."""
+    memory._compactor.submit(lambda: None).result()
+
+
+def test_oldest_turns_are_folded_into_the_summary():
+    seen = []
+
+    def summarizer(summary, turns):
+        seen.append([turn.user for turn in turns])
+        return f"{summary} talked about {', '.join(turn.user for turn in turns)}".strip()
+
+    memory = ConversationMemory(summarizer, max_recent_turns=2)
+    for question in ("cats", "dogs", "birds", "fish"):
+        memory.add_turn(question, "Nice.")
+    settle(memory)
+
+    assert [turn.user for turn in memory.turns] == ["birds", "fish"]
+    assert "cats" in memory.summary and "dogs" in memory.summary
+    assert sum(seen, []) == ["cats", "dogs"]
+    assert memory.stats()['compactions'] >= 1
+
+
+def test_failing_summarizer_falls_back_to_an_extractive_summary():
+    def summarizer(summary, turns):
+        raise RuntimeError("quota exceeded")
+
+    memory = ConversationMemory(summarizer, max_recent_turns=1)
+    memory.add_turn("Who wrote Hamlet?", "Shakespeare did. He wrote it around 1600.")
+    memory.add_turn("When?", "Around 1600.")
+    settle(memory)
+
+    assert memory.summary == "Dev asked: Who wrote Hamlet? Aarav said: Shakespeare did."
+
+
+def test_context_fits_the_budget_newest_turns_first():
+    memory = ConversationMemory(max_recent_turns=10, token_budget=400)
+    for i in range(4):
+        memory.add_turn(f"question {i}", "x" * 80)
+
+    summary, turns = memory.context(fixed_tokens=350)
+
+    # 50 tokens left: the two newest 23-token turns fit, the rest is left out
+    assert summary == ""
+    assert [turn.user for turn in turns] == ["question 2", "question 3"]
+    assert sum(turn.tokens for turn in turns) <= 50
+
+
+def test_summary_is_truncated_to_what_is_left_of_the_budget():
+    memory = ConversationMemory(token_budget=100, summary_max_tokens=50)
+    memory.summary = " ".join(f"word{i}" for i in range(100))
+
+    summary, turns = memory.context(fixed_tokens=80)
+
+    assert estimate_tokens(summary) <= 20
+    # The newest part of the summary is kept
+    assert summary.endswith("word99")
+    assert turns == []
+
+
+def test_follow_up_questions_are_recognised():
+    assert is_follow_up("And what about tomorrow?")
+    assert is_follow_up("Why is that?")
+    assert not is_follow_up("What is the capital of France?")
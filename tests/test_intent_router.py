@@ -0,0 +1,57 @@
+import pytest
+
+from brain.command_vocabulary import AARAV_VOCABULARIES
+from brain.intent_router import IntentMatch, IntentRouter, _cascade_scan
+
+
+@pytest.fixture(scope='module')
+def router():
+    return IntentRouter(AARAV_VOCABULARIES)
+
+
+@pytest.mark.parametrize('text', [
+    "wake up aarav",
+    "Who are you?",
+    "open youtube and play some music",
+    "search for the latest ai news",
+    "what's the weather in london",
+    "close all tabs",
+    "take a screenshot",
+    "generate image of a sunset over mountains",
+    "tell me a joke about programmers",
+    "ok bye, see you soon",
+    "",
+])
+def test_router_agrees_with_the_keyword_cascade(router, text):
+    assert router.intents(text) == _cascade_scan(AARAV_VOCABULARIES, text)
+
+
+def test_overlapping_phrases_are_all_reported_with_their_spans():
+    # "she" and "he" end inside "ushers"; "hers" starts inside "she" (failure links)
+    router = IntentRouter({'a': ["he", "she"], 'b': ["hers"], 'c': ["his"]})
+
+    result = router.route("  Ushers ")
+
+    assert result.text == "ushers"
+    assert set(result.matches) == {
+        IntentMatch('a', "she", 1, 4),
+        IntentMatch('a', "he", 2, 4),
+        IntentMatch('b', "hers", 2, 6),
+    }
+    assert result.intents == {'a', 'b'}
+
+
+def test_matches_are_substrings_without_word_boundaries():
+    router = IntentRouter({'stop': ["stop"], 'web': ["open"]})
+
+    # Same as the original `phrase in text` checks: "unstoppable" contains "stop"
+    assert router.matches("that was unstoppable", 'stop')
+    assert not router.matches("that was unstoppable", 'web')
+
+
+def test_predicate_cascade_shares_one_scan():
+    router = IntentRouter({'stop': ["stop"], 'wake': ["wake up"]})
+
+    first = router.route("Wake up")
+    assert router.route("wake up ") is first
+    assert router.route("stop") is not first
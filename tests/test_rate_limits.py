@@ -0,0 +1,71 @@
+import pytest
+
+from rate_limits import RateLimiter, TokenBucket
+
+
+def limiter():
+    # One request per second and ten tokens per second keep the arithmetic readable
+    return RateLimiter({'test-model': {'rpm': 60, 'tpm': 600}})
+
+
+def test_bucket_goes_into_debt_and_reports_the_wait():
+    bucket = TokenBucket(per_minute=60, capacity=2)
+
+    assert bucket.reserve(1) == 0.0
+    assert bucket.reserve(1) == 0.0
+    # The bucket is empty: the third request waits one refill (one second)
+    assert bucket.reserve(1) == pytest.approx(1.0, abs=0.05)
+    # ... and the fourth waits behind it
+    assert bucket.reserve(1) == pytest.approx(2.0, abs=0.05)
+
+
+def test_oversized_request_waits_for_a_full_bucket_not_forever():
+    bucket = TokenBucket(per_minute=60, capacity=10)
+
+    assert bucket.reserve(10) == 0.0
+    assert bucket.reserve(1000) == pytest.approx(10.0, abs=0.05)
+
+
+def test_refund_never_overfills_the_bucket():
+    bucket = TokenBucket(per_minute=60, capacity=10)
+    bucket.reserve(4)
+
+    bucket.refund(100)
+
+    assert bucket.tokens == 10
+
+
+def test_record_usage_refunds_an_overestimate():
+    rate_limiter = limiter()
+    rate_limiter.acquire('test-model', 500, 'chat')
+    _, tokens = rate_limiter._model_buckets('test-model')
+    assert tokens.tokens == pytest.approx(100, abs=1)
+
+    rate_limiter.record_usage('test-model', 'chat', {'promptTokenCount': 150, 'candidatesTokenCount': 50,
+                                                    'totalTokenCount': 200}, estimated_tokens=500)
+
+    assert tokens.tokens == pytest.approx(400, abs=1)
+    usage = rate_limiter.usage('chat')
+    assert (usage['requests'], usage['prompt_tokens'], usage['output_tokens']) == (1, 150, 50)
+
+
+def test_record_usage_charges_an_underestimate_to_the_next_request():
+    rate_limiter = limiter()
+    rate_limiter.acquire('test-model', 100, 'chat')
+
+    rate_limiter.record_usage('test-model', 'chat', {'totalTokenCount': 700}, estimated_tokens=100)
+
+    # 700 tokens used of a 600 bucket: the next 50 wait for the debt and their own refill
+    _, tokens = rate_limiter._model_buckets('test-model')
+    assert tokens.reserve(50) == pytest.approx(15.0, abs=0.1)
+
+
+def test_missing_metadata_leaves_the_estimate_in_place():
+    rate_limiter = limiter()
+    rate_limiter.acquire('test-model', 100, 'chat')
+
+    rate_limiter.record_usage('test-model', 'chat', None, estimated_tokens=100)
+
+    _, tokens = rate_limiter._model_buckets('test-model')
+    assert tokens.tokens == pytest.approx(500, abs=1)
+    assert rate_limiter.usage('chat')['total_tokens'] == 0
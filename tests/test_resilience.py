@@ -0,0 +1,125 @@
+import threading
+import time
+
+import pytest
+
+from resilience import CircuitBreaker, CircuitOpenError, DeadlineExceeded, Resilience
+
+
+class StatusError(Exception):
+    """HTTP error carrying a status code, like httpx.HTTPStatusError."""
+
+    def __init__(self, status):
+        super().__init__(f"HTTP {status}")
+        self.status_code = status
+
+
+def fail(status):
+    def call():
+        raise StatusError(status)
+    return call
+
+
+@pytest.fixture
+def policy():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0)
+    return Resilience('test', deadline=1.0, max_attempts=1, breaker=breaker)
+
+
+def test_non_retryable_error_ends_a_half_open_trial(policy):
+    with pytest.raises(StatusError):
+        policy.call(fail(503))
+    assert policy.breaker.state == 'open'
+
+    # The cool-down is over: this call is the trial, and the service answers (with a 400)
+    with pytest.raises(StatusError):
+        policy.call(fail(400))
+
+    assert policy.breaker.state == 'closed'
+    assert policy.call(lambda: "ok") == "ok"
+
+
+def test_abandoned_trial_lets_the_next_call_try(policy):
+    with pytest.raises(StatusError):
+        policy.call(fail(503))
+    policy.start()
+    assert policy.breaker.state == 'half_open'
+
+    policy.abandon()
+
+    assert policy.breaker.state == 'open'
+    assert policy.call(lambda: "ok") == "ok"
+    assert policy.breaker.state == 'closed'
+
+
+def test_open_breaker_fails_fast():
+    policy = Resilience('test', max_attempts=1, breaker=CircuitBreaker(failure_threshold=1, reset_timeout=60.0))
+    with pytest.raises(StatusError):
+        policy.call(fail(503))
+
+    with pytest.raises(CircuitOpenError):
+        policy.call(lambda: "ok")
+    assert policy.stats()['short_circuited'] == 1
+
+
+def flaky(*statuses):
+    """A call failing with each status in turn, then answering "ok"."""
+    remaining = list(statuses)
+
+    def call():
+        if remaining:
+            raise StatusError(remaining.pop(0))
+        return "ok"
+    return call
+
+
+def test_transient_errors_are_retried():
+    policy = Resilience('test', max_attempts=3, base_delay=0.01)
+
+    assert policy.call(flaky(503, 429)) == "ok"
+    stats = policy.stats()
+    assert stats['retries'] == 2 and stats['failures'] == 2 and stats['successes'] == 1
+    assert stats['breaker'] == 'closed'
+
+
+def test_retries_stop_at_max_attempts_and_on_client_errors():
+    policy = Resilience('test', max_attempts=2, base_delay=0.01)
+    with pytest.raises(StatusError):
+        policy.call(flaky(503, 503))
+    assert policy.stats()['retries'] == 1
+
+    # A 400 will not get better by asking again
+    with pytest.raises(StatusError):
+        policy.call(flaky(400))
+    assert policy.stats()['retries'] == 1
+
+
+def test_deadline_returns_control_while_the_call_still_runs():
+    policy = Resilience('test', deadline=0.1, max_attempts=1)
+    release = threading.Event()
+
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        policy.call(release.wait, 5.0)
+    assert time.monotonic() - start < 1.0
+    assert policy.stats()['deadline_exceeded'] == 1
+    release.set()
+
+
+def test_slow_attempt_is_hedged_and_the_first_answer_wins():
+    policy = Resilience('test', deadline=2.0, max_attempts=1, hedge_percentile=95, hedge_min_samples=3)
+    for _ in range(3):
+        policy.record_success(0.01)
+    calls = []
+
+    def answer():
+        # The first request hangs, the hedged one answers at once
+        calls.append(1)
+        if len(calls) == 1:
+            time.sleep(1.0)
+            return "slow"
+        return "fast"
+
+    assert policy.call(answer) == "fast"
+    stats = policy.stats()
+    assert stats['hedges'] == 1 and stats['hedge_wins'] == 1
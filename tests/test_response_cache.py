@@ -0,0 +1,83 @@
+import pytest
+
+from brain import response_cache
+from brain.response_cache import ResponseCache, normalize_question
+
+
+class Clock:
+    """Stand-in for time.time() that only moves when told to."""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(response_cache, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    cache = ResponseCache(str(tmp_path / "responses.sqlite3"), max_entries=2, default_ttl=60)
+    yield cache
+    cache.close()
+
+
+def test_rephrased_question_hits_the_same_entry(cache):
+    cache.put("What's the capital of France?", 'v1', "Paris.")
+
+    assert normalize_question("What's the capital of France?") == "what is the capital of france"
+    assert cache.get("what is the capital of france", 'v1') == "Paris."
+    # A new prompt version does not reuse old replies
+    assert cache.get("what is the capital of france", 'v2') is None
+
+
+def test_entries_expire_after_their_ttl(cache, clock):
+    cache.put("Who wrote Hamlet?", 'v1', "Shakespeare.")
+    cache.put("How tall is Everest?", 'v1', "8,849 metres.", ttl=600)
+
+    clock.now += 61
+
+    assert cache.get("Who wrote Hamlet?", 'v1') is None
+    assert cache.get("How tall is Everest?", 'v1') == "8,849 metres."
+    stats = cache.stats()
+    assert stats['expired'] == 1 and stats['entries'] == 1
+
+
+def test_least_recently_used_entry_is_evicted(cache, clock):
+    cache.put("Who wrote Hamlet?", 'v1', "Shakespeare.")
+    clock.now += 1
+    cache.put("How tall is Everest?", 'v1', "8,849 metres.")
+    clock.now += 1
+    # Reading Hamlet makes Everest the least recently used
+    cache.get("Who wrote Hamlet?", 'v1')
+    clock.now += 1
+
+    cache.put("What is the speed of light?", 'v1', "299,792 km/s.")
+
+    assert cache.get("How tall is Everest?", 'v1') is None
+    assert cache.get("Who wrote Hamlet?", 'v1') == "Shakespeare."
+    assert cache.stats()['evictions'] == 1
+
+
+def test_time_sensitive_questions_bypass_the_cache(cache):
+    cache.put("What's the weather today?", 'v1', "Sunny.")
+
+    assert cache.get("What's the weather today?", 'v1') is None
+    assert cache.stats()['bypasses'] == 1 and cache.stats()['entries'] == 0
+
+
+def test_cache_survives_a_restart(tmp_path, clock):
+    path = str(tmp_path / "responses.sqlite3")
+    cache = ResponseCache(path)
+    cache.put("Who wrote Hamlet?", 'v1', "Shakespeare.")
+    cache.close()
+
+    reopened = ResponseCache(path)
+    assert reopened.get("Who wrote Hamlet?", 'v1') == "Shakespeare."
+    reopened.close()
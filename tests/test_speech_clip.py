@@ -0,0 +1,17 @@
+from Communication.speech_clip import SENTENCE_BOUNDARY, split_speech_chunks
+
+
+def test_closing_quotes_and_brackets_stay_with_their_sentence():
+    text = 'He said "go." Then (it works.) Done! "Really?") Yes.'
+
+    assert SENTENCE_BOUNDARY.split(text) == ['He said "go."', 'Then (it works.)', 'Done!', '"Really?")', 'Yes.']
+
+
+def test_chunks_keep_the_first_short_and_never_split_a_sentence():
+    text = "Hi there. " + " ".join(f"This is sentence number {i}." for i in range(10))
+
+    chunks = split_speech_chunks(text, first_max_chars=20, max_chars=80)
+
+    assert chunks[0] == "Hi there."
+    assert all(len(chunk) <= 80 for chunk in chunks)
+    assert " ".join(chunks) == text
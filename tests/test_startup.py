@@ -0,0 +1,30 @@
+import pytest
+
+from startup import LazyComponent, StartupReport
+
+
+def failing():
+    raise ValueError("No TTS backend available")
+
+
+def test_failed_component_is_ready_but_not_built():
+    component = LazyComponent('speaker', failing, StartupReport())
+
+    assert component.value_or_none() is None
+    with pytest.raises(ValueError):
+        component.get()
+
+    assert component.is_ready
+    assert not component.is_built
+    # Guards on other threads see "no speaker" instead of the stored error
+    assert component.value_or_none() is None
+
+
+def test_built_component_is_returned_without_building_again():
+    built = []
+    component = LazyComponent('brain', lambda: built.append(1) or "brain", StartupReport())
+
+    assert component.value_or_none() is None
+    assert component.get() == "brain"
+    assert component.is_built and component.value_or_none() == "brain"
+    assert built == [1]
@@ -0,0 +1,107 @@
+from concurrent.futures import Future
+
+import pytest
+
+from brain.command_vocabulary import get_router
+from Communication.streaming_stt import Hypothesis, ScriptedRecognizer, StreamingTranscriber
+
+RATE = 16000
+CHUNK = bytes(2 * int(0.1 * RATE))
+
+
+@pytest.fixture
+def recognizer():
+    return ScriptedRecognizer(RATE, words_per_second=2.5)
+
+
+@pytest.fixture
+def transcriber(recognizer):
+    transcriber = StreamingTranscriber(recognizer, router=get_router(), early_intents=['stop'])
+    yield transcriber
+    transcriber.close()
+
+
+def stream(transcriber, recognizer, text, seconds, during_playback=False):
+    """Stream an utterance of silent chunks; returns (early intents fired, final Future)."""
+    early = []
+    transcriber.on_early_intent = lambda intent, hypothesis, playback: early.append((intent, hypothesis, playback))
+    recognizer.expect(text)
+    transcriber.begin(during_playback=during_playback)
+    for _ in range(round(seconds / 0.1)):
+        transcriber.feed(CHUNK)
+    final = transcriber.end()
+    transcriber.drain()
+    return early, final
+
+
+def test_partials_reveal_words_and_gain_confidence_while_stable(recognizer):
+    recognizer.expect("open youtube")
+    recognizer.start()
+
+    partials = [recognizer.accept(CHUNK) for _ in range(10)]
+
+    assert partials[2] is None
+    assert partials[3].text == "open"
+    assert partials[3].confidence == 0.0
+    assert partials[5].text == "open" and partials[5].confidence == pytest.approx(1.0)
+    assert partials[-1].text == "open youtube"
+    final = recognizer.finish()
+    assert final.is_final and final.text == "open youtube"
+
+
+def test_confident_stop_partial_fires_early_intent_once(transcriber, recognizer):
+    early, final = stream(transcriber, recognizer, "stop", seconds=1.5)
+
+    assert len(early) == 1
+    intent, hypothesis, during_playback = early[0]
+    assert intent == 'stop'
+    assert hypothesis.text == "stop" and not hypothesis.is_final
+    assert hypothesis.confidence >= transcriber.min_confidence
+    assert not during_playback
+    assert final.result().text == "stop"
+    assert transcriber.stats()['early'] == {'stop': 1}
+
+
+def test_early_stop_does_not_become_the_final_transcript(transcriber, recognizer):
+    # "stop ... the video": the pause makes "stop" confident on its own
+    recognizer.words_per_second = 1.0
+    early, final = stream(transcriber, recognizer, "stop the video", seconds=3.5, during_playback=True)
+
+    assert [intent for intent, _, _ in early] == ['stop']
+    assert early[0][2] is True
+    assert final.result().text == "stop the video"
+
+
+def test_ambiguous_partials_are_not_acted_on(transcriber):
+    confident = lambda text: Hypothesis(text, 1.0, False, 1.0)
+
+    assert transcriber.early_intent(confident("stop")) == 'stop'
+    assert transcriber.early_intent(confident("ok bye")) == 'stop'
+    # Also web commands: "stop the video" is playback control, "exit" may close a tab
+    assert transcriber.early_intent(confident("stop the video")) is None
+    assert transcriber.early_intent(confident("exit")) is None
+    assert transcriber.early_intent(confident("what is the weather")) is None
+    assert transcriber.early_intent(Hypothesis("stop", 0.5, False, 0.4)) is None
+
+
+def test_final_text_uses_confident_local_finals_only(transcriber):
+    def resolved(hypothesis):
+        future = Future()
+        future.set_result(hypothesis)
+        return future
+
+    assert transcriber.final_text(resolved(Hypothesis("open youtube", 0.95, True, 1.0))) == "open youtube"
+    assert transcriber.final_text(resolved(Hypothesis("open you tube", 0.4, True, 1.0))) is None
+    assert transcriber.final_text(resolved(Hypothesis("", 0.0, True, 1.0))) is None
+    assert transcriber.final_text(resolved(None)) is None
+
+    stats = transcriber.stats()
+    assert stats['local_finals'] == 1
+    assert stats['cloud_fallbacks'] == 3
+
+
+def test_final_text_times_out_to_the_cloud(transcriber):
+    transcriber.final_timeout = 0.01
+
+    assert transcriber.final_text(Future()) is None
+    assert transcriber.stats()['final_timeouts'] == 1
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from Communication.vad import VADEndpointer
+
+RATE = 16000
+
+
+def noise(seconds, db=-60, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.normal(0, 32768 * 10 ** (db / 20), int(seconds * RATE))
+
+
+def voiced(seconds, db=-22):
+    """Harmonic tone with a syllable-rate envelope, loud enough to be speech."""
+    t = np.arange(int(seconds * RATE)) / RATE
+    x = sum(np.sin(2 * np.pi * 140 * k * t) / k for k in range(1, 12))
+    x *= 0.6 + 0.4 * np.sin(2 * np.pi * 4 * t)
+    return x / np.sqrt(np.mean(x ** 2)) * 32768 * 10 ** (db / 20) + noise(seconds, seed=1)
+
+
+def pcm(*parts):
+    return np.clip(np.concatenate(parts), -32768, 32767).astype(np.int16).tobytes()
+
+
+def run(endpointer, audio, chunk_seconds=0.05):
+    """Feed audio in chunks; returns (first, end, reason) per utterance, in samples."""
+    chunk = 2 * int(chunk_seconds * RATE)
+    segments = []
+    for offset in range(0, len(audio), chunk):
+        event = endpointer.feed(audio[offset:offset + chunk])
+        while event is not None and event != 'start':
+            segments.append(endpointer.utterance_samples() + (event,))
+            endpointer.begin()
+            event = endpointer.feed(b'')
+    return segments
+
+
+@pytest.fixture
+def endpointer():
+    endpointer = VADEndpointer(RATE)
+    endpointer.calibrate(pcm(noise(0.5)))
+    return endpointer
+
+
+def test_utterance_is_found_with_pre_roll_and_hangover(endpointer):
+    segments = run(endpointer, pcm(noise(1.0), voiced(1.0), noise(1.5)))
+
+    assert len(segments) == 1
+    first, end, reason = segments[0]
+    assert reason == 'silence'
+    # Starts within the pre-roll before the speech at 1.0 s
+    assert 0.6 * RATE <= first <= 1.0 * RATE
+    # Ends one hangover after the speech stops at 2.0 s
+    assert 2.0 * RATE + endpointer.min_hangover * RATE * 0.9 <= end <= 2.0 * RATE + endpointer.max_hangover * RATE
+    assert endpointer.stats()['utterances'] == 1
+
+
+def test_silence_and_noise_never_start_an_utterance(endpointer):
+    hiss = np.random.default_rng(2).normal(0, 32768 * 10 ** (-30 / 20), int(2 * RATE))
+
+    assert run(endpointer, pcm(noise(2.0), hiss)) == []
+    assert not endpointer.in_speech
+
+
+def test_two_utterances_are_numbered_on_one_timeline(endpointer):
+    segments = run(endpointer, pcm(noise(0.5), voiced(0.6), noise(1.5), voiced(0.6), noise(1.5)))
+
+    assert [reason for _, _, reason in segments] == ['silence', 'silence']
+    (_, first_end, _), (second_first, _, _) = segments
+    assert second_first >= first_end
+    assert second_first >= 2.2 * RATE
+
+
+def test_long_speech_is_cut_at_max_length():
+    endpointer = VADEndpointer(RATE, max_utterance=1.0)
+    endpointer.calibrate(pcm(noise(0.5)))
+
+    segments = run(endpointer, pcm(noise(0.5), voiced(3.0)))
+
+    assert segments[0][2] == 'max_length'
+    first, end, _ = segments[0]
+    assert (end - first) / RATE == pytest.approx(1.0, abs=2 * endpointer.frame_seconds)
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Per-turn latency tracing for Aarav AI Assistant
+
+Records nested spans (STT, routing, LLM, TTS synthesis/download/decode,
+playback) for every conversation turn. Each finished turn is written as one
+JSON line to a rotating log file, and a rolling window of durations per span
+name gives p50/p95/p99 on demand.
+
+Overhead is a couple of perf_counter() calls and list appends per span; the
+file write happens once per turn. Set AARAV_TRACE=0 to disable the log file.
+"""
+
+import json
+import logging
+import math
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from logging.handlers import RotatingFileHandler
+
+TRACE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs")
+TRACE_FILE = os.path.join(TRACE_DIR, "aarav_trace.jsonl")
+
+
+class TraceTurn:
+    """Spans recorded for one conversation turn."""
+
+    def __init__(self, turn_id: int):
+        self.turn_id = turn_id
+        self.started_at = time.perf_counter()
+        self.wall_start = time.time()
+        self.spans = []
+        self.attributes = {}
+
+
+class Tracer:
+    def __init__(self, trace_file: str = TRACE_FILE, window: int = 512,
+                 max_bytes: int = 5 * 1024 * 1024, backup_count: int = 3, enabled: bool = True):
+        """
+        Initialize the tracer.
+
+        Args:
+            trace_file (str): Rotating JSONL file for finished turns
+            window (int): Durations kept per span name for percentiles
+            max_bytes (int): Size at which the log file rotates
+            backup_count (int): Rotated files to keep
+            enabled (bool): Write finished turns to the log file
+        """
+        self.window = window
+        self._durations = defaultdict(lambda: deque(maxlen=window))
+        self._local = threading.local()
+        self._current_turn = None
+        self._turn_counter = 0
+        self._lock = threading.Lock()
+
+        self._logger = None
+        if enabled:
+            try:
+                os.makedirs(os.path.dirname(trace_file), exist_ok=True)
+                handler = RotatingFileHandler(trace_file, maxBytes=max_bytes,
+                                              backupCount=backup_count, encoding='utf-8')
+                handler.setFormatter(logging.Formatter('%(message)s'))
+                self._logger = logging.getLogger(f"aarav.trace.{id(self)}")
+                self._logger.setLevel(logging.INFO)
+                self._logger.propagate = False
+                self._logger.addHandler(handler)
+            except OSError as e:
+                print(f"⚠️ Trace log disabled: {e}")
+
+    # ------------------------------------------------------------------------
+    # Turns
+    # ------------------------------------------------------------------------
+
+    def start_turn(self, make_current: bool = True) -> TraceTurn:
+        """
+        Begin a new turn.
+
+        Args:
+            make_current (bool): Attach spans from any thread to this turn unless
+                they run under activate() for another one
+
+        Returns:
+            TraceTurn: The new turn
+        """
+        with self._lock:
+            self._turn_counter += 1
+            turn = TraceTurn(self._turn_counter)
+        if make_current:
+            self._current_turn = turn
+        return turn
+
+    def end_turn(self, turn: TraceTurn, discard: bool = False):
+        """
+        Finish a turn and write it to the trace log.
+
+        Args:
+            turn (TraceTurn): Turn returned by start_turn()
+            discard (bool): Drop the turn (e.g. no speech was heard)
+        """
+        if self._current_turn is turn:
+            self._current_turn = None
+        if discard or turn is None:
+            return
+
+        duration = time.perf_counter() - turn.started_at
+        self._durations['turn'].append(duration)
+
+        if self._logger is not None:
+            record = {
+                'turn': turn.turn_id,
+                'ts': turn.wall_start,
+                'duration_ms': round(duration * 1000, 2),
+                'spans': turn.spans
+            }
+            record.update(turn.attributes)
+            self._logger.info(json.dumps(record, ensure_ascii=False))
+
+    @contextmanager
+    def activate(self, turn: TraceTurn):
+        """Attach spans opened on this thread to the given turn."""
+        previous = getattr(self._local, 'turn', None)
+        self._local.turn = turn
+        try:
+            yield turn
+        finally:
+            self._local.turn = previous
+
+    def annotate(self, **attributes):
+        """Attach fields (e.g. prompt tokens) to the active turn's log record."""
+        turn = self._active_turn()
+        if turn is not None:
+            turn.attributes.update(attributes)
+
+    def _active_turn(self):
+        return getattr(self._local, 'turn', None) or self._current_turn
+
+    # ------------------------------------------------------------------------
+    # Spans
+    # ------------------------------------------------------------------------
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        """
+        Time a block as a span nested under the span currently open on this thread.
+
+        Args:
+            name (str): Stage name, e.g. 'llm.think' or 'tts.download'
+            **attributes: Extra fields stored with the span
+        """
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        parent = stack[-1] if stack else None
+        stack.append(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            stack.pop()
+            self._record(name, start, end, parent, attributes)
+
+    def record(self, name: str, start: float, end: float, parent: str = None, **attributes):
+        """
+        Record a span measured elsewhere (e.g. across generator yields).
+
+        Args:
+            name (str): Stage name
+            start (float): perf_counter() at the start
+            end (float): perf_counter() at the end
+            parent (str): Parent span name, if any
+        """
+        self._record(name, start, end, parent, attributes)
+
+    def _record(self, name, start, end, parent, attributes):
+        duration = end - start
+        self._durations[name].append(duration)
+
+        turn = self._active_turn()
+        if turn is not None:
+            span = {
+                'name': name,
+                'parent': parent,
+                'start_ms': round((start - turn.started_at) * 1000, 2),
+                'duration_ms': round(duration * 1000, 2),
+                'thread': threading.current_thread().name
+            }
+            if attributes:
+                span.update(attributes)
+            turn.spans.append(span)
+
+    # ------------------------------------------------------------------------
+    # Percentiles
+    # ------------------------------------------------------------------------
+
+    def percentiles(self) -> dict:
+        """
+        Rolling latency percentiles per span name.
+
+        Returns:
+            dict: Span name -> count, p50, p95 and p99 in milliseconds
+        """
+        report = {}
+        for name, durations in list(self._durations.items()):
+            values = sorted(durations)
+            if not values:
+                continue
+            report[name] = {
+                'count': len(values),
+                'p50': percentile(values, 50) * 1000,
+                'p95': percentile(values, 95) * 1000,
+                'p99': percentile(values, 99) * 1000
+            }
+        return report
+
+    def print_report(self):
+        """Print rolling p50/p95/p99 per stage."""
+        print("\n⏱️ Latency report (rolling, ms)")
+        print("=" * 60)
+        print(f"{'stage':<24} {'count':>6} {'p50':>8} {'p95':>8} {'p99':>8}")
+        for name, row in sorted(self.percentiles().items()):
+            print(f"{name:<24} {row['count']:>6} {row['p50']:>8.0f} {row['p95']:>8.0f} {row['p99']:>8.0f}")
+
+
+def percentile(sorted_values, percent):
+    """Nearest-rank percentile of an already sorted list."""
+    index = math.ceil(percent / 100 * len(sorted_values)) - 1
+    return sorted_values[max(0, min(index, len(sorted_values) - 1))]
+
+
+# Global tracer instance
+_tracer = None
+
+def get_tracer() -> Tracer:
+    """Get or create the global tracer instance."""
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer(enabled=os.getenv('AARAV_TRACE', '1') != '0')
+    return _tracer
+
+def span(name: str, **attributes):
+    """Shortcut for get_tracer().span(...)."""
+    return get_tracer().span(name, **attributes)